@@ -0,0 +1,105 @@
+# Statistik pengiriman per seller/rute untuk rentang bulan acak: sketsa histogram (delivery.py)
+# vs memindai tabel fakta setiap kali (filter tanggal + deduplikasi pengiriman + group-by).
+# Hasil kedua jalur dibandingkan (jumlah, keterlambatan, rata-rata, p50/p90/p95) sebelum diukur.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_delivery.py [--scale 3] [--ranges 50]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pages import prepare_synthetic  # noqa: E402
+from data_loader import CSV_PATH, SNAPSHOT_PATH, load_main_data  # noqa: E402
+from delivery import DIMENSIONS, QUANTILES, DeliverySketches, shipments  # noqa: E402
+
+
+def scan_summary(data, keys, start, end):
+    # Jalur tanpa sketsa: baris pembelian dalam [start, end) -> pengiriman -> statistik per kunci
+    purchase = data["order_purchase_timestamp"]
+    frame = shipments(data[((purchase >= start) & (purchase < end)).to_numpy()])
+    frame = frame.sort_values(keys + ["days"], ignore_index=True)
+    grouped = frame.groupby(keys, observed=True, sort=False)
+    size = grouped["days"].transform("size").to_numpy()
+    rank = grouped.cumcount().to_numpy()
+    result = grouped.agg(pengiriman=("days", "size"), terlambat=("late", "sum"), mean_days=("days", "mean"))
+    for name, q in QUANTILES.items():
+        # Nearest-rank: baris ke-ceil(q * n) dalam urutan hari per kunci
+        picked = frame[rank == np.ceil(q * size).astype("int64") - 1]
+        result[name] = picked.set_index(keys)["days"].astype("float64")
+    return result.reset_index()
+
+
+def month_ranges(months, count, seed):
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, len(months), count)
+    last = np.minimum(first + rng.integers(0, 12, count), len(months) - 1)
+    return [(months[i], months[j]) for i, j in zip(first, last)]
+
+
+def check(sketches, data, ranges):
+    # Sketsa harus sama persis dengan hasil pemindaian
+    for dimension, keys in DIMENSIONS.items():
+        for start, end in ranges[:5]:
+            expected = scan_summary(data, keys, start, end + pd.offsets.MonthBegin(1))
+            actual = sketches.summary(dimension, start, end)
+            columns = ["pengiriman", "terlambat", "mean_days"] + list(QUANTILES)
+            expected = expected.astype({key: str for key in keys}).sort_values(keys, ignore_index=True)
+            actual = actual.astype({key: str for key in keys}).sort_values(keys, ignore_index=True)
+            if not (expected[keys].equals(actual[keys])
+                    and np.allclose(expected[columns].to_numpy(dtype="float64"), actual[columns].to_numpy(dtype="float64"))):
+                raise AssertionError(f"hasil berbeda untuk {dimension} {start:%Y-%m}..{end:%Y-%m}")
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=0, help="skala dataset sintetis (0 = main_data)")
+    parser.add_argument("--ranges", type=int, default=50, help="jumlah rentang bulan acak")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.scale:
+            csv_path, snapshot_path = prepare_synthetic(args.scale, work_dir, args.seed)
+        else:
+            csv_path, snapshot_path = CSV_PATH, SNAPSHOT_PATH
+        data = load_main_data(csv_path, snapshot_path)
+
+        start = time.perf_counter()
+        sketches = DeliverySketches.from_data(data)
+        build = time.perf_counter() - start
+        cells = sum(len(frame) for frame in sketches.frames.values())
+        print(f"{len(data)} baris, {len(sketches.months)} bulan; sketsa dibangun {build * 1000:.0f} ms ({cells} sel histogram)")
+
+        ranges = month_ranges(sketches.months, args.ranges, args.seed)
+        check(sketches, data, ranges)
+        print("hasil sketsa == pemindaian tabel fakta: OK")
+
+        seller = sketches.summary("seller").iloc[0]["seller_id"]
+        single = timed(lambda: [sketches.histogram("seller", seller, start, end) for start, end in ranges], 20) / len(ranges)
+        print(f"\nhistogram satu seller per rentang: {single * 1e6:8.1f} us")
+
+        print(f"\nringkasan semua kunci per rentang ({len(ranges)} rentang acak)")
+        for dimension, keys in DIMENSIONS.items():
+            sketch_seconds = timed(lambda: [sketches.summary(dimension, start, end) for start, end in ranges], 3) / len(ranges)
+            scan_seconds = timed(lambda: [scan_summary(data, keys, start, end + pd.offsets.MonthBegin(1))
+                                          for start, end in ranges], 1) / len(ranges)
+            print(f"  {dimension:7s} sketsa {sketch_seconds * 1000:8.2f} ms   pindai {scan_seconds * 1000:8.2f} ms   "
+                  f"({scan_seconds / sketch_seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Query indeks spasial (geo_index.py) vs pemindaian semua titik: radius (haversine) dan bounding box.
+# Titik = centroid kode pos di main_data ditambah titik acak di seluruh bola bumi (termasuk dekat
+# kutub dan antimeridian); hasil indeks dicek sama persis dengan pemindaian sebelum diukur.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_geo.py [--queries 300] [--random-points 20000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+
+from data_loader import CSV_PATH, SNAPSHOT_PATH, load_main_data  # noqa: E402
+from geo_index import GeoIndex, haversine_km  # noqa: E402
+
+
+def random_points(rng, count):
+    # Titik seragam di permukaan bola
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    return lat, rng.uniform(-180, 180, count)
+
+
+def make_queries(rng, lat, lng, count):
+    # Pusat query: separuh di titik data (digeser sedikit), separuh acak; radius 1..2000 km
+    picked = rng.integers(0, len(lat), count // 2)
+    query_lat, query_lng = random_points(rng, count - len(picked))
+    query_lat = np.concatenate([np.clip(lat[picked] + rng.normal(0, 1, len(picked)), -90, 90), query_lat])
+    query_lng = np.concatenate([lng[picked] + rng.normal(0, 1, len(picked)), query_lng])
+    query_lng = (query_lng + 180) % 360 - 180
+    return list(zip(query_lat, query_lng, np.exp(rng.uniform(0, np.log(2000), count))))
+
+
+def brute_radius(lat, lng, center_lat, center_lng, km):
+    distance = haversine_km(center_lat, center_lng, lat, lng)
+    return np.flatnonzero(distance <= km)
+
+
+def brute_bbox(lat, lng, south, west, north, east):
+    return np.flatnonzero((lat >= south) & (lat <= north) & (lng >= west) & (lng <= east))
+
+
+def check(index, lat, lng, queries):
+    # Hasil indeks harus sama persis dengan pemindaian semua titik
+    for center_lat, center_lng, km in queries:
+        positions, distance = index.radius(center_lat, center_lng, km)
+        expected = brute_radius(lat, lng, center_lat, center_lng, km)
+        if not np.array_equal(np.sort(positions), expected) or np.any(np.diff(distance) < 0):
+            missing = np.setdiff1d(expected, positions)
+            raise AssertionError(f"radius ({center_lat:.2f}, {center_lng:.2f}) r={km:.0f} km: "
+                                 f"{len(missing)} titik hilang, {len(np.setdiff1d(positions, expected))} titik lebih")
+        dlat, dlng = km / 111.0, km / 111.0
+        box = (center_lat - dlat, center_lng - dlng, center_lat + dlat, center_lng + dlng)
+        if not np.array_equal(index.bbox(*box), brute_bbox(lat, lng, *box)):
+            raise AssertionError(f"bbox {box} berbeda")
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=300, help="jumlah query acak")
+    parser.add_argument("--random-points", type=int, default=20000, help="titik acak tambahan di seluruh bola bumi")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = load_main_data(CSV_PATH, SNAPSHOT_PATH)
+    zips = data.groupby("geolocation_zip_code_prefix", observed=True)[["geolocation_lat", "geolocation_lng"]].mean()
+    extra_lat, extra_lng = random_points(rng, args.random_points)
+    frame = pd.DataFrame({
+        "geolocation_lat": np.concatenate([zips["geolocation_lat"].to_numpy(), extra_lat]),
+        "geolocation_lng": np.concatenate([zips["geolocation_lng"].to_numpy(), extra_lng]),
+    })
+    lat, lng = frame["geolocation_lat"].to_numpy(), frame["geolocation_lng"].to_numpy()
+
+    start = time.perf_counter()
+    index = GeoIndex(frame, zooms=())
+    print(f"{len(frame)} titik ({len(zips)} kode pos + {args.random_points} acak); indeks dibangun "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    queries = make_queries(rng, lat, lng, args.queries)
+    check(index, lat, lng, queries)
+    print(f"hasil indeks == pemindaian untuk {len(queries)} query radius dan bbox: OK")
+
+    for label, small in [("radius <= 50 km", True), ("radius > 50 km", False)]:
+        subset = [query for query in queries if (query[2] <= 50) == small]
+        if not subset:
+            continue
+        index_seconds = timed(lambda: [index.radius(*query) for query in subset], 3) / len(subset)
+        scan_seconds = timed(lambda: [brute_radius(lat, lng, *query) for query in subset], 1) / len(subset)
+        print(f"  {label:16s} indeks {index_seconds * 1000:7.3f} ms   pindai {scan_seconds * 1000:7.3f} ms   "
+              f"({scan_seconds / index_seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
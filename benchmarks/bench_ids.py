@@ -0,0 +1,80 @@
+# Benchmark: kolom ID hex sebagai string biasa vs kategori (kode integer + kamus, data_loader.ID_COLUMNS)
+# Mengukur memori per kolom dan waktu groupby/nunique/agregat halaman pada kedua representasi.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_ids.py                 # memakai main_data
+#   python ../benchmarks/bench_ids.py --scale 10      # dataset sintetis 10x
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from aggregates import AGGREGATES  # noqa: E402
+from bench_pages import prepare_synthetic  # noqa: E402
+from data_loader import ID_COLUMNS, decode_ids, load_main_data  # noqa: E402
+from rfm import RFMEngine  # noqa: E402
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def operations(data):
+    # Group-by yang dipakai agregat dan halaman dashboard
+    ops = {
+        "groupby seller_id size": lambda: data.groupby("seller_id", observed=True).size(),
+        "groupby customer_unique_id size": lambda: data.groupby("customer_unique_id", observed=True).size(),
+        "nunique customer_unique_id": lambda: data["customer_unique_id"].nunique(),
+    }
+    for name, (build, _) in AGGREGATES.items():
+        ops[f"aggregate {name}"] = lambda build=build: build(data)
+    ops["RFMEngine build"] = lambda: RFMEngine(data)
+    return ops
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=0, help="skala dataset sintetis (0 = main_data)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.scale:
+            encoded = load_main_data(*prepare_synthetic(args.scale, work_dir, args.seed))
+        else:
+            encoded = load_main_data()
+    columns = [col for col in ID_COLUMNS if col in encoded.columns]
+    plain = decode_ids(encoded)
+
+    print(f"{len(encoded)} baris")
+    print(f"{'kolom':22s} {'unik':>8s} {'string MB':>10s} {'kode MB':>10s} {'hemat':>7s}")
+    total_plain = total_encoded = 0
+    for col in columns:
+        plain_mb = plain[col].memory_usage(index=False, deep=True) / 1e6
+        encoded_mb = encoded[col].memory_usage(index=False, deep=True) / 1e6
+        total_plain += plain_mb
+        total_encoded += encoded_mb
+        print(f"{col:22s} {encoded[col].nunique():8d} {plain_mb:10.2f} {encoded_mb:10.2f} {1 - encoded_mb / plain_mb:7.0%}")
+    print(f"{'total kolom ID':22s} {'':8s} {total_plain:10.2f} {total_encoded:10.2f} {1 - total_encoded / total_plain:7.0%}")
+    print(f"{'total tabel':22s} {'':8s} {plain.memory_usage(deep=True).sum() / 1e6:10.2f} "
+          f"{encoded.memory_usage(deep=True).sum() / 1e6:10.2f}")
+
+    print(f"\n{'operasi':34s} {'string ms':>10s} {'kode ms':>10s} {'speedup':>8s}")
+    encoded_ops = operations(encoded)
+    for name, fn in operations(plain).items():
+        plain_ms = timed(fn, args.repeat)
+        encoded_ms = timed(encoded_ops[name], args.repeat)
+        print(f"{name:34s} {plain_ms:10.2f} {encoded_ms:10.2f} {plain_ms / encoded_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Laporan waktu import saat cold start setiap halaman dashboard (seperti python -X importtime).
+# Setiap halaman dijalankan di proses baru lewat streamlit AppTest: halaman About Data dirender
+# dulu (landing page), lalu halaman tujuan dipilih. Hanya import setelah harness siap yang dihitung.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_imports.py [--top 8] [--pages "About Data,Data"]
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+PAGES = ["About Data", "Data", "Customer Behaviour", "Seller Peformances", "Geolocation Map", "RFM Analysis"]
+HEAVY_PACKAGES = ["matplotlib", "seaborn", "folium", "plotly", "starlette", "uvicorn", "requests"]
+MARKER = "--- dashboard ---"
+
+CHILD = f"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+page = sys.argv[1]
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+at = AppTest.from_file("dashboard.py", default_timeout=300)
+if page == "Data":
+    at.session_state["main_page"] = "Data"
+at.run()
+landing = time.perf_counter() - start
+if page not in ("About Data", "Data"):
+    at.sidebar.selectbox[0].set_value(page).run()
+print(json.dumps({{"landing_seconds": landing, "seconds": time.perf_counter() - start,
+                  "exception": len(at.exception) > 0}}))
+"""
+
+
+def parse_importtime(stderr):
+    # Baris "import time: self [us] | cumulative | nama"; hanya setelah MARKER
+    self_us = defaultdict(int)
+    modules = 0
+    started = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|", 2)
+        self_us[name.strip().split(".")[0]] += int(own)
+        modules += 1
+    return modules, self_us
+
+
+def run_page(page):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD, page],
+                          capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules, self_us = parse_importtime(proc.stderr)
+    result.update(page=page, modules=modules, import_seconds=sum(self_us.values()) / 1e6,
+                  packages=dict(self_us))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--top", type=int, default=8, help="jumlah paket terberat yang ditampilkan")
+    parser.add_argument("--out", default=None, help="simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    results = [run_page(page) for page in args.pages.split(",")]
+    print(f"{'halaman':20s} {'landing s':>10s} {'total s':>8s} {'import s':>9s} {'modul':>6s}  paket berat dimuat")
+    for result in results:
+        heavy = [name for name in HEAVY_PACKAGES if name in result["packages"]]
+        print(f"{result['page']:20s} {result['landing_seconds']:10.2f} {result['seconds']:8.2f} "
+              f"{result['import_seconds']:9.2f} {result['modules']:6d}  {', '.join(heavy) or '-'}"
+              f"{'  (EXCEPTION)' if result['exception'] else ''}")
+    for result in results:
+        top = sorted(result["packages"].items(), key=lambda item: -item[1])[:args.top]
+        print(f"\n{result['page']}: " + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in top))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Benchmark: penambahan batch pesanan baru (ingest.py) vs membangun ulang seluruh dataset.
+# Tabel mentah sintetis dibagi menurut waktu pembelian: pesanan terlama menjadi dataset dasar,
+# sisanya dikirim sebagai beberapa batch. Setiap batch diukur per langkah (CSV, snapshot delta,
+# RFM, agregat) lalu dibandingkan dengan pipeline penuh + build_aggregates + RFMEngine, dan hasil
+# akhirnya dicek terhadap hitung ulang penuh (ingest.Ingestor.check_consistency).
+# Materialisasi (tabel fakta lengkap + agregat untuk Analytics) diukur terpisah setelah semua batch,
+# karena hanya terjadi saat hasilnya dibaca.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_ingest.py --scale 1 --batches 3 --batch-orders 1000
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from aggregates import build_aggregates  # noqa: E402
+from data_loader import load_main_data, raw_table_path  # noqa: E402
+from ingest import Ingestor, compare_aggregates  # noqa: E402
+from pipeline import ORDER_TABLES, build_main_data, read_raw_table, write_main_data  # noqa: E402
+from rfm import RFMEngine  # noqa: E402
+from synthetic import write_raw_tables  # noqa: E402
+from time_index import TimeIndex  # noqa: E402
+
+
+def split_orders(raw_dir, base_dir, batch_dirs):
+    # Pesanan diurutkan menurut waktu pembelian; batch terakhir berisi pesanan terbaru
+    shutil.copytree(raw_dir, base_dir)
+    tables = {name: read_raw_table(name, raw_dir) for name in ORDER_TABLES}
+    order_ids = tables["orders"].sort_values("order_purchase_timestamp")["order_id"]
+    batch_orders = len(order_ids) - sum(size for _, size in batch_dirs)
+    parts = [(base_dir, order_ids.iloc[:batch_orders])]
+    for batch_dir, size in batch_dirs:
+        os.makedirs(batch_dir)
+        parts.append((batch_dir, order_ids.iloc[batch_orders:batch_orders + size]))
+        batch_orders += size
+    for out_dir, ids in parts:
+        for name, table in tables.items():
+            table[table["order_id"].isin(set(ids))].to_csv(raw_table_path(name, out_dir), index=False)
+
+
+def full_rebuild(raw_dir, work_dir):
+    # Jalur tanpa ingest: join semua tabel, tulis CSV + snapshot, lalu hitung semua agregat dan RFM
+    start = time.perf_counter()
+    csv_path = os.path.join(work_dir, "full.csv")
+    snapshot_path = os.path.join(work_dir, "full.arrow")
+    write_main_data(build_main_data(raw_dir), csv_path, snapshot_path)
+    data = load_main_data(csv_path, snapshot_path)
+    aggregates = build_aggregates(data)
+    RFMEngine(data, TimeIndex(data))
+    return time.perf_counter() - start, aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--batches", type=int, default=3)
+    parser.add_argument("--batch-orders", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        raw_dir = os.path.join(work_dir, "raw")
+        base_dir = os.path.join(work_dir, "base")
+        write_raw_tables(raw_dir, scale=args.scale, seed=args.seed)
+        batch_dirs = [(os.path.join(work_dir, f"batch{i}"), args.batch_orders) for i in range(args.batches)]
+        split_orders(raw_dir, base_dir, batch_dirs)
+
+        csv_path = os.path.join(work_dir, "main_data.csv")
+        snapshot_path = os.path.join(work_dir, "main_data.arrow")
+        write_main_data(build_main_data(base_dir), csv_path, snapshot_path)
+        start = time.perf_counter()
+        ingestor = Ingestor(csv_path, snapshot_path, raw_dir=base_dir)
+        print(f"dataset dasar: {ingestor.n_rows} baris, state awal {time.perf_counter() - start:.2f}s")
+
+        steps = ["join", "csv", "data", "snapshot", "rfm", "aggregates"]
+        print(f"\n{'batch':6s} {'baris':>7s} {'mode':>8s} " + " ".join(f"{name + ' s':>12s}" for name in steps)
+              + f" {'total s':>9s}")
+        for i, (batch_dir, _) in enumerate(batch_dirs):
+            start = time.perf_counter()
+            rows = ingestor.join_batch({name: read_raw_table(name, batch_dir) for name in ORDER_TABLES})
+            join_seconds = time.perf_counter() - start
+            report = ingestor.append(rows)
+            report["join"] = join_seconds
+            print(f"{i + 1:<6d} {report['rows']:7d} {report['mode']:>8s} "
+                  + " ".join(f"{report[name]:12.3f}" for name in steps)
+                  + f" {report['seconds'] + join_seconds:9.3f}")
+
+        start = time.perf_counter()
+        ingestor.analytics()
+        print(f"\nmaterialisasi setelah {len(batch_dirs)} batch (tabel fakta + agregat): "
+              f"{time.perf_counter() - start:.3f}s")
+
+        full_seconds, full_aggregates = full_rebuild(raw_dir, work_dir)
+        print(f"bangun ulang penuh ({ingestor.n_rows} baris): {full_seconds:.2f}s")
+
+        result = ingestor.check_consistency()
+        problems = result["problems"] + compare_aggregates(full_aggregates, ingestor.state.aggregates())
+        print(f"konsistensi vs hitung ulang penuh ({result['seconds']:.2f}s): " + ("; ".join(problems) or "OK"))
+        rows = pd.read_csv(csv_path, usecols=["order_id"])
+        print(f"main_data.csv: {len(rows)} baris, {rows['order_id'].nunique()} pesanan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Benchmark: peta loop iterrows (versi lama) vs satu layer vektor (map_render)
+# Jalankan dari folder dashboard/:  python ../benchmarks/bench_maps.py [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+
+from aggregates import build_aggregates  # noqa: E402
+from data_loader import load_main_data  # noqa: E402
+from map_render import map_html, render_area_map, render_count_map  # noqa: E402
+
+
+def legacy_count_map(frame, center):
+    # Salinan logika lama halaman Customer Behaviour
+    top = frame.sort_values("customer_count", ascending=False).iloc[0]
+    m = folium.Map(location=center, zoom_start=5)
+    fg = folium.FeatureGroup(name="Pelanggan")
+    for _, row in frame.iterrows():
+        folium.CircleMarker(
+            location=[row["geolocation_lat"], row["geolocation_lng"]],
+            radius=row["customer_count"] / 100,
+            color="blue", fill=True, fill_color="blue", fill_opacity=0.6,
+            popup=f"{row['customer_city']}: {row['customer_count']} pelanggan",
+        ).add_to(fg)
+    fg.add_to(m)
+    folium.LayerControl().add_to(m)
+    folium.Marker(
+        location=[top["geolocation_lat"], top["geolocation_lng"]],
+        icon=folium.Icon(color="red", icon="star"),
+        popup=f"Top Pelanggan: {top['customer_city']} ({top['customer_count']})",
+    ).add_to(m)
+    return m
+
+
+def legacy_area_map(frame, zoom):
+    # Salinan logika lama halaman Geolocation Map (circle + marker per kota)
+    m = folium.Map(location=[frame["geolocation_lat"].mean(), frame["geolocation_lng"].mean()], zoom_start=zoom)
+    for _, row in frame.iterrows():
+        folium.Circle(
+            location=[row["geolocation_lat"], row["geolocation_lng"]], radius=5000,
+            color="blue", fill=True, fill_opacity=0.1, popup=f"Area {row['geolocation_city']}",
+        ).add_to(m)
+        folium.Marker(
+            location=[row["geolocation_lat"], row["geolocation_lng"]],
+            popup=f"{row['geolocation_city']}: {row['seller_count']} penjual, {row['customer_count']} pembeli",
+            icon=folium.Icon(color="green", icon="info-sign"),
+        ).add_to(m)
+    return m
+
+
+def scale_cities(frame, repeat):
+    # Perbanyak kota dengan sedikit pergeseran koordinat untuk mensimulasikan dataset lebih besar
+    if repeat <= 1:
+        return frame
+    rng = np.random.default_rng(0)
+    scaled = pd.concat([frame] * repeat, ignore_index=True)
+    scaled["geolocation_lat"] = scaled["geolocation_lat"].astype("float64") + rng.normal(0, 0.05, len(scaled))
+    scaled["geolocation_lng"] = scaled["geolocation_lng"].astype("float64") + rng.normal(0, 0.05, len(scaled))
+    return scaled
+
+
+def measure(build):
+    start = time.perf_counter()
+    html = map_html(build())
+    return time.perf_counter() - start, len(html.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1, help="kelipatan jumlah kota")
+    args = parser.parse_args()
+
+    aggregates = build_aggregates(load_main_data())
+    customers = scale_cities(aggregates["customer_city"], args.repeat)
+    cities = scale_cities(aggregates["geolocation_city"], args.repeat)
+    center = aggregates["map_center"]
+
+    cases = [
+        ("customer_city", len(customers),
+         lambda: legacy_count_map(customers, center),
+         lambda: render_count_map(customers, "customer_count", center, "blue", "Pelanggan",
+                                  "{customer_city}: {customer_count} pelanggan",
+                                  "Top Pelanggan: {customer_city} ({customer_count})", "red")),
+        ("geolocation_city", len(cities),
+         lambda: legacy_area_map(cities, 10),
+         lambda: render_area_map(cities, 10, "Area {geolocation_city}: {seller_count} penjual, {customer_count} pembeli")),
+    ]
+    print(f"{'peta':18s} {'kota':>6s} {'lama (s)':>9s} {'baru (s)':>9s} {'lama (KB)':>10s} {'baru (KB)':>10s}")
+    for name, n, legacy, vector in cases:
+        legacy_time, legacy_size = measure(legacy)
+        vector_time, vector_size = measure(vector)
+        print(f"{name:18s} {n:6d} {legacy_time:9.3f} {vector_time:9.3f} "
+              f"{legacy_size / 1024:10.1f} {vector_size / 1024:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
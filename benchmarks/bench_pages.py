@@ -0,0 +1,324 @@
+# Benchmark jalur data setiap halaman dashboard tanpa UI Streamlit.
+# Setiap langkah dikelompokkan per halaman dan tahap (load, groupby, filter, figure, map_html) lalu
+# dicatat waktu (terbaik dari --repeat), puncak alokasi Python (tracemalloc, dijalankan terpisah agar
+# tidak memperlambat pengukuran waktu), RSS saat ini dan RSS puncak proses.
+# Dataset: main_data.csv di folder dashboard/ ("real") dan dataset sintetis skala 1x/10x/100x
+# (lihat synthetic.py). Hasil ditulis sebagai JSON agar bisa dibandingkan antar commit.
+#
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_pages.py [--scales 1,10,100] [--out hasil.json] [--compare lama.json]
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+import pandas as pd
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aggregates  # noqa: E402
+import charts  # noqa: E402
+from column_index import ColumnIndex  # noqa: E402
+from data_loader import CSV_PATH, SNAPSHOT_PATH, build_snapshot, read_csv_typed, read_snapshot  # noqa: E402
+from figure_cache import figure_to_png  # noqa: E402
+from geo_index import GeoIndex, viewport_bounds  # noqa: E402
+from map_render import map_html, render_area_map, render_count_map  # noqa: E402
+from pipeline import build_main_data, write_main_data  # noqa: E402
+import rfm_charts  # noqa: E402
+from rfm import RFMEngine  # noqa: E402
+from synthetic import write_raw_tables  # noqa: E402
+from time_index import TimeIndex  # noqa: E402
+
+PAGE_SIZE = (os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096)
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 2**20
+    except OSError:
+        return None
+
+
+def max_rss_mb():
+    # ru_maxrss: kilobyte di Linux, byte di macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 2**10
+
+
+def middle_range(lo, hi):
+    # Rentang filter "tipikal" untuk slider: kuartil tengah dari rentang penuh
+    span = hi - lo
+    return lo + span / 4, hi - span / 4
+
+
+class Bench:
+    def __init__(self, dataset, repeat, track_alloc):
+        self.dataset = dataset
+        self.repeat = repeat
+        self.track_alloc = track_alloc
+        self.records = []
+
+    def run(self, page, stage, name, fn):
+        # Jalankan fn `repeat` kali (waktu terbaik), lalu sekali lagi dengan tracemalloc untuk alokasi
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = fn()
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        peak_alloc = None
+        if self.track_alloc:
+            tracemalloc.start()
+            fn()
+            peak_alloc = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        record = {
+            "dataset": self.dataset, "page": page, "stage": stage, "name": name,
+            "seconds": round(best, 6),
+            "peak_alloc_mb": None if peak_alloc is None else round(peak_alloc, 3),
+            "rss_mb": round(current_rss_mb() or 0, 1),
+            "max_rss_mb": round(max_rss_mb(), 1),
+        }
+        if isinstance(result, (bytes, str)):
+            record["bytes"] = len(result)
+        self.records.append(record)
+        return result
+
+
+def bench_load(bench, csv_path, snapshot_path):
+    bench.run("shared", "load", "read_csv_typed", lambda: read_csv_typed(csv_path))
+    return bench.run("shared", "load", "read_snapshot", lambda: read_snapshot(snapshot_path))
+
+
+def bench_customer_behaviour(bench, data):
+    page = "Customer Behaviour"
+    center = bench.run(page, "groupby", "map_center",
+                       lambda: [float(data["geolocation_lat"].mean()), float(data["geolocation_lng"].mean())])
+    customer_group = bench.run(page, "groupby", "customer_city_summary",
+                               lambda: aggregates.customer_city_summary(data))
+    frequency = bench.run(page, "groupby", "purchase_frequency", lambda: aggregates.purchase_frequency(data))
+    review_counts = bench.run(page, "groupby", "review_counts", lambda: aggregates.review_counts(data))
+    payment_counts = bench.run(page, "groupby", "payment_counts", lambda: aggregates.payment_counts(data))
+
+    # Rentang penuh (nilai awal slider) agar peta berisi semua kota
+    filtered_group = bench.run(page, "filter", "customer_count_range", lambda: customer_group[
+        customer_group["customer_count"].between(customer_group["customer_count"].min(),
+                                                 customer_group["customer_count"].max())])
+    lo, hi = middle_range(frequency.min(), frequency.max())
+    filtered_frequency = bench.run(page, "filter", "purchase_frequency_range",
+                                   lambda: frequency[(frequency >= lo) & (frequency <= hi)])
+
+    bench.run(page, "figure", "purchase_frequency_hist",
+              lambda: figure_to_png(charts.purchase_frequency_hist(filtered_frequency)))
+    bench.run(page, "figure", "review_score_pie", lambda: figure_to_png(charts.review_score_pie(review_counts)))
+    bench.run(page, "figure", "payment_type_pie", lambda: figure_to_png(charts.payment_type_pie(payment_counts)))
+
+    bench.run(page, "map_html", "customer_count_map", lambda: map_html(render_count_map(
+        filtered_group, "customer_count", center, color="blue", layer_name="Pelanggan",
+        popup="{customer_city}: {customer_count} pelanggan",
+        top_popup="Top Pelanggan: {customer_city} ({customer_count})", top_color="red")))
+    return center
+
+
+def bench_seller_performances(bench, data, center):
+    page = "Seller Peformances"
+    seller = bench.run(page, "groupby", "seller_summary", lambda: aggregates.seller_summary(data))
+    seller_group = bench.run(page, "groupby", "seller_city_summary", lambda: aggregates.seller_city_summary(data))
+    time_index = bench.run(page, "groupby", "time_index", lambda: TimeIndex(data))
+
+    lo, hi = middle_range(seller["penjualan"].min(), seller["penjualan"].max())
+    top_sellers = bench.run(page, "filter", "top_sellers", lambda: seller[
+        (seller["penjualan"] >= lo) & (seller["penjualan"] <= hi)].sort_values("penjualan", ascending=False).head(10))
+    delivery = bench.run(page, "filter", "delivery_time_range", lambda: seller[
+        seller["delivery_time_actual"].between(seller["delivery_time_actual"].min(),
+                                               seller["delivery_time_actual"].max())])
+    # Rentang tanggal: setengah tengah periode data
+    start, end = middle_range(time_index.min_timestamp, time_index.max_timestamp)
+    dates = bench.run(page, "filter", "slice_dates",
+                      lambda: time_index.slice_dates(data, start.date(), end.date()))
+    averages = bench.run(page, "filter", "delivery_time_means", lambda: (
+        dates["delivery_time_actual"].mean(), dates["delivery_time_estimated"].mean()))
+    price_lo, price_hi = middle_range(float(data["price"].min()), float(data["price"].max()))
+    prices = bench.run(page, "filter", "price_range",
+                       lambda: data["price"][(data["price"] >= price_lo) & (data["price"] <= price_hi)])
+
+    bench.run(page, "figure", "top_sellers_bar", lambda: figure_to_png(charts.top_sellers_bar(top_sellers)))
+    bench.run(page, "figure", "delivery_time_boxplot",
+              lambda: figure_to_png(charts.delivery_time_boxplot(delivery)))
+    bench.run(page, "figure", "delivery_comparison_bar",
+              lambda: figure_to_png(charts.delivery_comparison_bar(*averages)))
+    bench.run(page, "figure", "price_hist", lambda: figure_to_png(charts.price_hist(prices)))
+
+    bench.run(page, "map_html", "seller_count_map", lambda: map_html(render_count_map(
+        seller_group, "seller_count", center, color="red", layer_name="Penjual",
+        popup="{seller_city}: {seller_count} penjual",
+        top_popup="Top Penjual: {seller_city} ({seller_count})", top_color="blue")))
+    return time_index
+
+
+def bench_geolocation_map(bench, data):
+    page = "Geolocation Map"
+    city_group = bench.run(page, "groupby", "geolocation_city_summary",
+                           lambda: aggregates.geolocation_city_summary(data))
+    # Nilai awal number_input (0, 0): semua kota ikut ditampilkan
+    filtered = bench.run(page, "filter", "min_sellers_customers", lambda: city_group[
+        (city_group["seller_count"] >= 0) & (city_group["customer_count"] >= 0)])
+    center = [float(filtered["geolocation_lat"].mean()), float(filtered["geolocation_lng"].mean())]
+    # Indeks spasial dibangun sekali per dataset; per rerun hanya query viewport pada zoom awal slider
+    index = bench.run(page, "groupby", "geo_index", lambda: GeoIndex(
+        city_group, weights=["seller_count", "customer_count"]))
+    points = bench.run(page, "filter", "viewport", lambda: index.viewport(viewport_bounds(center, 10), 10))
+    bench.run(page, "map_html", "area_map", lambda: map_html(render_area_map(
+        points, 10, center=center,
+        popup="Area {seller_count} penjual, {customer_count} pembeli",
+        cluster_popup="{points} kota: {seller_count} penjual, {customer_count} pembeli")))
+
+
+def bench_rfm(bench, data, time_index):
+    page = "RFM Analysis"
+    engine = bench.run(page, "groupby", "rfm_engine", lambda: RFMEngine(data, time_index))
+    first, last = engine.min_timestamp.date(), engine.max_timestamp.date()
+    # Hitung penuh (rentang baru) dan inkremental (ujung akhir digeser satu bulan)
+    full = bench.run(page, "groupby", "rfm_compute_full",
+                     lambda: (engine.compute(first, first), engine.compute(first, last))[1])
+    shifted = (engine.max_timestamp - pd.Timedelta(days=30)).date()
+    bench.run(page, "groupby", "rfm_compute_shift",
+              lambda: (engine.compute(first, last), engine.compute(first, shifted))[1])
+
+    bench.run(page, "filter", "group_monetary",
+              lambda: full[(full["Transaction_Group"] == "Low") & (full["Monetary_bin"] == "100-500")])
+    # Grafik dibuat dari opsi "All" seperti nilai awal halaman: data diringkas di server lalu figure plotly
+    chart_data = bench.run(page, "groupby", "rfm_chart_data", lambda: rfm_charts.rfm_chart_data(full))
+    figures = {
+        "recency_hist": lambda: rfm_charts.histogram_figure(chart_data["histograms"]["Recency"], "Recency", "Distribusi Recency", "skyblue"),
+        "frequency_hist": lambda: rfm_charts.histogram_figure(chart_data["histograms"]["Frequency"], "Frequency", "Distribusi Frequency", "salmon"),
+        "monetary_hist": lambda: rfm_charts.histogram_figure(chart_data["histograms"]["Monetary"], "Monetary", "Distribusi Monetary", "lightgreen"),
+        "frequency_monetary_scatter": lambda: rfm_charts.scatter_figure(chart_data["scatter"], "Frequency vs Monetary"),
+        "group_monetary_box": lambda: rfm_charts.box_figure(chart_data["box"], "Monetary per kelompok"),
+        "monetary_bin_bar": lambda: rfm_charts.monetary_bin_figure(chart_data["monetary_bins"], "Binning",
+                                                                   {"index": "Kategori", "value": "Jumlah"}),
+    }
+    for name, build in figures.items():
+        # Ukuran JSON = payload yang dikirim st.plotly_chart ke browser
+        bench.run(page, "figure", name, lambda build=build: build().to_json())
+
+
+def bench_data_page(bench, data):
+    page = "Data"
+    index = bench.run(page, "groupby", "column_index", lambda: ColumnIndex(data))
+    value = index.unique_values("payment_type")[0]
+    bench.run(page, "filter", "payment_type_head80", lambda: data.iloc[index.positions("payment_type", value)[:80]])
+    bench.run(page, "filter", "price_desc_head80", lambda: data.iloc[index.price_positions(descending=True)[:80]])
+    bench.run(page, "filter", "tail80", lambda: data.tail(80))
+
+
+def bench_dataset(bench, csv_path, snapshot_path):
+    data = bench_load(bench, csv_path, snapshot_path)
+    center = bench_customer_behaviour(bench, data)
+    time_index = bench_seller_performances(bench, data, center)
+    bench_geolocation_map(bench, data)
+    bench_rfm(bench, data, time_index)
+    bench_data_page(bench, data)
+    return len(data)
+
+
+def prepare_synthetic(scale, work_dir, seed):
+    # Tabel mentah sintetis -> pipeline.build_main_data -> main_data.csv + snapshot Arrow
+    raw_dir = os.path.join(work_dir, "raw")
+    write_raw_tables(raw_dir, scale=scale, seed=seed)
+    csv_path = os.path.join(work_dir, "main_data.csv")
+    snapshot_path = os.path.join(work_dir, "main_data.arrow")
+    write_main_data(build_main_data(raw_dir), csv_path, snapshot_path)
+    return csv_path, snapshot_path
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_records(records):
+    print(f"{'dataset':16s} {'page':20s} {'stage':9s} {'name':28s} {'detik':>10s} {'alloc MB':>9s} {'RSS MB':>8s} {'bytes':>10s}")
+    for r in records:
+        alloc = "-" if r["peak_alloc_mb"] is None else f"{r['peak_alloc_mb']:.1f}"
+        size = r.get("bytes", "")
+        print(f"{r['dataset']:16s} {r['page']:20s} {r['stage']:9s} {r['name']:28s} "
+              f"{r['seconds']:10.4f} {alloc:>9s} {r['rss_mb']:8.1f} {size:>10}")
+
+
+def compare(old_path, new_records):
+    # Rasio waktu baru/lama per langkah (> 1 berarti lebih lambat)
+    with open(old_path) as f:
+        old = {(r["dataset"], r["page"], r["name"]): r for r in json.load(f)["records"]}
+    print(f"\n{'dataset':16s} {'page':20s} {'name':28s} {'lama':>10s} {'baru':>10s} {'rasio':>7s}")
+    for r in new_records:
+        before = old.get((r["dataset"], r["page"], r["name"]))
+        if before is None or not before["seconds"]:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        print(f"{r['dataset']:16s} {r['page']:20s} {r['name']:28s} "
+              f"{before['seconds']:10.4f} {r['seconds']:10.4f} {ratio:7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="1,10", help="skala dataset sintetis, dipisah koma ('' untuk melewati)")
+    parser.add_argument("--no-real", action="store_true", help="lewati main_data.csv di folder dashboard/")
+    parser.add_argument("--repeat", type=int, default=3, help="jumlah pengulangan per langkah (waktu terbaik)")
+    parser.add_argument("--no-alloc", action="store_true", help="lewati pengukuran alokasi tracemalloc")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_pages.json", help="path hasil JSON")
+    parser.add_argument("--compare", help="hasil JSON sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    datasets = []
+    if not args.no_real and os.path.exists(CSV_PATH):
+        datasets.append(("real", CSV_PATH, SNAPSHOT_PATH, None))
+    for scale in [s for s in args.scales.split(",") if s]:
+        datasets.append((f"synthetic-{scale}x", None, None, float(scale)))
+
+    records = []
+    sizes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, csv_path, snapshot_path, scale in datasets:
+            if scale is not None:
+                start = time.perf_counter()
+                csv_path, snapshot_path = prepare_synthetic(scale, os.path.join(tmp, name), args.seed)
+                print(f"{name}: dataset dibuat dalam {time.perf_counter() - start:.1f}s")
+            elif not os.path.exists(snapshot_path):
+                build_snapshot(csv_path, snapshot_path)
+            bench = Bench(name, args.repeat, not args.no_alloc)
+            sizes[name] = {"rows": bench_dataset(bench, csv_path, snapshot_path),
+                           "csv_bytes": os.path.getsize(csv_path)}
+            records.extend(bench.records)
+
+    result = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "datasets": sizes,
+        "records": records,
+    }
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=1)
+    print_records(records)
+    print(f"\nHasil ditulis ke {args.out}")
+    if args.compare:
+        compare(args.compare, records)
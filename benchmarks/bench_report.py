@@ -0,0 +1,119 @@
+# Mode laporan (report.py): waktu merender --presets preset filter (semua halaman) dalam satu
+# proses yang memuat dataset sekali, berurutan dan dengan worker paralel, dibandingkan dengan
+# satu proses baru per preset (muat dataset + warm-up + render, seperti membuka aplikasi dari awal
+# untuk setiap preset; diukur untuk --cold preset lalu diekstrapolasi).
+# Setiap preset mengubah 3 kelompok filter secara acak; filter lain memakai nilai awal widget.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_report.py [--scale 3] [--presets 50] [--workers 4] [--cold 2]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pages import prepare_synthetic  # noqa: E402
+from data_loader import CSV_PATH, SNAPSHOT_PATH, dataset_version, load_main_data  # noqa: E402
+from report import run_report  # noqa: E402
+from warmup import warm_analytics  # noqa: E402
+
+# Satu proses baru: muat + warm-up dataset, lalu render satu preset
+COLD_RUN = """
+import sys
+sys.path.insert(0, {dashboard!r})
+from data_loader import dataset_version, load_main_data
+from report import run_report
+from warmup import warm_analytics
+analytics, _ = warm_analytics(load_main_data({csv!r}, {snapshot!r}), dataset_version({csv!r}))
+run_report(analytics, {presets!r}, {out!r}, workers=1)
+"""
+
+
+def _sub_range(rng, low, high, integer):
+    # Rentang acak di dalam [low, high]
+    a, b = sorted(rng.uniform(low, high, 2))
+    return [int(a), int(b) + 1] if integer else [round(a, 2), round(b, 2)]
+
+
+def make_presets(info, count, seed):
+    rng = np.random.default_rng(seed)
+    ranges = info["ranges"]
+    months = info["delivery_months"]
+    dates = ranges["purchase_date"]
+    variations = [
+        lambda: {"customer_count": _sub_range(rng, *ranges["customer_count"], True)},
+        lambda: {"penjualan": _sub_range(rng, *ranges["penjualan"], True)},
+        lambda: {"price": _sub_range(rng, *ranges["price"], False)},
+        lambda: {"delivery_dimension": str(rng.choice(["seller", "route"])),
+                 "delivery_months": sorted(rng.choice(months, 2).tolist())},
+        lambda: {"heatmap_metric": str(rng.choice(["late_rate", "p50", "p90"])),
+                 "heatmap_months": sorted(rng.choice(months, 2).tolist())},
+        lambda: {"min_sellers": int(rng.integers(0, 10)), "min_customers": int(rng.integers(0, 50)),
+                 "map_zoom": int(rng.integers(5, 12))},
+        lambda: {"rfm_dates": [dates[0], str(np.datetime64(dates[1]) - np.timedelta64(int(rng.integers(0, 365)), "D"))],
+                 "rfm_group": str(rng.choice(["All", "Low", "Medium"]))},
+    ]
+    presets = []
+    for i in range(count):
+        filters = {}
+        for index in rng.choice(len(variations), 3, replace=False):
+            filters.update(variations[index]())
+        presets.append({"name": f"preset {i}", "filters": filters})
+    return presets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=0, help="skala dataset sintetis (0 = main_data)")
+    parser.add_argument("--presets", type=int, default=50, help="jumlah preset")
+    parser.add_argument("--workers", type=int, default=None, help="worker render (default: jumlah CPU)")
+    parser.add_argument("--cold", type=int, default=2, help="jumlah preset yang diukur sebagai proses baru")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.scale:
+            csv_path, snapshot_path = prepare_synthetic(args.scale, work_dir, args.seed)
+        else:
+            csv_path, snapshot_path = os.path.abspath(CSV_PATH), os.path.abspath(SNAPSHOT_PATH)
+        start = time.perf_counter()
+        analytics, _ = warm_analytics(load_main_data(csv_path, snapshot_path), dataset_version(csv_path))
+        load_seconds = time.perf_counter() - start
+        presets = make_presets(analytics.info(), args.presets, args.seed)
+        print(f"{len(analytics.data)} baris, muat + warm-up {load_seconds:.2f}s, {os.cpu_count()} CPU")
+
+        # Satu preset dengan nilai awal widget = membuka semua halaman sekali
+        single = run_report(analytics, [{"name": "awal"}], os.path.join(work_dir, "single"), workers=1)["stats"]
+        print(f"\n1 preset (semua halaman, nilai awal): {single['total_seconds']:.2f}s, {single['rendered']} bagian")
+
+        print(f"\n{len(presets)} preset")
+        results = []
+        for label, workers in [("berurutan", 1), ("paralel", args.workers or os.cpu_count())]:
+            stats = run_report(analytics, presets, os.path.join(work_dir, label), workers=workers)["stats"]
+            results.append(stats["total_seconds"])
+            print(f"  satu proses, {label:9s} ({stats['workers']} worker) {stats['total_seconds']:7.2f}s   "
+                  f"{stats['sections']} bagian, {stats['rendered']} dirender")
+
+        cold = []
+        for preset in presets[:args.cold]:
+            script = COLD_RUN.format(dashboard=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"),
+                                     csv=csv_path, snapshot=snapshot_path, presets=[preset],
+                                     out=os.path.join(work_dir, "cold"))
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+            cold.append(time.perf_counter() - start)
+        estimate = float(np.mean(cold)) * len(presets)
+        print(f"  proses baru per preset  {np.mean(cold):7.2f}s per preset -> {estimate:7.2f}s untuk {len(presets)} preset "
+              f"({estimate / min(results):.1f}x lebih lambat)")
+        print(json.dumps({"presets": len(presets), "single_seconds": single["total_seconds"],
+                          "report_seconds": results, "cold_seconds_per_preset": round(float(np.mean(cold)), 3)}))
+
+
+if __name__ == "__main__":
+    main()
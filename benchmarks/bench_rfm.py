@@ -0,0 +1,88 @@
+# Benchmark: RFM versi lama (groupby + lambda + apply) vs rfm.RFMEngine (penuh dan inkremental)
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_rfm.py                       # memakai main_data
+#   python ../benchmarks/bench_rfm.py --synthetic 100000    # data sintetis ~100k customer
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+
+from data_loader import load_main_data  # noqa: E402
+from rfm import RFMEngine  # noqa: E402
+
+
+def legacy_rfm(data, start_date, end_date):
+    # Salinan logika lama halaman RFM Analysis
+    data = data[(data["order_purchase_timestamp"] >= start_date) &
+                (data["order_purchase_timestamp"] <= end_date)]
+    snapshot_date = data['order_purchase_timestamp'].max() + pd.Timedelta(days=1)
+    rfm = data.groupby('customer_unique_id').agg({
+        'order_purchase_timestamp': lambda x: (snapshot_date - x.max()).days,
+        'order_id': 'count',
+        'payment_value': 'sum'
+    }).reset_index()
+    rfm.columns = ['customer_unique_id', 'Recency', 'Frequency', 'Monetary']
+    rfm['Transaction_Group'] = rfm['Frequency'].apply(lambda f: "Low" if f <= 2 else ("Medium" if f <= 5 else "High"))
+    rfm['Monetary_bin'] = pd.cut(rfm['Monetary'], bins=[0, 100, 500, 1000, 5000, np.inf],
+                                 labels=['<100', '100-500', '500-1000', '1000-5000', '>5000'], include_lowest=True)
+    return rfm
+
+
+def synthetic_orders(n_customers, seed=0):
+    # Sekitar 1,2 baris transaksi per customer, rentang 2016-09 s.d. 2018-09 seperti dataset asli
+    rng = np.random.default_rng(seed)
+    n_rows = int(n_customers * 1.2)
+    ids = np.array([f"{x:032x}" for x in rng.integers(0, 2**63, n_customers)])
+    return pd.DataFrame({
+        "customer_unique_id": ids[np.concatenate([np.arange(n_customers), rng.integers(0, n_customers, n_rows - n_customers)])],
+        "order_id": [f"{x:032x}" for x in rng.integers(0, 2**63, n_rows)],
+        "order_purchase_timestamp": pd.Timestamp("2016-09-01") + pd.to_timedelta(rng.integers(0, 730 * 86400, n_rows), unit="s"),
+        "payment_value": rng.gamma(2, 80, n_rows).round(2),
+    })
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", type=int, default=0, help="jumlah customer sintetis (0 = main_data)")
+    args = parser.parse_args()
+
+    data = synthetic_orders(args.synthetic) if args.synthetic else load_main_data()
+    start = time.perf_counter()
+    engine = RFMEngine(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    first = engine.min_timestamp.normalize()
+    last = engine.max_timestamp.normalize()
+    shifted = (first + pd.Timedelta(days=30), last - pd.Timedelta(days=30))
+
+    def full():
+        engine._bounds = None
+        engine.compute(first, last)
+
+    def incremental():
+        # Jendela bergeser bolak-balik 30 hari: hanya potongan yang masuk/keluar yang dihitung
+        engine.compute(first, last)
+        engine.compute(*shifted)
+
+    print(f"{len(data)} baris, {engine.n_customers} customer; build engine {build_ms:.1f} ms")
+    print(f"lama (groupby + lambda)       {timed(lambda: legacy_rfm(data, first, last), repeat=1):9.1f} ms")
+    print(f"RFMEngine penuh               {timed(full):9.1f} ms")
+    print(f"RFMEngine inkremental (x2)    {timed(incremental):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# Latensi bagian halaman Seller Performance: perhitungan sinkron per rerun vs thread pool bersama
+# (sections.py) dengan pembatalan nilai widget yang sudah digantikan.
+#   drag - slider harga digeser: --values nilai berurutan tiba setiap --interval detik. Jalur
+#          sinkron menghitung setiap rerun sampai selesai lalu memakai nilai terbaru yang masuk
+#          selama itu; jalur pool mengirim setiap nilai ke slot yang sama sehingga tugas lama batal.
+#          Dilaporkan waktu dari nilai terakhir sampai chart-nya siap dan jumlah chart yang dirender.
+#   page - semua bagian halaman dengan cache kosong: waktu sampai chart pertama dan terakhir siap,
+#          berurutan vs paralel di pool.
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_sections.py [--scale 3] [--values 12 --interval 0.05] [--workers 4]
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import charts  # noqa: E402
+from bench_pages import prepare_synthetic  # noqa: E402
+from data_loader import CSV_PATH, SNAPSHOT_PATH, dataset_version, load_main_data  # noqa: E402
+from figure_cache import FigureCache  # noqa: E402
+from map_cache import MapCache  # noqa: E402
+from map_render import render_count_map  # noqa: E402
+from sections import SectionPool, checkpoint, wait  # noqa: E402
+from warmup import warm_analytics  # noqa: E402
+
+
+def price_sections(analytics):
+    # build(nilai) untuk histogram harga (bagian termahal halaman: KDE)
+    def build(price_range):
+        prices = analytics.prices(min_price=price_range[0], max_price=price_range[1])
+        checkpoint()
+        return charts.price_hist(prices)
+    return build
+
+
+def page_sections(analytics, info):
+    # (id, cache, build) untuk bagian Seller Performance dengan nilai awal widget
+    ranges = info["ranges"]
+    return [
+        ("top_sellers_bar", "figure", lambda: charts.top_sellers_bar(
+            analytics.seller_ranking(*ranges["penjualan"], top=10))),
+        ("delivery_time_boxplot", "figure", lambda: charts.delivery_time_boxplot(
+            analytics.seller_delivery(*ranges["delivery_time_actual"]))),
+        ("seller_count", "map", lambda: render_count_map(
+            analytics.city_distribution("seller", *ranges["seller_count"]), "seller_count", info["map_center"],
+            color="red", layer_name="Penjual", popup="{seller_city}: {seller_count} penjual",
+            top_popup="Top Penjual: {seller_city} ({seller_count})", top_color="blue")),
+        ("delivery_comparison_bar", "figure", lambda: charts.delivery_comparison_bar(
+            *(lambda stats: (stats["avg_actual"], stats["avg_estimated"]))(
+                analytics.delivery_stats(*ranges["purchase_date"])))),
+        ("price_hist", "figure", lambda: charts.price_hist(analytics.prices(*ranges["price"]))),
+        ("delivery_distance_bar", "figure", lambda: charts.delivery_distance_bar(analytics.delivery_distance())),
+    ]
+
+
+def drag_values(info, count):
+    # Batas atas rentang harga bergeser dari maksimum ke 10% rentang
+    low, high = info["ranges"]["price"]
+    return [(low, high - (high - low) * 0.9 * i / max(count - 1, 1)) for i in range(count)]
+
+
+def drag_sync(build, values, interval):
+    cache = FigureCache()
+    start = time.perf_counter()
+    arrivals = [start + i * interval for i in range(len(values))]
+    latest = lambda: max(i for i, arrival in enumerate(arrivals) if arrival <= time.perf_counter())  # noqa: E731
+    rendered, index = 0, 0
+    while True:
+        cache.render("price_hist", 0, values[index], lambda: build(values[index]))
+        rendered += 1
+        if index == len(values) - 1:
+            return time.perf_counter() - arrivals[-1], rendered
+        # Rerun berikutnya memakai nilai terbaru; tunggu jika belum ada nilai baru
+        time.sleep(max(0.0, arrivals[index + 1] - time.perf_counter()))
+        index = latest()
+
+
+def drag_pool(build, values, interval, workers):
+    cache = FigureCache()
+    pool = SectionPool(workers)
+    rendered = []
+
+    def compute(value):
+        figure = build(value)
+        checkpoint()
+        png = cache.serialize(figure)
+        cache.put(cache.make_key("price_hist", 0, value), png)
+        rendered.append(value)
+        return png
+
+    start = time.perf_counter()
+    for i, value in enumerate(values):
+        time.sleep(max(0.0, start + i * interval - time.perf_counter()))
+        future = pool.submit("bench", ("Seller Peformances", "price_hist"), cache.make_key("price_hist", 0, value),
+                             lambda value=value: compute(value))
+    last = time.perf_counter()
+    wait(future)
+    seconds = time.perf_counter() - last
+    stats = pool.stats()
+    pool.shutdown()
+    return seconds, len(rendered), stats
+
+
+def page_serial(sections):
+    caches = {"figure": FigureCache(), "map": MapCache()}
+    start = time.perf_counter()
+    ready = []
+    for name, cache, build in sections:
+        caches[cache].render(name, 0, (), build)
+        ready.append(time.perf_counter() - start)
+    return ready
+
+
+def page_pool(sections, workers):
+    caches = {"figure": FigureCache(), "map": MapCache()}
+    pool = SectionPool(workers)
+    start = time.perf_counter()
+    ready = []
+    lock = threading.Lock()
+
+    def compute(cache, build):
+        payload = cache.serialize(build())
+        with lock:
+            ready.append(time.perf_counter() - start)
+        return payload
+
+    futures = [pool.submit("bench", ("Seller Peformances", name), (name,),
+                           lambda cache=caches[cache], build=build: compute(cache, build))
+               for name, cache, build in sections]
+    for future in futures:
+        wait(future)
+    pool.shutdown()
+    return sorted(ready)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=0, help="skala dataset sintetis (0 = main_data)")
+    parser.add_argument("--values", type=int, default=12, help="jumlah nilai slider selama digeser")
+    parser.add_argument("--interval", type=float, default=0.05, help="jeda antar nilai slider (detik)")
+    parser.add_argument("--workers", type=int, default=None, help="worker pool (default: sections.default_workers)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.scale:
+            csv_path, snapshot_path = prepare_synthetic(args.scale, work_dir, args.seed)
+        else:
+            csv_path, snapshot_path = CSV_PATH, SNAPSHOT_PATH
+        data = load_main_data(csv_path, snapshot_path)
+        analytics, _ = warm_analytics(data, dataset_version(csv_path))
+        info = analytics.info()
+        analytics.delivery_distance()  # indeks kode pos dibangun sekali, seperti setelah warm-up halaman
+        workers = SectionPool(args.workers)
+        workers.shutdown()
+        print(f"{len(data)} baris, {workers.workers} worker, {os.cpu_count()} CPU")
+
+        build = price_sections(analytics)
+        values = drag_values(info, args.values)
+        print(f"\ndrag slider harga: {len(values)} nilai, jeda {args.interval * 1000:.0f} ms")
+        seconds, rendered = drag_sync(build, values, args.interval)
+        print(f"  sinkron  {seconds:7.3f}s setelah nilai terakhir, {rendered} chart dirender")
+        seconds, rendered, stats = drag_pool(build, values, args.interval, workers.workers)
+        print(f"  pool     {seconds:7.3f}s setelah nilai terakhir, {rendered} chart dirender, "
+              f"{stats['cancelled']} tugas dibatalkan")
+
+        sections = page_sections(analytics, info)
+        print(f"\nhalaman Seller Performance, cache kosong ({len(sections)} bagian)")
+        for mode, ready in [("berurutan", page_serial(sections)), ("pool", page_pool(sections, workers.workers))]:
+            print(f"  {mode:9s} chart pertama {ready[0]:6.3f}s, terakhir {ready[-1]:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
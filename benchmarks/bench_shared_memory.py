@@ -0,0 +1,94 @@
+# Memori per proses saat beberapa proses server memuat tabel fakta yang sama.
+# Setiap mode dijalankan di N proses yang hidup bersamaan (seperti beberapa proses Streamlit di
+# belakang load balancer):
+#   copy   - Table.to_pandas(): setiap proses menyalin seluruh tabel ke memori privatnya
+#   shared - data_loader.read_snapshot(): kolom menunjuk langsung ke snapshot yang di-memory-map,
+#            halaman file dipakai bersama lewat page cache OS
+# Dilaporkan RSS, memori privat, dan memori bersama per proses sebelum dan sesudah load, serta
+# total PSS semua proses (halaman bersama dihitung sekali dan dibagi rata).
+# Jalankan dari folder dashboard/:
+#   python ../benchmarks/bench_shared_memory.py --processes 4 [--scale 3] [--warm]
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pages import prepare_synthetic  # noqa: E402
+from data_loader import CSV_PATH, SNAPSHOT_PATH, load_main_data, read_snapshot, read_snapshot_table  # noqa: E402
+from profiling import process_memory  # noqa: E402
+
+MODES = ["copy", "shared"]
+
+
+def worker(mode, snapshot_path, warm, barrier, results):
+    # Dijalankan di proses anak: ukur sebelum load, load, tunggu semua proses selesai load, ukur lagi
+    before = process_memory()
+    if mode == "copy":
+        data = read_snapshot_table(snapshot_path).to_pandas()
+    else:
+        data = read_snapshot(snapshot_path)
+    if warm:
+        from warmup import warm_analytics
+        warm_analytics(data, "bench", workers=1)
+    # Sentuh semua kolom agar halaman memory-map benar-benar dimuat (seperti halaman yang dibuka)
+    for col in data.columns:
+        data[col].iloc[::1000].tolist()
+    barrier.wait()
+    results.put((os.getpid(), before, process_memory()))
+    barrier.wait()  # tetap hidup sampai semua proses selesai mengukur (PSS dibagi antar proses)
+
+
+def run_mode(mode, snapshot_path, processes, warm):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    children = [context.Process(target=worker, args=(mode, snapshot_path, warm, barrier, results))
+                for _ in range(processes)]
+    for child in children:
+        child.start()
+    measured = [results.get() for _ in children]
+    for child in children:
+        child.join()
+    return measured
+
+
+def mb(value):
+    return f"{value / 1e6:9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--scale", type=float, default=0, help="skala dataset sintetis (0 = main_data)")
+    parser.add_argument("--warm", action="store_true", help="hitung juga agregat, RFM, dan indeks (warmup.py)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.scale:
+            csv_path, snapshot_path = prepare_synthetic(args.scale, work_dir, args.seed)
+        else:
+            csv_path, snapshot_path = CSV_PATH, SNAPSHOT_PATH
+        rows = len(load_main_data(csv_path, snapshot_path))
+        size = os.path.getsize(snapshot_path)
+        print(f"{rows} baris, snapshot {size / 1e6:.1f} MB, {args.processes} proses"
+              f"{', dengan warm-up' if args.warm else ''}")
+
+        print(f"\n{'mode':8s} {'pid':>7s} {'RSS awal':>9s} {'RSS':>9s} {'privat':>9s} {'bersama':>9s} {'+privat':>9s}")
+        totals = {}
+        for mode in MODES:
+            measured = run_mode(mode, snapshot_path, args.processes, args.warm)
+            for pid, before, after in measured:
+                print(f"{mode:8s} {pid:7d} {mb(before['rss'])} {mb(after['rss'])} {mb(after['private'])} "
+                      f"{mb(after['shared'])} {mb(after['private'] - before['private'])}")
+            totals[mode] = sum(after["pss"] for _, _, after in measured)
+
+    print("\ntotal PSS semua proses (MB): " + ", ".join(f"{mode} {totals[mode] / 1e6:.1f}" for mode in MODES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Generator dataset sintetis dengan skema tabel mentah E-Commerce Public Dataset.
+# Produk dan seller diambil dari data/products_dataset.csv dan data/sellers_dataset.csv (beserta
+# terjemahan kategori), tabel transaksi dibangkitkan acak dengan proporsi mirip dataset asli.
+# Skala 1x ~ ukuran sampel publik (99.441 pesanan).
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+BASE_ORDERS = 99_441
+PAYMENT_TYPES = ["credit_card", "boleto", "voucher", "debit_card"]
+PAYMENT_WEIGHTS = [0.74, 0.19, 0.05, 0.02]
+REVIEW_WEIGHTS = [0.11, 0.03, 0.08, 0.19, 0.59]
+
+
+def hex_ids(rng, n):
+    # n ID heksadesimal 32 karakter, dibangkitkan sekaligus (tanpa f-string per baris)
+    raw = np.frombuffer(rng.bytes(16 * n).hex().encode(), dtype="S32")
+    return raw.astype(str)
+
+
+def random_timestamps(rng, start, seconds, n):
+    return pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, seconds, n), unit="s")
+
+
+def write_raw_tables(out_dir, scale=1.0, seed=0, data_dir=DATA_DIR):
+    # Tulis tabel mentah (nama file sama dengan data_loader.RAW_TABLES) ke out_dir
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ["products_dataset.csv", "sellers_dataset.csv", "product_category_name_translation.csv"]:
+        shutil.copy(os.path.join(data_dir, name), os.path.join(out_dir, name))
+
+    products = pd.read_csv(os.path.join(data_dir, "products_dataset.csv"), usecols=["product_id"])
+    sellers = pd.read_csv(os.path.join(data_dir, "sellers_dataset.csv"), dtype={"seller_zip_code_prefix": str})
+    locations = sellers[["seller_zip_code_prefix", "seller_city", "seller_state"]].drop_duplicates("seller_zip_code_prefix")
+
+    n_orders = int(BASE_ORDERS * scale)
+    n_customers = n_orders  # satu customer_id per pesanan seperti dataset asli
+    n_unique = int(n_customers * 0.97)  # sebagian customer_unique_id berbelanja lebih dari sekali
+
+    # --- Geolocation: beberapa titik per kode pos di sekitar koordinat acak kota ---
+    centers_lat = rng.uniform(-30, -5, len(locations))
+    centers_lng = rng.uniform(-55, -35, len(locations))
+    geo_idx = np.concatenate([np.arange(len(locations)), rng.integers(0, len(locations), len(locations) * 9)])
+    pd.DataFrame({
+        "geolocation_zip_code_prefix": locations["seller_zip_code_prefix"].to_numpy()[geo_idx],
+        "geolocation_lat": centers_lat[geo_idx] + rng.normal(0, 0.02, len(geo_idx)),
+        "geolocation_lng": centers_lng[geo_idx] + rng.normal(0, 0.02, len(geo_idx)),
+        "geolocation_city": locations["seller_city"].to_numpy()[geo_idx],
+        "geolocation_state": locations["seller_state"].to_numpy()[geo_idx],
+    }).to_csv(os.path.join(out_dir, "geolocation_dataset.csv"), index=False)
+
+    # --- Customers ---
+    customer_ids = hex_ids(rng, n_customers)
+    unique_ids = hex_ids(rng, n_unique)
+    loc = rng.integers(0, len(locations), n_customers)
+    pd.DataFrame({
+        "customer_id": customer_ids,
+        "customer_unique_id": unique_ids[np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, n_customers - n_unique)])],
+        "customer_zip_code_prefix": locations["seller_zip_code_prefix"].to_numpy()[loc],
+        "customer_city": locations["seller_city"].to_numpy()[loc],
+        "customer_state": locations["seller_state"].to_numpy()[loc],
+    }).to_csv(os.path.join(out_dir, "customers_dataset.csv"), index=False)
+
+    # --- Orders ---
+    order_ids = hex_ids(rng, n_orders)
+    purchase = random_timestamps(rng, "2016-09-04", 760 * 86400, n_orders)
+    delivered = purchase + pd.to_timedelta(rng.gamma(3, 4, n_orders) * 86400, unit="s")
+    estimated = (purchase + pd.to_timedelta(rng.integers(10, 40, n_orders), unit="D")).normalize()
+    pd.DataFrame({
+        "order_id": order_ids,
+        "customer_id": customer_ids[rng.permutation(n_customers)],
+        "order_status": "delivered",
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": purchase,
+        "order_delivered_carrier_date": purchase,
+        "order_delivered_customer_date": delivered.where(rng.random(n_orders) > 0.03),
+        "order_estimated_delivery_date": estimated,
+    }).to_csv(os.path.join(out_dir, "orders_dataset.csv"), index=False)
+
+    # --- Order items: 1-3 item per pesanan ---
+    items_per_order = rng.choice([1, 2, 3], n_orders, p=[0.9, 0.08, 0.02])
+    item_orders = np.repeat(np.arange(n_orders), items_per_order)
+    item_number = np.arange(len(item_orders)) - np.repeat(np.cumsum(items_per_order) - items_per_order, items_per_order) + 1
+    pd.DataFrame({
+        "order_id": order_ids[item_orders],
+        "order_item_id": item_number,
+        "product_id": products["product_id"].to_numpy()[rng.integers(0, len(products), len(item_orders))],
+        "seller_id": sellers["seller_id"].to_numpy()[rng.zipf(1.6, len(item_orders)) % len(sellers)],
+        "shipping_limit_date": purchase[item_orders] + pd.Timedelta(days=6),
+        "price": rng.lognormal(4.5, 0.9, len(item_orders)).round(2),
+        "freight_value": rng.gamma(2, 10, len(item_orders)).round(2),
+    }).to_csv(os.path.join(out_dir, "order_items_dataset.csv"), index=False)
+
+    # --- Payments dan reviews: satu per pesanan ---
+    pd.DataFrame({
+        "order_id": order_ids,
+        "payment_sequential": 1,
+        "payment_type": rng.choice(PAYMENT_TYPES, n_orders, p=PAYMENT_WEIGHTS),
+        "payment_installments": rng.integers(1, 10, n_orders),
+        "payment_value": rng.lognormal(4.8, 0.9, n_orders).round(2),
+    }).to_csv(os.path.join(out_dir, "order_payments_dataset.csv"), index=False)
+
+    review_dates = estimated + pd.Timedelta(days=1)
+    pd.DataFrame({
+        "review_id": hex_ids(rng, n_orders),
+        "order_id": order_ids,
+        "review_score": rng.choice([1, 2, 3, 4, 5], n_orders, p=REVIEW_WEIGHTS),
+        "review_comment_title": None,
+        "review_comment_message": None,
+        "review_creation_date": review_dates,
+        "review_answer_timestamp": review_dates,
+    }).to_csv(os.path.join(out_dir, "order_reviews_dataset.csv"), index=False)
+    return n_orders
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from delivery import DELIVERY_COLUMNS, DeliverySketches
+
+# Agregat yang dipakai halaman peta/seller dihitung sekali per dataset, lalu slider dan
+# number_input cukup memfilter beberapa ribu baris hasil agregasi, bukan seluruh tabel fakta.
+# Catatan: 'nunique' (string) memakai jalur cython, sedangkan pd.Series.nunique dipanggil per grup.
+
+
+def customer_city_summary(data):
+    # Jumlah customer unik dan rata-rata koordinat per kota pelanggan
+    return data.groupby("customer_city", observed=True).agg(
+        customer_count=("customer_id", "nunique"),
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+    ).reset_index()
+
+
+def seller_city_summary(data):
+    # Jumlah seller unik dan rata-rata koordinat per kota penjual
+    return data.groupby("seller_city", observed=True).agg(
+        seller_count=("seller_id", "nunique"),
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+    ).reset_index()
+
+
+def geolocation_city_summary(data):
+    # Jumlah seller dan pembeli unik per kota geolokasi (halaman Geolocation Map)
+    return data.groupby("geolocation_city", observed=True).agg(
+        seller_count=("seller_id", "nunique"),
+        customer_count=("customer_unique_id", "nunique"),
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+    ).reset_index()
+
+
+def seller_summary(data):
+    # Jumlah penjualan dan rata-rata waktu pengiriman aktual per seller
+    seller = data.groupby("seller_id", observed=True).agg(
+        penjualan=("seller_id", "size"),
+        delivery_time_actual=("delivery_time_actual", "mean"),
+    ).reset_index()
+    # Int16 nullable -> float64 biasa (NaN untuk seller tanpa pesanan terkirim)
+    seller["delivery_time_actual"] = seller["delivery_time_actual"].astype("float64")
+    return seller
+
+
+def purchase_frequency(data):
+    # Jumlah pembelian per customer
+    return data.groupby("customer_unique_id", observed=True).size()
+
+
+def review_counts(data):
+    # Jumlah review per skor, urut berdasarkan skor
+    return data["review_score"].value_counts().sort_index()
+
+
+def payment_counts(data):
+    # Jumlah transaksi per metode pembayaran, urut dari yang terbanyak
+    counts = data["payment_type"].value_counts()
+    # payment_type bertipe kategori: buang kategori tanpa transaksi
+    return counts[counts > 0]
+
+
+def map_center(data):
+    # Titik tengah peta: rata-rata koordinat seluruh transaksi
+    return [float(data["geolocation_lat"].mean()), float(data["geolocation_lng"].mean())]
+
+
+# Nama agregat -> (fungsi, kolom tabel fakta yang dibutuhkan). Kolom dicatat agar warmup.py bisa
+# membaca hanya kolom tersebut dari snapshot Arrow di setiap proses worker.
+AGGREGATES = {
+    "map_center": (map_center, ["geolocation_lat", "geolocation_lng"]),
+    "customer_city": (customer_city_summary, ["customer_city", "customer_id", "geolocation_lat", "geolocation_lng"]),
+    "seller_city": (seller_city_summary, ["seller_city", "seller_id", "geolocation_lat", "geolocation_lng"]),
+    "geolocation_city": (geolocation_city_summary,
+                         ["geolocation_city", "seller_id", "customer_unique_id", "geolocation_lat", "geolocation_lng"]),
+    "seller": (seller_summary, ["seller_id", "delivery_time_actual"]),
+    "purchase_frequency": (purchase_frequency, ["customer_unique_id"]),
+    "review_counts": (review_counts, ["review_score"]),
+    "payment_counts": (payment_counts, ["payment_type"]),
+    "delivery": (DeliverySketches.from_data, DELIVERY_COLUMNS),
+}
+
+
+def build_aggregates(data):
+    return {name: build(data) for name, (build, _) in AGGREGATES.items()}
@@ -0,0 +1,357 @@
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+from column_index import INDEXED_COLUMNS, ColumnIndex
+from data_loader import decode_ids
+from delivery import DIMENSIONS
+from geo_index import GeoIndex, haversine_km, viewport_bounds
+from rfm import GROUP_LABELS, MONETARY_LABELS, RFMEngine
+from rfm_charts import rfm_chart_data
+from time_index import TimeIndex
+
+# Lapisan analitik tanpa Streamlit: semua perhitungan halaman dashboard sebagai method biasa
+# yang menerima parameter filter dan mengembalikan DataFrame/Series/dict. Dipakai langsung oleh
+# dashboard.py, atau dilayani lewat HTTP oleh api.py sehingga beberapa replika dashboard bisa
+# berbagi satu proses yang datanya sudah dimuat.
+#
+# Parameter setiap query (beserta tipenya) didaftarkan di QUERIES; api.py memakainya untuk
+# mengonversi query string. Nilai None berarti filter tidak dipakai (rentang penuh).
+
+SELLER_TOP_N = 10
+SLA_TOP_N = 15
+PREVIEW_ROWS = 80
+# Batas rentang jarak seller -> pelanggan (km) untuk analisis waktu pengiriman
+DISTANCE_BINS_KM = [0, 50, 100, 250, 500, 1000, 2000]
+
+
+def _date(value):
+    return value if isinstance(value, datetime.date) else datetime.date.fromisoformat(value)
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"nilai boolean tidak valid: {value!r}")
+
+
+# Nama query -> {parameter: konverter}; konverter di dalam list berarti parameter bernilai banyak
+QUERIES = {
+    "city_distribution": {"kind": str, "min_count": int, "max_count": int},
+    "geolocation_cities": {"min_sellers": int, "min_customers": int},
+    "city_map": {"min_sellers": int, "min_customers": int, "zoom": int, "lat": float, "lng": float},
+    "purchase_frequency": {"min_purchases": int, "max_purchases": int},
+    "review_mix": {"scores": [int]},
+    "payment_mix": {"payment_types": [str]},
+    "seller_ranking": {"min_sales": int, "max_sales": int, "top": int},
+    "seller_delivery": {"min_days": float, "max_days": float},
+    "delivery_stats": {"start_date": _date, "end_date": _date},
+    "delivery_distance": {},
+    "delivery_sla": {"dimension": str, "start_date": _date, "end_date": _date, "min_count": int, "top": int},
+    "route_heatmap": {"start_date": _date, "end_date": _date, "min_count": int},
+    "delivery_monthly": {"dimension": str, "key": str},
+    "prices": {"min_price": float, "max_price": float},
+    "rfm": {"start_date": _date, "end_date": _date, "group": str, "monetary_bin": str},
+    "rfm_charts": {"start_date": _date, "end_date": _date, "group": str, "monetary_bin": str},
+    "unique_values": {"column": str},
+    "data_preview": {"column": str, "value": str, "descending": _bool, "tail": _bool, "rows": int},
+}
+# Query yang hasilnya dict/list (JSON) dan yang hasilnya Series; selebihnya DataFrame
+JSON_QUERIES = {"delivery_stats", "unique_values", "rfm_charts"}
+SERIES_QUERIES = {"purchase_frequency", "review_mix", "payment_mix", "prices"}
+
+
+class RawDataUnavailable(RuntimeError):
+    # Query membutuhkan baris transaksi, tetapi analitik berjalan dari ringkasan (streaming.py)
+    pass
+
+
+def _in_range(values, low, high):
+    mask = np.ones(len(values), dtype=bool)
+    if low is not None:
+        mask &= (values >= low).to_numpy()
+    if high is not None:
+        mask &= (values <= high).to_numpy()
+    return mask
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _value_range(values):
+    return [_scalar(values.min()), _scalar(values.max())]
+
+
+def filter_rfm(rfm, group="All", monetary_bin="All"):
+    # Filter tambahan halaman RFM; "All" berarti tanpa filter
+    if group != "All":
+        rfm = rfm[rfm["Transaction_Group"] == group]
+    if monetary_bin != "All":
+        rfm = rfm[rfm["Monetary_bin"] == monetary_bin]
+    return rfm
+
+
+class Analytics:
+    def __init__(self, data, aggregates, version, rfm_engine=None, column_index=None):
+        # data: tabel fakta dari data_loader (None pada mode ringkasan), aggregates: build_aggregates
+        # atau streaming.load_summaries, version: versi dataset untuk kunci cache.
+        # rfm_engine/column_index boleh diisi hasil warmup.py; jika tidak, dibangun saat dibutuhkan.
+        self.data = data
+        self.aggregates = aggregates
+        self.version = version
+        self._lock = threading.Lock()
+        self._time_index = None if rfm_engine is None else rfm_engine.time_index
+        self._rfm_engine = rfm_engine
+        self._column_index = column_index
+        self._geo_index = None
+        self._zip_index = None
+        self._seller_distance = None
+        self._info = None
+
+    @property
+    def has_raw_data(self):
+        return self.data is not None
+
+    def _require_raw_data(self):
+        if self.data is None:
+            raise RawDataUnavailable("query ini membutuhkan main_data.csv")
+
+    # Indeks dibangun saat pertama kali dibutuhkan, sekali per instance
+    @property
+    def time_index(self):
+        self._require_raw_data()
+        with self._lock:
+            if self._time_index is None:
+                self._time_index = TimeIndex(self.data)
+            return self._time_index
+
+    @property
+    def rfm_engine(self):
+        time_index = self.time_index
+        with self._lock:
+            if self._rfm_engine is None:
+                self._rfm_engine = RFMEngine(self.data, time_index)
+            return self._rfm_engine
+
+    @property
+    def column_index(self):
+        self._require_raw_data()
+        with self._lock:
+            if self._column_index is None:
+                self._column_index = ColumnIndex(self.data)
+            return self._column_index
+
+    @property
+    def geo_index(self):
+        # Indeks spasial centroid kota geolokasi (tersedia juga pada mode ringkasan)
+        with self._lock:
+            if self._geo_index is None:
+                self._geo_index = GeoIndex(self.aggregates["geolocation_city"], weights=["seller_count", "customer_count"])
+            return self._geo_index
+
+    @property
+    def zip_index(self):
+        # Centroid per kode pos dari koordinat geolokasi di tabel fakta (kode pos pelanggan)
+        self._require_raw_data()
+        with self._lock:
+            if self._zip_index is None:
+                zips = self.data.groupby("geolocation_zip_code_prefix", observed=True)[
+                    ["geolocation_lat", "geolocation_lng"]].mean().reset_index()
+                self._zip_index = GeoIndex(zips, key="geolocation_zip_code_prefix", zooms=())
+            return self._zip_index
+
+    def seller_distance(self):
+        # Jarak (km) seller -> pelanggan per baris: koordinat kode pos seller dicari di zip_index,
+        # bukan dihitung berpasangan; NaN jika kode pos seller tidak punya koordinat
+        zip_index = self.zip_index
+        with self._lock:
+            if self._seller_distance is None:
+                seller_lat, seller_lng = zip_index.locate(self.data["seller_zip_code_prefix"])
+                self._seller_distance = haversine_km(seller_lat, seller_lng, self.data["geolocation_lat"],
+                                                     self.data["geolocation_lng"])
+            return self._seller_distance
+
+    def info(self):
+        # Versi dataset dan batas nilai widget (slider, multiselect, tanggal) untuk semua halaman
+        if self._info is not None:
+            return self._info
+        agg = self.aggregates
+        info = {
+            "version": self.version,
+            "has_raw_data": self.has_raw_data,
+            "map_center": agg["map_center"],
+            "ranges": {
+                "customer_count": _value_range(agg["customer_city"]["customer_count"]),
+                "seller_count": _value_range(agg["seller_city"]["seller_count"]),
+                "purchase_frequency": _value_range(agg["purchase_frequency"]),
+                "penjualan": _value_range(agg["seller"]["penjualan"]),
+                "delivery_time_actual": _value_range(agg["seller"]["delivery_time_actual"]),
+            },
+            "review_scores": [int(score) for score in agg["review_counts"].index],
+            "payment_types": [str(payment) for payment in agg["payment_counts"].index],
+        }
+        if "delivery" in agg:
+            # Bulan pembelian yang tercakup sketsa pengiriman (pilihan slider rentang bulan)
+            info["delivery_months"] = [month.date().isoformat() for month in agg["delivery"].months]
+        if self.has_raw_data:
+            info["ranges"]["price"] = [float(self.data["price"].min()), float(self.data["price"].max())]
+            info["ranges"]["purchase_date"] = [self.time_index.min_timestamp.date().isoformat(),
+                                               self.time_index.max_timestamp.date().isoformat()]
+        self._info = info
+        return info
+
+    # --- Customer Behaviour ---
+    def city_distribution(self, kind, min_count=None, max_count=None):
+        # Kota pelanggan (kind="customer") atau penjual (kind="seller") dengan jumlah dalam rentang
+        if kind not in ("customer", "seller"):
+            raise ValueError(f"kind harus 'customer' atau 'seller', bukan {kind!r}")
+        frame = self.aggregates[f"{kind}_city"]
+        return frame[_in_range(frame[f"{kind}_count"], min_count, max_count)]
+
+    def purchase_frequency(self, min_purchases=None, max_purchases=None):
+        frequency = self.aggregates["purchase_frequency"]
+        return frequency[_in_range(frequency, min_purchases, max_purchases)]
+
+    def review_mix(self, scores=None):
+        counts = self.aggregates["review_counts"]
+        return counts if scores is None else counts[counts.index.isin(scores)]
+
+    def payment_mix(self, payment_types=None):
+        counts = self.aggregates["payment_counts"]
+        return counts if payment_types is None else counts[counts.index.isin(payment_types)]
+
+    # --- Seller Peformances ---
+    def seller_ranking(self, min_sales=None, max_sales=None, top=SELLER_TOP_N):
+        seller = self.aggregates["seller"]
+        seller = seller[_in_range(seller["penjualan"], min_sales, max_sales)]
+        # Hanya `top` baris yang ditampilkan di bar chart yang diubah kembali ke teks hex
+        return decode_ids(seller.sort_values("penjualan", ascending=False).head(top))
+
+    def seller_delivery(self, min_days=None, max_days=None):
+        seller = self.aggregates["seller"]
+        return seller[_in_range(seller["delivery_time_actual"], min_days, max_days)]
+
+    def delivery_stats(self, start_date, end_date):
+        # Rata-rata waktu pengiriman aktual vs estimasi untuk pembelian dalam rentang tanggal
+        rows = self.time_index.slice_dates(self.data, start_date, end_date)
+        if rows.empty:
+            return {"rows": 0, "avg_actual": None, "avg_estimated": None}
+        return {
+            "rows": len(rows),
+            "avg_actual": float(rows["delivery_time_actual"].mean()),
+            "avg_estimated": float(rows["delivery_time_estimated"].mean()),
+        }
+
+    def delivery_distance(self):
+        # Rata-rata waktu pengiriman aktual/estimasi per rentang jarak seller -> pelanggan;
+        # baris tanpa koordinat seller dikelompokkan sendiri
+        distance = self.seller_distance()
+        edges = DISTANCE_BINS_KM + [np.inf]
+        labels = [f"{low}-{high} km" for low, high in zip(edges[:-2], edges[1:-1])] + [f">= {edges[-2]} km"]
+        bins = pd.cut(distance, edges, right=False, labels=labels)
+        bins = bins.add_categories(["tanpa koordinat seller"]).fillna("tanpa koordinat seller")
+        frame = pd.DataFrame({
+            "jarak": bins,
+            "delivery_time_actual": self.data["delivery_time_actual"].astype("float64").to_numpy(),
+            "delivery_time_estimated": self.data["delivery_time_estimated"].astype("float64").to_numpy(),
+        })
+        result = frame.groupby("jarak", observed=False).agg(
+            baris=("delivery_time_actual", "size"),
+            delivery_time_actual=("delivery_time_actual", "mean"),
+            delivery_time_estimated=("delivery_time_estimated", "mean"),
+        ).reset_index()
+        result["jarak"] = result["jarak"].astype(str)
+        return result
+
+    # Statistik pengiriman dari sketsa per seller/rute/bulan (delivery.py), juga pada mode ringkasan.
+    # Rentang tanggal dibulatkan ke bulan penuh.
+    def _check_dimension(self, dimension):
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension harus salah satu dari {list(DIMENSIONS)}, bukan {dimension!r}")
+
+    def delivery_sla(self, dimension="seller", start_date=None, end_date=None, min_count=1, top=SLA_TOP_N):
+        # Seller/rute dengan tingkat keterlambatan tertinggi (minimal min_count pengiriman)
+        self._check_dimension(dimension)
+        summary = self.aggregates["delivery"].summary(dimension, start_date, end_date, min_count)
+        summary = summary.sort_values(["late_rate", "pengiriman"], ascending=False, ignore_index=True)
+        return decode_ids(summary.head(top))
+
+    def route_heatmap(self, start_date=None, end_date=None, min_count=1):
+        # Satu baris per rute seller_state -> customer_state (heatmap dipivot oleh charts.py)
+        return self.aggregates["delivery"].summary("route", start_date, end_date, min_count)
+
+    def delivery_monthly(self, dimension="all", key=None):
+        # Tren bulanan satu seller, satu rute (key "SP-RJ"), atau semua pengiriman (dimension="all")
+        if dimension != "all":
+            self._check_dimension(dimension)
+            if key is None:
+                raise ValueError(f"key wajib diisi untuk dimension {dimension!r}")
+            if dimension == "route":
+                key = tuple(key.split("-", 1))
+        try:
+            return self.aggregates["delivery"].monthly(dimension, key)
+        except KeyError:
+            raise ValueError(f"{dimension} tidak ditemukan: {key!r}") from None
+
+    def prices(self, min_price=None, max_price=None):
+        self._require_raw_data()
+        prices = self.data["price"]
+        return prices[_in_range(prices, min_price, max_price)]
+
+    # --- Geolocation Map ---
+    def geolocation_cities(self, min_sellers=0, min_customers=0):
+        cities = self.aggregates["geolocation_city"]
+        return cities[(cities["seller_count"] >= min_sellers) & (cities["customer_count"] >= min_customers)]
+
+    def city_map(self, min_sellers, min_customers, zoom, lat, lng):
+        # Cluster/kota yang terlihat di peta berpusat di (lat, lng) pada zoom: hanya area viewport
+        # yang dikirim ke browser. Kota tunggal diberi nama kotanya, cluster "<n> kota".
+        cities = self.aggregates["geolocation_city"]
+        positions = None
+        if min_sellers > 0 or min_customers > 0:
+            positions = np.flatnonzero(((cities["seller_count"] >= min_sellers)
+                                        & (cities["customer_count"] >= min_customers)).to_numpy())
+        points = self.geo_index.viewport(viewport_bounds((lat, lng), zoom), zoom, positions)
+        names = cities["geolocation_city"].astype(str).to_numpy()[points["position"].to_numpy()]
+        points["geolocation_city"] = np.where(points["points"] == 1, names, points["points"].astype(str) + " kota")
+        return points.drop(columns="position")
+
+    # --- RFM Analysis ---
+    def rfm(self, start_date, end_date, group="All", monetary_bin="All"):
+        if group not in ["All"] + GROUP_LABELS:
+            raise ValueError(f"kelompok transaksi tidak dikenal: {group!r}")
+        if monetary_bin not in ["All"] + MONETARY_LABELS:
+            raise ValueError(f"kategori pengeluaran tidak dikenal: {monetary_bin!r}")
+        return filter_rfm(self.rfm_engine.compute(start_date, end_date), group, monetary_bin)
+
+    def rfm_charts(self, start_date, end_date, group="All", monetary_bin="All"):
+        # Histogram, statistik boxplot, dan sampel scatter yang sudah diringkas (rfm_charts.py)
+        return rfm_chart_data(self.rfm(start_date, end_date, group, monetary_bin))
+
+    # --- Data ---
+    def _check_column(self, column):
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"kolom {column!r} tidak diindeks (pilihan: {', '.join(INDEXED_COLUMNS)})")
+
+    def unique_values(self, column):
+        self._check_column(column)
+        return self.column_index.unique_values(column)
+
+    def data_preview(self, column=None, value=None, descending=True, tail=False, rows=PREVIEW_ROWS):
+        # `rows` baris awal/akhir setelah filter column == value, atau urut harga jika column="price"
+        index = self.column_index
+        if column == "price":
+            positions = index.price_positions(descending=descending)
+        elif column is not None and value is not None:
+            self._check_column(column)
+            positions = index.positions(column, value)
+        else:
+            return decode_ids(self.data.tail(rows) if tail else self.data.head(rows))
+        return decode_ids(self.data.iloc[positions[-rows:] if tail else positions[:rows]])
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import datetime
+import json
+
+import pandas as pd
+import pyarrow as pa
+import requests
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from analytics import JSON_QUERIES, QUERIES, SERIES_QUERIES, RawDataUnavailable
+from figure_cache import FigureCache
+from reloader import CHECK_INTERVAL, DatasetReloader
+
+# API HTTP lokal (async, Starlette + uvicorn: sudah terpasang bersama Streamlit) di atas
+# analytics.Analytics. Satu proses memuat data dan indeks sekali; beberapa replika dashboard
+# cukup menjalankan DASHBOARD_API_URL=http://127.0.0.1:8600 streamlit run dashboard.py.
+#
+#   GET /info                 -> JSON versi dataset dan batas nilai widget
+#   GET /query/<nama>?a=1&b=2 -> hasil query (DataFrame/Series: Arrow IPC stream, dict/list: JSON)
+#   Parameter bernilai banyak diulang: /query/review_mix?scores=4&scores=5
+#
+# Respons di-cache (LRU dengan batas byte) dengan kunci (nama query, versi dataset, parameter);
+# permintaan identik yang datang bersamaan hanya dihitung sekali.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def parse_params(name, items):
+    # items: pasangan (nama, nilai string) dari query string -> kwargs bertipe sesuai QUERIES
+    spec = QUERIES[name]
+    params = {}
+    for key, value in items:
+        if key not in spec:
+            raise ValueError(f"parameter tidak dikenal untuk {name}: {key!r}")
+        convert = spec[key]
+        if isinstance(convert, list):
+            values = params.setdefault(key, [])
+            if value != "":  # "a=" tanpa nilai = list kosong
+                values.append(convert[0](value))
+        else:
+            params[key] = convert(value)
+    return params
+
+
+def encode_params(params):
+    # Kebalikan parse_params: kwargs -> daftar pasangan query string (list diulang per nilai)
+    items = []
+    for key, value in params.items():
+        if isinstance(value, (list, tuple)) and not value:
+            items.append((key, ""))
+        for item in (value if isinstance(value, (list, tuple)) else [value]):
+            if item is None:
+                continue
+            if isinstance(item, bool):
+                item = int(item)
+            elif isinstance(item, (datetime.date, datetime.datetime)):
+                item = item.isoformat()
+            items.append((key, str(item)))
+    return items
+
+
+def media_type(name):
+    return "application/json" if name in JSON_QUERIES else ARROW_MEDIA_TYPE
+
+
+def encode_result(result):
+    # dict/list -> JSON; DataFrame/Series -> Arrow IPC stream (Series sebagai frame satu kolom)
+    if isinstance(result, (dict, list)):
+        return json.dumps(result).encode()
+    if isinstance(result, pd.Series):
+        result = result.to_frame(name=result.name if isinstance(result.name, str) else "value")
+    table = pa.Table.from_pandas(result, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_result(name, body):
+    if name in JSON_QUERIES:
+        return json.loads(body)
+    frame = pa.ipc.open_stream(body).read_all().to_pandas()
+    return frame.iloc[:, 0] if name in SERIES_QUERIES else frame
+
+
+def create_app(reloader, cache=None):
+    # reloader: reloader.DatasetReloader; setiap permintaan memakai Analytics versi aktif
+    cache = cache if cache is not None else FigureCache(max_bytes=DEFAULT_CACHE_BYTES)
+    reloader.on_swap(lambda old_version, new_version: cache.evict_version(old_version))
+    pending = {}  # kunci cache -> Future untuk permintaan yang sedang dihitung
+
+    async def compute(analytics, name, params):
+        result = await run_in_threadpool(getattr(analytics, name), **params)
+        return await run_in_threadpool(encode_result, result)
+
+    async def info(request):
+        analytics = reloader.current()
+        return JSONResponse(await run_in_threadpool(analytics.info))
+
+    async def query(request):
+        name = request.path_params["name"]
+        if name not in QUERIES:
+            return JSONResponse({"error": f"query tidak dikenal: {name}"}, status_code=404)
+        try:
+            params = parse_params(name, request.query_params.multi_items())
+        except ValueError as exc:
+            return JSONResponse({"error": str(exc)}, status_code=400)
+
+        analytics = reloader.current()
+        key = cache.make_key(name, analytics.version, params)
+        body = cache.get(key)
+        cache_status = "hit"
+        if body is None:
+            cache_status = "miss"
+            task = pending.get(key)
+            if task is None:
+                task = pending[key] = asyncio.ensure_future(compute(analytics, name, params))
+                task.add_done_callback(lambda _: pending.pop(key, None))
+            try:
+                body = await asyncio.shield(task)
+            except RawDataUnavailable as exc:
+                return JSONResponse({"error": str(exc)}, status_code=409)
+            except (ValueError, TypeError, KeyError) as exc:
+                return JSONResponse({"error": str(exc)}, status_code=400)
+            cache.put(key, body)
+
+        headers = {"X-Cache": cache_status, "X-Dataset-Version": str(analytics.version)}
+        return Response(body, media_type=media_type(name), headers=headers)
+
+    return Starlette(routes=[Route("/info", info), Route("/query/{name}", query)])
+
+
+class AnalyticsClient:
+    # Klien HTTP dengan method yang sama seperti Analytics (info + semua nama di QUERIES)
+    def __init__(self, base_url, timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def info(self):
+        response = self._session.get(f"{self.base_url}/info", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @property
+    def version(self):
+        return self.info()["version"]
+
+    def query(self, name, **params):
+        response = self._session.get(f"{self.base_url}/query/{name}", params=encode_params(params),
+                                     timeout=self.timeout)
+        if response.status_code == 409:
+            raise RawDataUnavailable(response.json()["error"])
+        if response.status_code == 400:
+            raise ValueError(response.json()["error"])
+        response.raise_for_status()
+        return decode_result(name, response.content)
+
+    def __getattr__(self, name):
+        if name in QUERIES:
+            return lambda **params: self.query(name, **params)
+        raise AttributeError(name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_BYTES // 2**20,
+                        help="batas ukuran cache respons (MB)")
+    parser.add_argument("--check-interval", type=float, default=CHECK_INTERVAL,
+                        help="interval pengecekan versi dataset (detik)")
+    args = parser.parse_args()
+
+    reloader = DatasetReloader(interval=args.check_interval)
+    app = create_app(reloader, FigureCache(max_bytes=args.cache_mb * 2**20))
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,176 @@
+import matplotlib.patches as mpatches
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+
+# Fungsi pembuat figure matplotlib/seaborn untuk halaman Customer Behaviour dan Seller Performance.
+# Setiap fungsi menerima data yang sudah difilter dan mengembalikan figure (belum dirender).
+# Modul ini (beserta matplotlib/seaborn) baru diimpor saat halaman yang menggambar chart dibuka.
+# Figure dibuat langsung (bukan lewat pyplot) karena chart dirender di thread pool bersama
+# (sections.py), sedangkan state global pyplot tidak aman dipakai dari banyak thread.
+
+# Atur style visualisasi
+sns.set_style("whitegrid")
+
+# Warna khusus untuk setiap skor review (1 s.d. 5)
+SCORE_COLORS = {
+    1: "#2A2E5C",  # dark purple
+    2: "#1B728C",  # teal
+    3: "#1B8C5F",  # green
+    4: "#45BF55",  # light green
+    5: "#C1FA65"   # lime-ish
+}
+
+
+def _style_autotexts(autotexts):
+    # Ubah format teks persentase dengan background hitam
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_bbox(dict(facecolor='black', edgecolor='black', boxstyle='round,pad=0.3'))
+
+
+def purchase_frequency_hist(filtered_data):
+    fig_hist = Figure(figsize=(8, 5))
+    ax_hist = fig_hist.subplots()
+    sns.histplot(filtered_data, bins=30, kde=False, color="steelblue", ax=ax_hist)
+    ax_hist.set_xlabel("Jumlah Pembelian")
+    ax_hist.set_ylabel("Frekuensi Customer")
+    ax_hist.set_title("Distribusi Frekuensi Pembelian per Customer")
+    return fig_hist
+
+
+def review_score_pie(review_counts):
+    # Buat list warna sesuai urutan skor
+    review_colors = [SCORE_COLORS[score] for score in review_counts.index]
+
+    fig_pie1 = Figure(figsize=(8, 6))
+    ax_pie1 = fig_pie1.subplots()
+    wedges1, texts1, autotexts1 = ax_pie1.pie(
+        review_counts,
+        labels=review_counts.index,
+        autopct='%1.1f%%',
+        colors=review_colors,
+        startangle=140,
+        shadow=True,
+        wedgeprops={'edgecolor': 'black'}
+    )
+    _style_autotexts(autotexts1)
+    ax_pie1.set_title("Distribusi Skor Review", fontsize=14, fontweight='bold')
+
+    # Tambahkan legenda kustom agar warnanya sesuai dengan skor
+    patches = [mpatches.Patch(color=SCORE_COLORS[s], label=f"Score {s}") for s in review_counts.index]
+    ax_pie1.legend(handles=patches, loc="upper right", bbox_to_anchor=(1.2, 1))
+    return fig_pie1
+
+
+def payment_type_pie(payment_counts):
+    # Gunakan palet warna bergradasi (misalnya "viridis")
+    colors_payment = sns.color_palette("viridis", len(payment_counts))
+
+    # Atur efek explode untuk menonjolkan metode pembayaran paling populer (frekuensi tertinggi)
+    explode = [0.1 if i == 0 else 0 for i in range(len(payment_counts))]
+
+    fig_pie2 = Figure(figsize=(8, 6))
+    ax_pie2 = fig_pie2.subplots()
+    wedges2, texts2, autotexts2 = ax_pie2.pie(
+        payment_counts,
+        labels=payment_counts.index,
+        autopct='%1.1f%%',
+        colors=colors_payment,
+        startangle=140,
+        explode=explode,
+        shadow=True,
+        wedgeprops={'edgecolor': 'black'}
+    )
+    _style_autotexts(autotexts2)
+    ax_pie2.set_title("Proporsi Jenis Pembayaran yang Digunakan oleh Pelanggan", fontsize=14, fontweight='bold')
+
+    # Tambahkan legenda di samping
+    ax_pie2.legend(payment_counts.index, loc="upper right", bbox_to_anchor=(1.2, 1))
+    return fig_pie2
+
+
+def top_sellers_bar(top_sellers):
+    fig1 = Figure(figsize=(10, 6))
+    ax1 = fig1.subplots()
+    sns.barplot(data=top_sellers, x="penjualan", y="seller_id", palette="viridis", ax=ax1)
+    ax1.set_xlabel("Jumlah Penjualan")
+    ax1.set_ylabel("Seller ID")
+    ax1.set_title("Top 10 Seller dengan Penjualan Tertinggi")
+    return fig1
+
+
+def delivery_time_boxplot(filtered_delivery):
+    fig2 = Figure(figsize=(12, 6))
+    ax2 = fig2.subplots()
+    sns.boxplot(x=filtered_delivery["delivery_time_actual"], color="lightblue", ax=ax2)
+    ax2.set_xlabel("Rata-rata Waktu Pengiriman (hari)")
+    ax2.set_title("Distribusi Rata-rata Waktu Pengiriman per Seller")
+    return fig2
+
+
+def delivery_comparison_bar(avg_actual, avg_estimated):
+    avg_delivery_df = pd.DataFrame({
+        "Tipe": ["Actual", "Estimated"],
+        "Waktu Pengiriman": [avg_actual, avg_estimated]
+    })
+    fig4 = Figure(figsize=(6, 4))
+    ax4 = fig4.subplots()
+    sns.barplot(x="Tipe", y="Waktu Pengiriman", data=avg_delivery_df, palette="pastel", ax=ax4)
+    ax4.set_title("Rata-rata Waktu Pengiriman (Actual vs Estimated)")
+    return fig4
+
+
+def delivery_distance_bar(delivery_distance):
+    # delivery_distance: hasil Analytics.delivery_distance (satu baris per rentang jarak)
+    rows = delivery_distance[delivery_distance["baris"] > 0].melt(
+        id_vars="jarak", value_vars=["delivery_time_actual", "delivery_time_estimated"],
+        var_name="Tipe", value_name="Waktu Pengiriman")
+    rows["Tipe"] = rows["Tipe"].map({"delivery_time_actual": "Actual", "delivery_time_estimated": "Estimated"})
+    fig6 = Figure(figsize=(10, 5))
+    ax6 = fig6.subplots()
+    sns.barplot(data=rows, x="jarak", y="Waktu Pengiriman", hue="Tipe", palette="pastel", ax=ax6)
+    ax6.set_xlabel("Jarak Seller - Pelanggan")
+    ax6.set_ylabel("Rata-rata Waktu Pengiriman (hari)")
+    ax6.set_title("Rata-rata Waktu Pengiriman per Jarak")
+    ax6.tick_params(axis="x", rotation=30)
+    return fig6
+
+
+def late_rate_line(monthly, title):
+    # monthly: hasil Analytics.delivery_monthly (satu baris per bulan pembelian)
+    monthly = monthly[monthly["pengiriman"] > 0]
+    fig7 = Figure(figsize=(10, 5))
+    ax7 = fig7.subplots()
+    ax7.plot(monthly["month"], monthly["late_rate"] * 100, marker="o", color="crimson", label="Terlambat (%)")
+    ax7.set_ylabel("Pengiriman Terlambat (%)")
+    ax7.set_xlabel("Bulan Pembelian")
+    twin = ax7.twinx()
+    twin.plot(monthly["month"], monthly["p90"], linestyle="--", color="gray", label="p90 (hari)")
+    twin.set_ylabel("p90 Waktu Pengiriman (hari)")
+    twin.grid(False)
+    ax7.set_title(title)
+    lines = ax7.get_lines() + twin.get_lines()
+    ax7.legend(lines, [line.get_label() for line in lines], loc="lower left")
+    return fig7
+
+
+def route_heatmap(routes, metric, label):
+    # routes: hasil Analytics.route_heatmap; baris = seller_state, kolom = customer_state
+    table = routes.pivot_table(index="seller_state", columns="customer_state", values=metric, observed=True)
+    fig8 = Figure(figsize=(12, max(4, 0.4 * len(table) + 2)))
+    ax8 = fig8.subplots()
+    sns.heatmap(table, cmap="Reds", ax=ax8, cbar_kws={"label": label})
+    ax8.set_xlabel("Provinsi Pelanggan")
+    ax8.set_ylabel("Provinsi Seller")
+    ax8.set_title(f"{label} per Rute Pengiriman")
+    return fig8
+
+
+def price_hist(prices):
+    fig5 = Figure(figsize=(10, 6))
+    ax5 = fig5.subplots()
+    sns.histplot(prices, kde=True, ax=ax5, color="coral")
+    ax5.set_xlabel("Harga Produk")
+    ax5.set_title("Distribusi Harga Produk")
+    return fig5
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Indeks untuk halaman "Data": posisi baris per nilai kolom (inverted index) dan urutan harga
+# yang dihitung sekali saat load. Halaman cukup mengambil 80 posisi pertama/terakhir lalu
+# data.iloc[...] untuk 80 baris itu saja, tanpa data.copy(), scan kesamaan, atau sort_values.
+
+INDEXED_COLUMNS = ["payment_type", "product_category_name", "seller_city", "customer_city"]
+
+
+class ColumnIndex:
+    def __init__(self, data, columns=INDEXED_COLUMNS, price_column="price"):
+        self._values = {}
+        self._lookup = {}
+        self._order = {}
+        self._offsets = {}
+        for col in columns:
+            self._build(col, data[col])
+
+        # Urutan harga naik (NaN di akhir) dan turun (NaN tetap di akhir, seperti sort_values)
+        prices = data[price_column].to_numpy(dtype="float64")
+        ascending = np.argsort(prices, kind="stable")
+        n_valid = int(np.count_nonzero(~np.isnan(prices)))
+        self._price_ascending = ascending
+        self._price_descending = np.concatenate([ascending[:n_valid][::-1], ascending[n_valid:]])
+
+    def _build(self, col, series):
+        codes, uniques = pd.factorize(series, sort=False)  # NaN -> -1
+        uniques = np.asarray(uniques).tolist()
+        # Nilai diurutkan seperti sorted(...) di halaman Data, lalu kode dipetakan ulang ke urutan itu
+        values = sorted(uniques)
+        position = {value: i for i, value in enumerate(values)}
+        rank = np.array([position[value] for value in uniques], dtype="int64")
+        codes = np.where(codes >= 0, rank[np.maximum(codes, 0)], -1) if len(rank) else codes
+
+        valid = np.flatnonzero(codes >= 0)
+        # Format CSR: posisi baris dikelompokkan per kode nilai (tetap urut posisi karena sort stabil)
+        order = valid[np.argsort(codes[valid], kind="stable")]
+        counts = np.bincount(codes[valid], minlength=len(values))
+        self._values[col] = values
+        self._lookup[col] = position
+        self._order[col] = order
+        self._offsets[col] = np.concatenate([[0], np.cumsum(counts)])
+
+    def unique_values(self, col):
+        return self._values[col]
+
+    def positions(self, col, value):
+        # Posisi baris (urut naik) dengan data[col] == value
+        code = self._lookup[col].get(value)
+        if code is None:
+            return np.empty(0, dtype="int64")
+        offsets = self._offsets[col]
+        return self._order[col][offsets[code]:offsets[code + 1]]
+
+    def price_positions(self, descending):
+        return self._price_descending if descending else self._price_ascending
@@ -1,11 +1,20 @@
+import datetime
+import os
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import folium
 import streamlit.components.v1 as components
-import matplotlib.patches as mpatches
-import plotly.express as px
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import rfm_charts
+from figure_cache import FigureCache
+from map_cache import MAP_CACHE_ENV, MapCache
+from profiling import Profiler, process_memory
+from reloader import DatasetReloader
+from sections import SectionPool, checkpoint, wait
+
+# matplotlib/seaborn (charts.py), folium (map_render.py), dan klien HTTP (api.py) diimpor di dalam
+# halaman yang membutuhkannya, sehingga halaman About Data dan Data tidak memuatnya saat start.
+# Ukur dengan: python ../benchmarks/bench_imports.py
 
 # Suntikkan CSS kustom untuk tombol agar tampak seperti teks biasa
 st.markdown(
@@ -42,17 +51,75 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Atur style visualisasi
-sns.set_style("whitegrid")
-
 st.title("Dashboard Analyst E-Commerce Public Dataset")
 
-@st.cache_data
-def load_data():
-    data = pd.read_csv("main_data.csv")  # Pastikan file main_data.csv sudah tersedia
-    return data
-
-data = load_data()
+# Semua perhitungan halaman lewat lapisan analitik (analytics.py). Jika DASHBOARD_API_URL di-set,
+# perhitungan dilakukan oleh proses api.py bersama dan dashboard ini tidak memuat data sama sekali.
+# Selain itu satu DatasetReloader (reloader.py) dibagikan ke semua sesi: tabel fakta read-only dari
+# snapshot Arrow plus agregat, mesin RFM, dan indeks kolom hasil warm-up (warmup.py). Jika
+# main_data.csv berubah, versi baru dibangun di latar belakang dan ditukar tanpa restart.
+API_URL = os.environ.get("DASHBOARD_API_URL")
+
+@st.cache_resource
+def load_api_client():
+    from api import AnalyticsClient
+
+    return AnalyticsClient(API_URL)
+
+@st.cache_resource
+def load_reloader():
+    return DatasetReloader()
+
+# Cache PNG chart matplotlib/seaborn, dibagikan antar sesi (LRU dengan batas ukuran byte)
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache()
+
+# Cache HTML peta Folium (LRU, batas dalam MB lewat DASHBOARD_MAP_CACHE_MB), dibagikan antar sesi
+@st.cache_resource
+def load_map_cache():
+    max_mb = os.environ.get(MAP_CACHE_ENV)
+    return MapCache() if max_mb is None else MapCache(max_bytes=int(float(max_mb) * 2**20))
+
+# Thread pool untuk bagian halaman (sections.py), dibagikan ke semua sesi
+@st.cache_resource
+def load_section_pool():
+    return SectionPool()
+
+# Span waktu per tahap halaman (aktif jika DASHBOARD_PROFILE=1), dibagikan ke semua sesi
+@st.cache_resource
+def load_profiler():
+    return Profiler()
+
+profiler = load_profiler()
+run_ctx = get_script_run_ctx()
+session_id = run_ctx.session_id if run_ctx is not None else "-"
+page_name = "shared"
+
+def span(name):
+    return profiler.span(session_id, page_name, name)
+
+with span("load_analytics"):
+    reloader = None if API_URL else load_reloader()
+    analytics = load_api_client() if API_URL else reloader.current()
+    # Versi dataset dan batas nilai widget (rentang slider, pilihan multiselect, rentang tanggal)
+    info = analytics.info()
+dataset_version = info["version"]
+ranges = info["ranges"]
+# Entri cache chart dari versi dataset sebelumnya dibuang begitu versi baru aktif
+figure_cache = load_figure_cache()
+figure_cache.retain_version(dataset_version)
+map_cache = load_map_cache()
+map_cache.retain_version(dataset_version)
+section_pool = load_section_pool()
+
+# Bagian yang membutuhkan baris transaksi mentah tidak tersedia pada mode ringkasan
+RAW_DATA_NOTICE = "Bagian ini membutuhkan main_data.csv. Dashboard sedang berjalan dari ringkasan agregat (streaming.py)."
+
+def require_raw_data():
+    if not info["has_raw_data"]:
+        st.info(RAW_DATA_NOTICE)
+        st.stop()
 
 # --- Inisialisasi Session State ---
 if "main_page" not in st.session_state:
@@ -81,6 +148,65 @@ viz_options = [
 ]
 viz_option = st.sidebar.selectbox("Analysis Results", viz_options, index=0)
 
+# Status hot reload: versi lama tetap dipakai selama versi baru dibangun
+if reloader is not None and reloader.rebuilding:
+    st.sidebar.caption("Memuat versi dataset baru di latar belakang...")
+
+# Nama halaman untuk span profiling
+if st.session_state["main_page"] == "Data":
+    page_name = "Data"
+elif viz_option == "-- Choose Data Visualization --":
+    page_name = "About Data"
+else:
+    page_name = viz_option
+# Tugas bagian dari halaman yang ditinggalkan tidak ditunggu lagi
+section_pool.release_session(session_id, keep=lambda slot: slot[0] == page_name)
+
+# Hasil bagian dari cache, atau build() + serialisasi di thread pool bersama. build() mengembalikan
+# None jika tidak ada data (disimpan sebagai payload kosong). Selama menunggu, rerun baru tetap bisa
+# menghentikan skrip; tugas nilai widget lama di slot yang sama lalu dibatalkan oleh submit berikutnya.
+def render_section(cache, slot, key, build):
+    payload = cache.get(key)
+    if payload is not None:
+        section_pool.release(session_id, (page_name, slot))
+        return payload
+
+    def compute():
+        result = build()
+        checkpoint()
+        payload = b"" if result is None else cache.serialize(result)
+        cache.put(key, payload)
+        return payload
+
+    future = section_pool.submit(session_id, (page_name, slot), key, compute)
+    with st.spinner("Menghitung..."):
+        return wait(future, getattr(get_script_run_ctx(), "yield_check", None))
+
+# Gambar chart (PNG dari cache) dan peta (HTML) dengan ukuran payload tercatat
+def show_figure(chart_id, filters, build_figure, empty=None):
+    with span(f"figure.{chart_id}"):
+        png = render_section(figure_cache, chart_id, figure_cache.make_key(chart_id, dataset_version, filters), build_figure)
+    if png:
+        st.image(profiler.size(session_id, page_name, f"png.{chart_id}", png))
+    else:
+        st.write(empty)
+
+def show_plotly(chart_id, fig):
+    # to_json() hanya dihitung saat profiling aktif
+    if profiler.enabled:
+        profiler.size(session_id, page_name, f"json.{chart_id}", fig.to_json())
+    st.plotly_chart(fig)
+
+def show_map(map_id, filters, build_map, empty=None):
+    # HTML dari cache jika batas filter sama
+    with span(f"map.{map_id}"):
+        key = map_cache.make_key(f"{page_name}/{map_id}", dataset_version, filters)
+        html = render_section(map_cache, map_id, key, build_map)
+    if html:
+        components.html(profiler.size(session_id, page_name, f"html.{map_id}", html).decode("utf-8"), width=700, height=500)
+    else:
+        st.write(empty)
+
 # --- Halaman Utama ---
 if st.session_state["main_page"] == "About Data":
     # Tampilkan konten About Data hanya jika opsi default dipilih
@@ -102,340 +228,319 @@ if st.session_state["main_page"] == "About Data":
 
     # --- Tampilkan sub visualisasi jika opsi Customer Behaviour dipilih ---
     elif viz_option == "Customer Behaviour":
+        import charts
+        from map_render import render_count_map
 
         st.header("Customer Behavior Analysis")
-        
-        # --- 1. Distribusi Customer (Peta Persebaran) ---
-        st.subheader("Distribusi Customer")
-        st.write("Peta berikut menunjukkan distribusi jumlah customer unik di tiap kota. Circle marker menunjukkan rata-rata koordinat kota dengan ukuran marker yang proporsional terhadap jumlah customer. Kota dengan jumlah customer terbanyak ditandai dengan ikon bintang.")
-
-        # Kelompokkan data pelanggan berdasarkan customer_city
-        customer_group = data.groupby('customer_city').agg({
-            'customer_id': pd.Series.nunique,   # Menghitung jumlah customer unik
-            'geolocation_lat': 'mean',
-            'geolocation_lng': 'mean'
-        }).reset_index().rename(columns={'customer_id': 'customer_count'})
-
-        # Tambahkan filter untuk memilih rentang jumlah customer
-        min_customers = int(customer_group['customer_count'].min())
-        max_customers = int(customer_group['customer_count'].max())
-        selected_range = st.slider("Pilih Rentang Jumlah Customer:", min_value=min_customers, max_value=max_customers, value=(min_customers, max_customers))
-
-        # Filter data berdasarkan rentang yang dipilih
-        filtered_customer_group = customer_group[(customer_group['customer_count'] >= selected_range[0]) & (customer_group['customer_count'] <= selected_range[1])]
-
-        # Tentukan kota dengan jumlah pelanggan terbanyak dari data yang sudah difilter
-        if not filtered_customer_group.empty:
-            top_customer = filtered_customer_group.sort_values('customer_count', ascending=False).iloc[0]
-
-            # Buat peta dengan Folium
-            map_center = [data['geolocation_lat'].mean(), data['geolocation_lng'].mean()]
-            m = folium.Map(location=map_center, zoom_start=5)
-
-            # Tambahkan marker untuk setiap kota pelanggan menggunakan CircleMarker
-            customer_fg = folium.FeatureGroup(name='Pelanggan')
-            for _, row in filtered_customer_group.iterrows():
-                folium.CircleMarker(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    radius=row['customer_count'] / 100,  # Sesuaikan skala radius jika diperlukan
-                    color='blue',
-                    fill=True,
-                    fill_color='blue',
-                    fill_opacity=0.6,
-                    popup=f"{row['customer_city']}: {row['customer_count']} pelanggan"
-                ).add_to(customer_fg)
-
-            customer_fg.add_to(m)
-            folium.LayerControl().add_to(m)
-
-            # Tandai kota dengan jumlah pelanggan terbanyak dengan marker khusus
-            folium.Marker(
-                location=[top_customer['geolocation_lat'], top_customer['geolocation_lng']],
-                icon=folium.Icon(color='red', icon='star'),
-                popup=f"Top Pelanggan: {top_customer['customer_city']} ({top_customer['customer_count']})"
-            ).add_to(m)
-
-            components.html(m._repr_html_(), width=700, height=500)
-        else:
-            st.write("Tidak ada data yang sesuai dengan rentang yang dipilih.")
-        
-        
-        # --- 2. Frekuensi Pembelian per Customer (Histogram) ---
-        st.subheader("Frekuensi Pembelian per Customer")
-        st.write("Histogram berikut menggambarkan frekuensi pembelian per customer. Sumbu X menunjukkan jumlah pembelian, sedangkan sumbu Y menunjukkan jumlah customer yang memiliki frekuensi tersebut.")
-
-        # Hitung jumlah pembelian per customer
-        purchase_frequency = data.groupby("customer_unique_id").size()
 
-        # Tambahkan filter untuk memilih rentang jumlah pembelian
-        min_purchase = int(purchase_frequency.min())
-        max_purchase = int(purchase_frequency.max())
-        selected_range = st.slider("Pilih Rentang Jumlah Pembelian:", min_value=min_purchase, max_value=max_purchase, value=(min_purchase, max_purchase))
+        # Setiap bagian bernomor adalah fragment: menggeser slider/filter hanya menjalankan ulang
+        # bagian itu. Pada rerun penuh bagian-bagian berjalan paralel, sehingga setiap chart tampil
+        # begitu hasilnya siap, tidak menunggu chart yang paling lambat.
 
-        # Filter data berdasarkan rentang yang dipilih
-        filtered_data = purchase_frequency[(purchase_frequency >= selected_range[0]) & (purchase_frequency <= selected_range[1])]
+        # --- 1. Distribusi Customer (Peta Persebaran) ---
+        @st.fragment(parallel=True)
+        def customer_distribution_section():
+            st.subheader("Distribusi Customer")
+            st.write("Peta berikut menunjukkan distribusi jumlah customer unik di tiap kota. Circle marker menunjukkan rata-rata koordinat kota dengan ukuran marker yang proporsional terhadap jumlah customer. Kota dengan jumlah customer terbanyak ditandai dengan ikon bintang.")
+
+            # Tambahkan filter untuk memilih rentang jumlah customer
+            min_customers, max_customers = map(int, ranges["customer_count"])
+            selected_range = st.slider("Pilih Rentang Jumlah Customer:", min_value=min_customers, max_value=max_customers, value=(min_customers, max_customers))
+
+            # Kota pelanggan (agregat per customer_city) dengan jumlah customer dalam rentang yang dipilih.
+            # Buat peta dengan Folium: satu layer vektor untuk semua kota pelanggan,
+            # kota dengan jumlah pelanggan terbanyak ditandai dengan marker bintang
+            def build_customer_map():
+                with span("filter.customer_count"):
+                    filtered_customer_group = analytics.city_distribution(kind="customer", min_count=selected_range[0], max_count=selected_range[1])
+                if filtered_customer_group.empty:
+                    return None
+                checkpoint()
+                return render_count_map(
+                    filtered_customer_group, "customer_count", info["map_center"],
+                    color="blue", layer_name="Pelanggan",
+                    popup="{customer_city}: {customer_count} pelanggan",
+                    top_popup="Top Pelanggan: {customer_city} ({customer_count})",
+                    top_color="red",
+                )
+            show_map("customer_count", selected_range, build_customer_map,
+                     empty="Tidak ada data yang sesuai dengan rentang yang dipilih.")
 
-        # Plot histogram
-        fig_hist, ax_hist = plt.subplots(figsize=(8,5))
-        sns.histplot(filtered_data, bins=30, kde=False, color="steelblue", ax=ax_hist)
-        ax_hist.set_xlabel("Jumlah Pembelian")
-        ax_hist.set_ylabel("Frekuensi Customer")
-        ax_hist.set_title("Distribusi Frekuensi Pembelian per Customer")
-        st.pyplot(fig_hist)
+        # --- 2. Frekuensi Pembelian per Customer (Histogram) ---
+        @st.fragment(parallel=True)
+        def purchase_frequency_section():
+            st.subheader("Frekuensi Pembelian per Customer")
+            st.write("Histogram berikut menggambarkan frekuensi pembelian per customer. Sumbu X menunjukkan jumlah pembelian, sedangkan sumbu Y menunjukkan jumlah customer yang memiliki frekuensi tersebut.")
+
+            # Tambahkan filter untuk memilih rentang jumlah pembelian
+            min_purchase, max_purchase = map(int, ranges["purchase_frequency"])
+            selected_range = st.slider("Pilih Rentang Jumlah Pembelian:", min_value=min_purchase, max_value=max_purchase, value=(min_purchase, max_purchase))
+
+            # Jumlah pembelian per customer dalam rentang yang dipilih; diambil dan diplot hanya jika
+            # histogram untuk rentang ini belum ada di cache
+            def build_purchase_frequency_hist():
+                with span("filter.purchase_frequency"):
+                    filtered_data = analytics.purchase_frequency(min_purchases=selected_range[0], max_purchases=selected_range[1])
+                checkpoint()
+                return charts.purchase_frequency_hist(filtered_data)
+            show_figure("purchase_frequency_hist", selected_range, build_purchase_frequency_hist)
 
-        
-        
         # --- 3. Distribusi Skor Review (Pie Chart) ---
-        st.subheader("Distribusi Skor Review")
-        st.write("Pie chart berikut menampilkan persentase masing-masing skor review yang diberikan oleh customer.")
-
-        # Tambahkan filter untuk memilih skor review yang ingin ditampilkan
-        all_scores = sorted(data["review_score"].unique())
-        selected_scores = st.multiselect("Pilih skor review:", options=all_scores, default=all_scores)
-
-        # Filter data berdasarkan skor yang dipilih
-        filtered_reviews = data[data["review_score"].isin(selected_scores)]
-
-        if not filtered_reviews.empty:
-            # Hitung frekuensi setiap skor review, lalu urutkan berdasarkan skor
-            review_counts = filtered_reviews["review_score"].value_counts().sort_index()
-
-            # Definisikan warna khusus untuk setiap skor (1 s.d. 5)
-            score_colors_map = {
-                1: "#2A2E5C",  # dark purple
-                2: "#1B728C",  # teal
-                3: "#1B8C5F",  # green
-                4: "#45BF55",  # light green
-                5: "#C1FA65"   # lime-ish
-            }
-            # Buat list warna sesuai urutan skor
-            review_colors = [score_colors_map[score] for score in review_counts.index]
-
-            # Plot pie chart
-            fig_pie1, ax_pie1 = plt.subplots(figsize=(8, 6))
-            wedges1, texts1, autotexts1 = ax_pie1.pie(
-                review_counts,
-                labels=review_counts.index,
-                autopct='%1.1f%%',
-                colors=review_colors,
-                startangle=140,
-                shadow=True,
-                wedgeprops={'edgecolor': 'black'}
-            )
-
-            # Ubah format teks persentase dengan background hitam
-            for autotext in autotexts1:
-                autotext.set_color('white')
-                autotext.set_bbox(dict(facecolor='black', edgecolor='black', boxstyle='round,pad=0.3'))
-
-            ax_pie1.set_title("Distribusi Skor Review", fontsize=14, fontweight='bold')
-
-            # Tambahkan legenda kustom agar warnanya sesuai dengan skor
-            patches = [mpatches.Patch(color=score_colors_map[s], label=f"Score {s}") for s in review_counts.index]
-            ax_pie1.legend(handles=patches, loc="upper right", bbox_to_anchor=(1.2, 1))
-
-            st.pyplot(fig_pie1)
-        else:
-            st.write("Tidak ada data untuk skor review yang dipilih.")
+        @st.fragment(parallel=True)
+        def review_score_section():
+            st.subheader("Distribusi Skor Review")
+            st.write("Pie chart berikut menampilkan persentase masing-masing skor review yang diberikan oleh customer.")
+
+            # Tambahkan filter untuk memilih skor review yang ingin ditampilkan
+            all_scores = info["review_scores"]
+            selected_scores = st.multiselect("Pilih skor review:", options=all_scores, default=all_scores)
+
+            # Filter jumlah review (sudah dihitung per skor) berdasarkan skor yang dipilih, lalu plot pie chart
+            def build_review_score_pie():
+                with span("filter.review_score"):
+                    review_counts = analytics.review_mix(scores=selected_scores)
+                if review_counts.empty:
+                    return None
+                return charts.review_score_pie(review_counts)
+            show_figure("review_score_pie", sorted(selected_scores), build_review_score_pie,
+                        empty="Tidak ada data untuk skor review yang dipilih.")
 
         # --- 4. Metode Pembayaran Terpopuler (Pie Chart) ---
-        st.subheader("Metode Pembayaran Terpopuler")
-        st.write("Pie chart berikut menunjukkan metode pembayaran yang paling sering digunakan dalam transaksi, berdasarkan persentase jumlah transaksi.")
-
-        # Tambahkan filter untuk memilih metode pembayaran yang ingin ditampilkan
-        all_payment_types = data["payment_type"].unique().tolist()
-        selected_payment_types = st.multiselect("Pilih metode pembayaran:", options=all_payment_types, default=all_payment_types)
-
-        # Filter data berdasarkan metode pembayaran yang dipilih
-        filtered_payment_data = data[data["payment_type"].isin(selected_payment_types)]
-
-        if not filtered_payment_data.empty:
-            # Hitung frekuensi metode pembayaran
-            payment_counts = filtered_payment_data["payment_type"].value_counts()
-
-            # Gunakan palet warna bergradasi (misalnya "viridis")
-            colors_payment = sns.color_palette("viridis", len(payment_counts))
-            
-            # Atur efek explode untuk menonjolkan metode pembayaran paling populer (frekuensi tertinggi)
-            explode = [0.1 if i == 0 else 0 for i in range(len(payment_counts))]
-            
-            fig_pie2, ax_pie2 = plt.subplots(figsize=(8, 6))
-            wedges2, texts2, autotexts2 = ax_pie2.pie(
-                payment_counts,
-                labels=payment_counts.index,
-                autopct='%1.1f%%',
-                colors=colors_payment,
-                startangle=140,
-                explode=explode,
-                shadow=True,
-                wedgeprops={'edgecolor': 'black'}
-            )
-            
-            # Ubah format teks persentase agar memiliki background hitam
-            for autotext in autotexts2:
-                autotext.set_color('white')
-                autotext.set_bbox(dict(facecolor='black', edgecolor='black', boxstyle='round,pad=0.3'))
-            
-            ax_pie2.set_title("Proporsi Jenis Pembayaran yang Digunakan oleh Pelanggan", fontsize=14, fontweight='bold')
-            
-            # Tambahkan legenda di samping
-            ax_pie2.legend(payment_counts.index, loc="upper right", bbox_to_anchor=(1.2, 1))
-            
-            st.pyplot(fig_pie2)
-        else:
-            st.write("Tidak ada data untuk metode pembayaran yang dipilih.")
-    
-
-
-
+        @st.fragment(parallel=True)
+        def payment_type_section():
+            st.subheader("Metode Pembayaran Terpopuler")
+            st.write("Pie chart berikut menunjukkan metode pembayaran yang paling sering digunakan dalam transaksi, berdasarkan persentase jumlah transaksi.")
+
+            # Tambahkan filter untuk memilih metode pembayaran yang ingin ditampilkan
+            all_payment_types = info["payment_types"]
+            selected_payment_types = st.multiselect("Pilih metode pembayaran:", options=all_payment_types, default=all_payment_types)
+
+            # Filter jumlah transaksi (urut dari yang terbanyak) berdasarkan metode pembayaran yang dipilih
+            def build_payment_type_pie():
+                with span("filter.payment_type"):
+                    payment_counts = analytics.payment_mix(payment_types=selected_payment_types)
+                if payment_counts.empty:
+                    return None
+                return charts.payment_type_pie(payment_counts)
+            show_figure("payment_type_pie", sorted(selected_payment_types), build_payment_type_pie,
+                        empty="Tidak ada data untuk metode pembayaran yang dipilih.")
+
+        customer_distribution_section()
+        purchase_frequency_section()
+        review_score_section()
+        payment_type_section()
 
     elif viz_option == "Seller Peformances":
+        import charts
+        from map_render import render_count_map
 
-        # --- Konversi Tipe Data untuk Kolom Tanggal ---
-        data['order_purchase_timestamp'] = pd.to_datetime(data['order_purchase_timestamp'])
-        data['order_delivered_customer_date'] = pd.to_datetime(data['order_delivered_customer_date'], errors='coerce')
-        data['order_estimated_delivery_date'] = pd.to_datetime(data['order_estimated_delivery_date'], errors='coerce')
-
-        # --- Hitung Waktu Pengiriman ---
-        # Waktu pengiriman aktual (dalam hari)
-        data['delivery_time_actual'] = (data['order_delivered_customer_date'] - data['order_purchase_timestamp']).dt.days
-        # Waktu pengiriman estimasi (dalam hari)
-        data['delivery_time_estimated'] = (data['order_estimated_delivery_date'] - data['order_purchase_timestamp']).dt.days
+        # Kolom tanggal dan waktu pengiriman (delivery_time_actual/estimated) sudah disiapkan saat load_data
 
         st.header("Seller Performance Analysis")
         st.write("- **Top 10 Seller dengan Penjualan Tertinggi:** Menampilkan grafik batang dari 10 penjual dengan jumlah transaksi terbanyak.")
 
+        # Seperti halaman Customer Behaviour, setiap bagian bernomor adalah fragment paralel
+
         # --------------------------------------------------------
         # 1. Top 10 Seller dengan Penjualan Tertinggi (Bar Chart)
         # --------------------------------------------------------
-        st.subheader("Top 10 Seller dengan Penjualan Tertinggi")
-        # Hitung jumlah penjualan per seller
-        seller_sales = data.groupby("seller_id").size().reset_index(name="penjualan")
-        # Filter: pilih rentang jumlah penjualan
-        min_penjualan = int(seller_sales["penjualan"].min())
-        max_penjualan = int(seller_sales["penjualan"].max())
-        penjualan_range = st.slider("Pilih rentang jumlah penjualan:", min_value=min_penjualan, max_value=max_penjualan, value=(min_penjualan, max_penjualan))
-        # Filter seller berdasarkan rentang yang dipilih
-        filtered_seller_sales = seller_sales[(seller_sales["penjualan"] >= penjualan_range[0]) & (seller_sales["penjualan"] <= penjualan_range[1])]
-        # Pilih 10 seller teratas dari data yang sudah difilter
-        top_sellers = filtered_seller_sales.sort_values("penjualan", ascending=False).head(10)
-        # Plot bar chart
-        fig1, ax1 = plt.subplots(figsize=(10, 6))
-        sns.barplot(data=top_sellers, x="penjualan", y="seller_id", palette="viridis", ax=ax1)
-        ax1.set_xlabel("Jumlah Penjualan")
-        ax1.set_ylabel("Seller ID")
-        ax1.set_title("Top 10 Seller dengan Penjualan Tertinggi")
-        st.pyplot(fig1)
+        @st.fragment(parallel=True)
+        def top_sellers_section():
+            st.subheader("Top 10 Seller dengan Penjualan Tertinggi")
+            # Filter: pilih rentang jumlah penjualan per seller
+            min_penjualan, max_penjualan = map(int, ranges["penjualan"])
+            penjualan_range = st.slider("Pilih rentang jumlah penjualan:", min_value=min_penjualan, max_value=max_penjualan, value=(min_penjualan, max_penjualan))
+            # 10 seller teratas dalam rentang yang dipilih, lalu plot bar chart
+            def build_top_sellers_bar():
+                with span("filter.top_sellers"):
+                    top_sellers = analytics.seller_ranking(min_sales=penjualan_range[0], max_sales=penjualan_range[1], top=10)
+                checkpoint()
+                return charts.top_sellers_bar(top_sellers)
+            show_figure("top_sellers_bar", penjualan_range, build_top_sellers_bar)
 
         # --------------------------------------------------------
         # 2. Distribusi Rata-rata Waktu Pengiriman per Seller (Boxplot)
         # --------------------------------------------------------
-        st.subheader("Distribusi Rata-rata Waktu Pengiriman per Seller")
-        # Hitung rata-rata waktu pengiriman aktual per seller
-        avg_delivery_per_seller = data.groupby("seller_id")["delivery_time_actual"].mean().reset_index()
-        # Filter: pilih rentang waktu pengiriman
-        min_delivery = int(avg_delivery_per_seller["delivery_time_actual"].min())
-        max_delivery = int(avg_delivery_per_seller["delivery_time_actual"].max())
-        delivery_range = st.slider("Pilih rentang rata-rata waktu pengiriman (hari):", min_value=min_delivery, max_value=max_delivery, value=(min_delivery, max_delivery))
-        filtered_delivery = avg_delivery_per_seller[(avg_delivery_per_seller["delivery_time_actual"] >= delivery_range[0]) &
-                                                    (avg_delivery_per_seller["delivery_time_actual"] <= delivery_range[1])]
-        # Plot boxplot
-        fig2, ax2 = plt.subplots(figsize=(12, 6))
-        sns.boxplot(x=filtered_delivery["delivery_time_actual"], color="lightblue", ax=ax2)
-        ax2.set_xlabel("Rata-rata Waktu Pengiriman (hari)")
-        ax2.set_title("Distribusi Rata-rata Waktu Pengiriman per Seller")
-        st.pyplot(fig2)
+        @st.fragment(parallel=True)
+        def delivery_time_section():
+            st.subheader("Distribusi Rata-rata Waktu Pengiriman per Seller")
+            # Filter: pilih rentang rata-rata waktu pengiriman aktual per seller
+            min_delivery, max_delivery = map(int, ranges["delivery_time_actual"])
+            delivery_range = st.slider("Pilih rentang rata-rata waktu pengiriman (hari):", min_value=min_delivery, max_value=max_delivery, value=(min_delivery, max_delivery))
+            # Plot boxplot
+            def build_delivery_time_boxplot():
+                with span("filter.delivery_time"):
+                    filtered_delivery = analytics.seller_delivery(min_days=delivery_range[0], max_days=delivery_range[1])
+                checkpoint()
+                return charts.delivery_time_boxplot(filtered_delivery)
+            show_figure("delivery_time_boxplot", delivery_range, build_delivery_time_boxplot)
 
         # --------------------------------------------------------
         # 3. Distribusi Seller per Provinsi (Peta Interaktif)
         # --------------------------------------------------------
-        st.subheader("Distribusi Seller per Provinsi")
-        st.write("- **Distribusi Seller per Provinsi:** Memvisualisasikan jumlah penjual di berbagai kota menggunakan peta interaktif.")
-        # Kelompokkan data penjual berdasarkan seller_city
-        seller_group = data.groupby('seller_city').agg({
-            'seller_id': pd.Series.nunique,   # Menghitung jumlah seller unik
-            'geolocation_lat': 'mean',
-            'geolocation_lng': 'mean'
-        }).reset_index().rename(columns={'seller_id': 'seller_count'})
-        # Filter: pilih rentang jumlah penjual per kota
-        min_seller_count = int(seller_group["seller_count"].min())
-        max_seller_count = int(seller_group["seller_count"].max())
-        seller_range = st.slider("Pilih rentang jumlah penjual per kota:", min_value=min_seller_count, max_value=max_seller_count, value=(min_seller_count, max_seller_count))
-        filtered_seller_group = seller_group[(seller_group["seller_count"] >= seller_range[0]) & (seller_group["seller_count"] <= seller_range[1])]
-        if not filtered_seller_group.empty:
-            # Tentukan kota dengan jumlah seller terbanyak dari data yang sudah difilter
-            top_seller = filtered_seller_group.sort_values('seller_count', ascending=False).iloc[0]
-            # Buat peta
-            map_center = [data['geolocation_lat'].mean(), data['geolocation_lng'].mean()]
-            m = folium.Map(location=map_center, zoom_start=5)
-            seller_fg = folium.FeatureGroup(name='Penjual')
-            for _, row in filtered_seller_group.iterrows():
-                folium.CircleMarker(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    radius=row['seller_count'] / 100,  # Sesuaikan skala radius
-                    color='red',
-                    fill=True,
-                    fill_color='red',
-                    fill_opacity=0.6,
-                    popup=f"{row['seller_city']}: {row['seller_count']} penjual"
-                ).add_to(seller_fg)
-            seller_fg.add_to(m)
-            folium.LayerControl().add_to(m)
-            # Tandai kota dengan jumlah seller terbanyak secara khusus
-            folium.Marker(
-                location=[top_seller['geolocation_lat'], top_seller['geolocation_lng']],
-                icon=folium.Icon(color='blue', icon='star'),
-                popup=f"Top Penjual: {top_seller['seller_city']} ({top_seller['seller_count']})"
-            ).add_to(m)
-            components.html(m._repr_html_(), width=700, height=500)
-        else:
-            st.write("Tidak ada data penjual sesuai dengan filter yang dipilih.")
+        @st.fragment(parallel=True)
+        def seller_distribution_section():
+            st.subheader("Distribusi Seller per Provinsi")
+            st.write("- **Distribusi Seller per Provinsi:** Memvisualisasikan jumlah penjual di berbagai kota menggunakan peta interaktif.")
+            # Filter: pilih rentang jumlah penjual per kota (agregat per seller_city)
+            min_seller_count, max_seller_count = map(int, ranges["seller_count"])
+            seller_range = st.slider("Pilih rentang jumlah penjual per kota:", min_value=min_seller_count, max_value=max_seller_count, value=(min_seller_count, max_seller_count))
+            # Buat peta; kota dengan jumlah seller terbanyak ditandai secara khusus
+            def build_seller_map():
+                with span("filter.seller_count"):
+                    filtered_seller_group = analytics.city_distribution(kind="seller", min_count=seller_range[0], max_count=seller_range[1])
+                if filtered_seller_group.empty:
+                    return None
+                checkpoint()
+                return render_count_map(
+                    filtered_seller_group, "seller_count", info["map_center"],
+                    color="red", layer_name="Penjual",
+                    popup="{seller_city}: {seller_count} penjual",
+                    top_popup="Top Penjual: {seller_city} ({seller_count})",
+                    top_color="blue",
+                )
+            show_map("seller_count", seller_range, build_seller_map,
+                     empty="Tidak ada data penjual sesuai dengan filter yang dipilih.")
 
         # --------------------------------------------------------
-        # 4. Rata-rata Waktu Pengiriman (Actual vs Estimated) (Bar Chart)
+        # 4. Keterlambatan Pengiriman per Seller dan Rute (Tabel + Line Chart)
         # --------------------------------------------------------
-        st.subheader("Rata-rata Waktu Pengiriman (Actual vs Estimated)")
-        st.write("- **Rata-rata Waktu Pengiriman (Actual vs Estimated):** Membandingkan rata-rata waktu pengiriman aktual dengan estimasi pengiriman.")
-        # Tambahkan filter tanggal berdasarkan order_purchase_timestamp
-        min_date = data['order_purchase_timestamp'].min().date()
-        max_date = data['order_purchase_timestamp'].max().date()
-        selected_dates = st.date_input("Pilih rentang tanggal pembelian:", value=(min_date, max_date))
-        if isinstance(selected_dates, tuple) and len(selected_dates) == 2:
-            start_date, end_date = selected_dates
-        else:
-            start_date, end_date = min_date, max_date
-        filtered_date_data = data[(data['order_purchase_timestamp'].dt.date >= start_date) & (data['order_purchase_timestamp'].dt.date <= end_date)]
-        if not filtered_date_data.empty:
-            avg_actual = filtered_date_data["delivery_time_actual"].mean()
-            avg_estimated = filtered_date_data["delivery_time_estimated"].mean()
-            avg_delivery_df = pd.DataFrame({
-                "Tipe": ["Actual", "Estimated"],
-                "Waktu Pengiriman": [avg_actual, avg_estimated]
-            })
-            fig4, ax4 = plt.subplots(figsize=(6, 4))
-            sns.barplot(x="Tipe", y="Waktu Pengiriman", data=avg_delivery_df, palette="pastel", ax=ax4)
-            ax4.set_title("Rata-rata Waktu Pengiriman (Actual vs Estimated)")
-            st.pyplot(fig4)
-        else:
-            st.write("Tidak ada data untuk rentang tanggal yang dipilih.")
+        # Bagian 4-5 memakai sketsa pengiriman per seller/rute/bulan (delivery.py), sehingga tidak
+        # memindai tabel fakta dan tetap tersedia pada mode ringkasan. Rentang dipilih per bulan penuh.
+        delivery_months = info.get("delivery_months")
+
+        @st.fragment(parallel=True)
+        def delivery_sla_section():
+            st.subheader("Keterlambatan Pengiriman per Seller dan Rute")
+            st.write("- **Keterlambatan Pengiriman:** Menampilkan seller atau rute (provinsi seller ke provinsi pelanggan) dengan persentase pengiriman terlambat tertinggi. Satu pengiriman adalah pasangan pesanan dan seller yang sudah diterima, terlambat jika diterima setelah tanggal estimasi. Kolom p50/p90/p95 adalah persentil waktu pengiriman (hari).")
+            dimension_labels = {"seller": "Seller", "route": "Rute (provinsi seller -> pelanggan)"}
+            dimension = st.radio("Kelompokkan per:", list(dimension_labels), format_func=dimension_labels.get, horizontal=True)
+            first_month, last_month = st.select_slider("Pilih rentang bulan pembelian:", options=delivery_months,
+                                                       value=(delivery_months[0], delivery_months[-1]), format_func=lambda month: month[:7])
+            min_count = st.number_input("Minimum jumlah pengiriman:", min_value=1, value=5)
+            with span("sketch.delivery_sla"):
+                sla = analytics.delivery_sla(dimension=dimension, start_date=datetime.date.fromisoformat(first_month),
+                                             end_date=datetime.date.fromisoformat(last_month), min_count=min_count)
+            if sla.empty:
+                st.write("Tidak ada seller/rute dengan jumlah pengiriman minimum pada rentang yang dipilih.")
+            else:
+                st.dataframe(sla, hide_index=True)
+            # Tren bulanan (seluruh periode) untuk salah satu baris tabel atau semua pengiriman
+            if dimension == "seller":
+                keys = sla["seller_id"].tolist()
+            else:
+                keys = (sla["seller_state"].astype(str) + "-" + sla["customer_state"].astype(str)).tolist()
+            selected = st.selectbox("Tampilkan tren bulanan untuk:", ["Semua pengiriman"] + keys)
+            def build_late_rate_line():
+                with span("sketch.delivery_monthly"):
+                    if selected == "Semua pengiriman":
+                        monthly = analytics.delivery_monthly()
+                    else:
+                        monthly = analytics.delivery_monthly(dimension=dimension, key=selected)
+                checkpoint()
+                return charts.late_rate_line(monthly, f"Keterlambatan Bulanan: {selected}")
+            show_figure("late_rate_line", (dimension, selected), build_late_rate_line)
+
+        # --------------------------------------------------------
+        # 5. Heatmap Rute Pengiriman (Heatmap)
+        # --------------------------------------------------------
+        @st.fragment(parallel=True)
+        def route_heatmap_section():
+            st.subheader("Heatmap Rute Pengiriman")
+            st.write("- **Heatmap Rute Pengiriman:** Membandingkan tingkat keterlambatan atau persentil waktu pengiriman untuk setiap pasangan provinsi seller dan provinsi pelanggan.")
+            metrics = {"late_rate": "Tingkat Keterlambatan", "p50": "Median Waktu Pengiriman (hari)",
+                       "p90": "p90 Waktu Pengiriman (hari)"}
+            metric = st.selectbox("Pilih metrik:", list(metrics), format_func=metrics.get)
+            month_range = st.select_slider("Pilih rentang bulan pembelian untuk heatmap:", options=delivery_months,
+                                           value=(delivery_months[0], delivery_months[-1]), format_func=lambda month: month[:7])
+            min_count = st.number_input("Minimum jumlah pengiriman per rute:", min_value=1, value=10)
+            def build_route_heatmap():
+                with span("sketch.route_heatmap"):
+                    routes = analytics.route_heatmap(start_date=datetime.date.fromisoformat(month_range[0]),
+                                                     end_date=datetime.date.fromisoformat(month_range[1]), min_count=min_count)
+                if routes.empty:
+                    return None
+                checkpoint()
+                return charts.route_heatmap(routes, metric, metrics[metric])
+            show_figure("route_heatmap", (metric, month_range, min_count), build_route_heatmap,
+                        empty="Tidak ada rute dengan jumlah pengiriman minimum pada rentang yang dipilih.")
+
+        # --------------------------------------------------------
+        # 6. Rata-rata Waktu Pengiriman (Actual vs Estimated) (Bar Chart)
+        # --------------------------------------------------------
+        @st.fragment(parallel=True)
+        def delivery_comparison_section():
+            st.subheader("Rata-rata Waktu Pengiriman (Actual vs Estimated)")
+            st.write("- **Rata-rata Waktu Pengiriman (Actual vs Estimated):** Membandingkan rata-rata waktu pengiriman aktual dengan estimasi pengiriman.")
+            # Tambahkan filter tanggal berdasarkan order_purchase_timestamp
+            min_date, max_date = map(datetime.date.fromisoformat, ranges["purchase_date"])
+            selected_dates = st.date_input("Pilih rentang tanggal pembelian:", value=(min_date, max_date))
+            if isinstance(selected_dates, tuple) and len(selected_dates) == 2:
+                start_date, end_date = selected_dates
+            else:
+                start_date, end_date = min_date, max_date
+            # Rata-rata pengiriman untuk potongan baris hasil binary search pada indeks waktu
+            def build_delivery_comparison_bar():
+                with span("groupby.delivery_stats"):
+                    delivery_stats = analytics.delivery_stats(start_date=start_date, end_date=end_date)
+                if not delivery_stats["rows"]:
+                    return None
+                return charts.delivery_comparison_bar(delivery_stats["avg_actual"], delivery_stats["avg_estimated"])
+            show_figure("delivery_comparison_bar", (start_date, end_date), build_delivery_comparison_bar,
+                        empty="Tidak ada data untuk rentang tanggal yang dipilih.")
+
+        # --------------------------------------------------------
+        # 7. Distribusi Harga Produk (Histogram)
+        # --------------------------------------------------------
+        @st.fragment(parallel=True)
+        def price_section():
+            st.subheader("Distribusi Harga Produk")
+            st.write("- **Distribusi Harga Produk:** Menampilkan histogram distribusi harga produk yang terjual.")
+            # Filter: pilih rentang harga produk
+            min_price, max_price = map(float, ranges["price"])
+            price_range = st.slider("Pilih rentang harga produk:", min_value=min_price, max_value=max_price, value=(min_price, max_price))
+            # Filter dan histogram (KDE mahal) hanya dihitung jika rentang harga berubah
+            def build_price_hist():
+                with span("filter.price"):
+                    prices = analytics.prices(min_price=price_range[0], max_price=price_range[1])
+                checkpoint()
+                return charts.price_hist(prices)
+            show_figure("price_hist", price_range, build_price_hist)
 
         # --------------------------------------------------------
-        # 5. Distribusi Harga Produk (Histogram)
+        # 8. Waktu Pengiriman per Jarak Seller - Pelanggan (Bar Chart)
         # --------------------------------------------------------
-        st.subheader("Distribusi Harga Produk")
-        st.write("- **Distribusi Harga Produk:** Menampilkan histogram distribusi harga produk yang terjual.")
-        # Filter: pilih rentang harga produk
-        min_price = float(data["price"].min())
-        max_price = float(data["price"].max())
-        price_range = st.slider("Pilih rentang harga produk:", min_value=min_price, max_value=max_price, value=(min_price, max_price))
-        filtered_price_data = data[(data["price"] >= price_range[0]) & (data["price"] <= price_range[1])]
-        fig5, ax5 = plt.subplots(figsize=(10, 6))
-        sns.histplot(filtered_price_data["price"], kde=True, ax=ax5, color="coral")
-        ax5.set_xlabel("Harga Produk")
-        ax5.set_title("Distribusi Harga Produk")
-        st.pyplot(fig5)
+        @st.fragment(parallel=True)
+        def delivery_distance_section():
+            st.subheader("Waktu Pengiriman per Jarak Seller - Pelanggan")
+            st.write("- **Jarak Seller - Pelanggan:** Membandingkan rata-rata waktu pengiriman aktual dan estimasi berdasarkan jarak antara kode pos seller dan pelanggan.")
+            # Koordinat kode pos seller dicari di indeks kode pos, sekali per versi dataset
+            with span("groupby.delivery_distance"):
+                delivery_distance = analytics.delivery_distance()
+            st.dataframe(delivery_distance, hide_index=True)
+            show_figure("delivery_distance_bar", (), lambda: charts.delivery_distance_bar(delivery_distance))
+
+        top_sellers_section()
+        delivery_time_section()
+        seller_distribution_section()
+        if delivery_months:
+            delivery_sla_section()
+            route_heatmap_section()
+        else:
+            # Ringkasan dari streaming.py versi lama belum berisi sketsa pengiriman
+            st.info("Statistik keterlambatan pengiriman belum tersedia. Jalankan ulang streaming.py.")
+        # Bagian 6-8 membutuhkan baris transaksi mentah. Tanpa st.stop(): bagian 1-5 masih berjalan
+        # paralel dan akan ikut dihentikan jika skrip utama berhenti
+        if info["has_raw_data"]:
+            delivery_comparison_section()
+            price_section()
+            delivery_distance_section()
+        else:
+            st.info(RAW_DATA_NOTICE)
 
     elif viz_option == "Geolocation Map":
+        from geo_index import MAX_ZOOM, MIN_ZOOM
+        from map_render import render_area_map
         st.header("Map Filter By Geolocation City")
         st.write("Fitur ini memungkinkan pengguna untuk melihat kota-kota yang memenuhi kriteria minimum jumlah penjual dan pembeli, beserta penandaan area untuk masing-masing kota.")
 
@@ -443,101 +548,60 @@ if st.session_state["main_page"] == "About Data":
         min_sellers = st.number_input("Minimum jumlah penjual:", min_value=0, value=0)
         min_customers = st.number_input("Minimum jumlah pembeli:", min_value=0, value=0)
 
-        # Kelompokkan data berdasarkan kota (geolocation_city)
-        city_group = data.groupby('geolocation_city').agg({
-            'seller_id': pd.Series.nunique,
-            'customer_unique_id': pd.Series.nunique,
-            'geolocation_lat': 'mean',
-            'geolocation_lng': 'mean'
-        }).reset_index().rename(columns={
-            'seller_id': 'seller_count',
-            'customer_unique_id': 'customer_count'
-        })
-
-        # Filter kota yang memenuhi threshold
-        filtered_city_group = city_group[
-            (city_group['seller_count'] >= min_sellers) &
-            (city_group['customer_count'] >= min_customers)
-        ]
+        # Kota (agregat per geolocation_city) yang memenuhi threshold
+        with span("filter.city_threshold"):
+            filtered_city_group = analytics.geolocation_cities(min_sellers=min_sellers, min_customers=min_customers)
 
         if not filtered_city_group.empty:
             st.write(f"Terdapat {filtered_city_group.shape[0]} kota yang memenuhi kriteria.")
             st.dataframe(filtered_city_group)
 
-            # Filter tambahan: Tentukan tingkat zoom peta
-            map_zoom = st.slider("Tentukan tingkat zoom peta:", min_value=5, max_value=15, value=10)
-
-            # Titik tengah peta dihitung dari rata-rata koordinat kota-kota yang memenuhi kriteria
-            avg_lat = filtered_city_group['geolocation_lat'].mean()
-            avg_lng = filtered_city_group['geolocation_lng'].mean()
-            m = folium.Map(location=[avg_lat, avg_lng], zoom_start=map_zoom)
-
-            # Tambahkan marker dan circle untuk setiap kota yang memenuhi kriteria
-            for _, row in filtered_city_group.iterrows():
-                # Tambahkan circle untuk menandai area kota
-                folium.Circle(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    radius=5000,  # radius dalam meter, sesuaikan jika diperlukan
-                    color='blue',
-                    fill=True,
-                    fill_opacity=0.1,
-                    popup=f"Area {row['geolocation_city']}"
-                ).add_to(m)
-
-                # Tambahkan marker untuk menampilkan info jumlah penjual dan pembeli
-                folium.Marker(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    popup=f"{row['geolocation_city']}: {row['seller_count']} penjual, {row['customer_count']} pembeli",
-                    icon=folium.Icon(color='green', icon='info-sign')
-                ).add_to(m)
-
-            # Tampilkan peta menggunakan streamlit components
-            components.html(m._repr_html_(), width=700, height=500)
+            # Zoom, pusat, dan peta dalam fragment: mengubahnya hanya menjalankan ulang bagian peta,
+            # bukan query threshold dan tabel kota di atasnya
+            @st.fragment
+            def city_map_section():
+                # Filter tambahan: Tentukan tingkat zoom dan pusat peta
+                map_zoom = st.slider("Tentukan tingkat zoom peta:", min_value=MIN_ZOOM, max_value=MAX_ZOOM, value=10)
+                center_options = ["Rata-rata kota terpilih"] + filtered_city_group.sort_values(
+                    "customer_count", ascending=False)["geolocation_city"].astype(str).tolist()
+                center_city = st.selectbox("Pusatkan peta di kota:", center_options)
+                if center_city == center_options[0]:
+                    center_rows = filtered_city_group
+                else:
+                    center_rows = filtered_city_group[filtered_city_group["geolocation_city"] == center_city]
+                center = [float(center_rows["geolocation_lat"].mean()), float(center_rows["geolocation_lng"].mean())]
+
+                # Hanya kota di area yang terlihat pada zoom ini yang dikirim ke browser (geo_index.py);
+                # pada zoom kecil kota-kota yang berdekatan digabung menjadi satu cluster
+                with span("filter.viewport"):
+                    map_points = analytics.city_map(min_sellers=min_sellers, min_customers=min_customers,
+                                                    zoom=map_zoom, lat=center[0], lng=center[1])
+                st.caption(f"{len(map_points)} titik di area peta ({int(map_points['points'].sum())} kota).")
+                show_map("city_area", (min_sellers, min_customers, map_zoom, center_city), lambda: render_area_map(
+                    map_points, map_zoom, center=center,
+                    popup="Area {geolocation_city}: {seller_count} penjual, {customer_count} pembeli",
+                    cluster_popup="{geolocation_city}: {seller_count} penjual, {customer_count} pembeli",
+                ))
+            city_map_section()
         else:
             st.write("Tidak ada kota yang memenuhi kriteria minimum penjual dan pembeli.")
     
     elif viz_option == "RFM Analysis":
         st.header("Understanding Customer Loyalty")
+        require_raw_data()
 
-        data["order_purchase_timestamp"] = pd.to_datetime(data["order_purchase_timestamp"])
+        first_date, last_date = map(datetime.date.fromisoformat, ranges["purchase_date"])
 
         col1, col2 = st.columns(2)
         with col1:
-            start_date = st.date_input("Pilih Tanggal Mulai:", data["order_purchase_timestamp"].min())
+            start_date = st.date_input("Pilih Tanggal Mulai:", first_date)
         with col2:
-            end_date = st.date_input("Pilih Tanggal Akhir:", data["order_purchase_timestamp"].max())
-
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-
-        data = data[(data["order_purchase_timestamp"] >= start_date) & 
-                    (data["order_purchase_timestamp"] <= end_date)]
-
-
-        # Hitung RFM
-        snapshot_date = data['order_purchase_timestamp'].max() + pd.Timedelta(days=1)
-        rfm = data.groupby('customer_unique_id').agg({
-            'order_purchase_timestamp': lambda x: (snapshot_date - x.max()).days,
-            'order_id': 'count',
-            'payment_value': 'sum'
-        }).reset_index()
-        rfm.columns = ['customer_unique_id', 'Recency', 'Frequency', 'Monetary']
-
-        # Grouping Manual
-        def manual_grouping(freq):
-            if freq <= 2:
-                return "Low"
-            elif freq <= 5:
-                return "Medium"
-            else:
-                return "High"
-
-        rfm['Transaction_Group'] = rfm['Frequency'].apply(manual_grouping)
+            end_date = st.date_input("Pilih Tanggal Akhir:", last_date)
 
-        # Binning Monetary
-        bins = [0, 100, 500, 1000, 5000, rfm['Monetary'].max()]
-        labels = ['<100', '100-500', '500-1000', '1000-5000', '>5000']
-        rfm['Monetary_bin'] = pd.cut(rfm['Monetary'], bins=bins, labels=labels, include_lowest=True)
+        # Data grafik RFM untuk rentang tanggal yang dipilih: histogram sudah di-bin, statistik boxplot,
+        # dan sampel scatter dihitung di server (rfm_charts.py), bukan satu titik per customer
+        with span("groupby.rfm"):
+            chart_data = analytics.rfm_charts(start_date=start_date, end_date=end_date)
 
         # Pilihan Filter di dalam Halaman
         st.subheader("Filter Tambahan")
@@ -546,48 +610,56 @@ if st.session_state["main_page"] == "About Data":
         with col3:
             group_option = st.selectbox("Pilih Kelompok Transaksi:", ["All", "Low", "Medium", "High"])
         with col4:
-            monetary_option = st.selectbox("Pilih Kategori Total Pengeluaran:", ["All"] + list(rfm['Monetary_bin'].unique()))
+            monetary_options = [label for label, count in chart_data["monetary_bins"].items() if count]
+            monetary_option = st.selectbox("Pilih Kategori Total Pengeluaran:", ["All"] + monetary_options)
 
         # Terapkan Filter
-        if group_option != "All":
-            rfm = rfm[rfm["Transaction_Group"] == group_option]
-        if monetary_option != "All":
-            rfm = rfm[rfm["Monetary_bin"] == monetary_option]
+        if group_option != "All" or monetary_option != "All":
+            with span("filter.rfm"):
+                chart_data = analytics.rfm_charts(start_date=start_date, end_date=end_date,
+                                                  group=group_option, monetary_bin=monetary_option)
 
         # Visualisasi Data
         st.subheader("Visualisasi Data")
 
         # Distribusi Recency
-        fig_recency = px.histogram(rfm, x="Recency", nbins=30, title="Distribusi Recency", color_discrete_sequence=["skyblue"])
-        st.plotly_chart(fig_recency)
+        with span("figure.recency_hist"):
+            fig_recency = rfm_charts.histogram_figure(chart_data["histograms"]["Recency"], "Recency", "Distribusi Recency", "skyblue")
+        show_plotly("recency_hist", fig_recency)
 
         # Distribusi Frequency
-        fig_frequency = px.histogram(rfm, x="Frequency", nbins=30, title="Distribusi Frequency", color_discrete_sequence=["salmon"])
-        st.plotly_chart(fig_frequency)
+        with span("figure.frequency_hist"):
+            fig_frequency = rfm_charts.histogram_figure(chart_data["histograms"]["Frequency"], "Frequency", "Distribusi Frequency", "salmon")
+        show_plotly("frequency_hist", fig_frequency)
 
         # Distribusi Monetary
-        fig_monetary = px.histogram(rfm, x="Monetary", nbins=30, title="Distribusi Monetary", color_discrete_sequence=["lightgreen"])
-        st.plotly_chart(fig_monetary)
+        with span("figure.monetary_hist"):
+            fig_monetary = rfm_charts.histogram_figure(chart_data["histograms"]["Monetary"], "Monetary", "Distribusi Monetary", "lightgreen")
+        show_plotly("monetary_hist", fig_monetary)
 
-        # Scatter Plot Frequency vs Monetary
-        fig_scatter = px.scatter(rfm, x="Frequency", y="Monetary", title="Hubungan antara Frequency dan Monetary", opacity=0.5)
-        st.plotly_chart(fig_scatter)
+        # Scatter Plot Frequency vs Monetary (disampel jika customer lebih dari MAX_SCATTER_POINTS)
+        with span("figure.frequency_monetary_scatter"):
+            fig_scatter = rfm_charts.scatter_figure(chart_data["scatter"], "Hubungan antara Frequency dan Monetary")
+        show_plotly("frequency_monetary_scatter", fig_scatter)
 
         # Boxplot Transaksi Grouping
-        fig_boxplot = px.box(rfm, x="Transaction_Group", y="Monetary", title="Perbandingan Total Pengeluaran berdasarkan Kelompok Transaksi", color="Transaction_Group")
-        st.plotly_chart(fig_boxplot)
+        with span("figure.group_monetary_box"):
+            fig_boxplot = rfm_charts.box_figure(chart_data["box"], "Perbandingan Total Pengeluaran berdasarkan Kelompok Transaksi")
+        show_plotly("group_monetary_box", fig_boxplot)
 
         # Distribusi Bin Monetary
-        fig_bar = px.bar(rfm['Monetary_bin'].value_counts().sort_index(), 
-                        title="Distribusi Pelanggan Berdasarkan Total Pengeluaran (Binning)",
-                        labels={'index': 'Kategori Total Pengeluaran', 'value': 'Jumlah Pelanggan'})
-        st.plotly_chart(fig_bar)
+        with span("figure.monetary_bin_bar"):
+            fig_bar = rfm_charts.monetary_bin_figure(chart_data["monetary_bins"],
+                            title="Distribusi Pelanggan Berdasarkan Total Pengeluaran (Binning)",
+                            labels={'index': 'Kategori Total Pengeluaran', 'value': 'Jumlah Pelanggan'})
+        show_plotly("monetary_bin_bar", fig_bar)
 
 
 
 # --- Halaman Data ---
 elif st.session_state["main_page"] == "Data":
     st.header("Data")
+    require_raw_data()
     st.write("Bagian ini memungkinkan pengguna untuk memfilter dan melihat data berdasarkan beberapa kriteria:")
 
     st.write("Preview data berdasarkan filter")
@@ -597,9 +669,9 @@ elif st.session_state["main_page"] == "Data":
     filter_options = ["payment_type", "product_category_name", "seller_city", "customer_city", "price"]
     selected_filter = st.selectbox("Pilih Kriteria Filter:", options=filter_options)
 
-    # Menampilkan opsi berdasarkan filter yang dipilih
+    # Menampilkan opsi berdasarkan filter yang dipilih (nilai unik sudah diurutkan di indeks)
     if selected_filter != "price":
-        unique_values = sorted(data[selected_filter].dropna().unique().tolist())
+        unique_values = analytics.unique_values(column=selected_filter)
         selected_value = st.selectbox("Pilih Nilai:", options=["Semua"] + unique_values)
     else:
         selected_value = st.selectbox("Pilih Opsi Harga:", options=["Tertinggi", "Terendah"])
@@ -607,21 +679,36 @@ elif st.session_state["main_page"] == "Data":
     # Pilihan untuk menampilkan 80 data awal atau terakhir
     opsi_data = st.radio("Tampilkan:", ("80 Data Awal", "80 Data Terakhir"))
 
-    # Terapkan filter berdasarkan pilihan
-    filtered_data = data.copy()
-    if selected_filter != "price" and selected_value != "Semua":
-        filtered_data = filtered_data[filtered_data[selected_filter] == selected_value]
-    elif selected_filter == "price":
-        if selected_value == "Tertinggi":
-            filtered_data = filtered_data.sort_values(by="price", ascending=False)
-        else:
-            filtered_data = filtered_data.sort_values(by="price", ascending=True)
-
-    # Menampilkan 80 data awal atau terakhir
-    if opsi_data == "80 Data Terakhir":
-        filtered_data = filtered_data.tail(80)
-    else:
-        filtered_data = filtered_data.head(80)
+    # Terapkan filter berdasarkan pilihan: posisi baris diambil dari indeks kolom/urutan harga,
+    # lalu hanya 80 data awal atau terakhir yang diambil dari tabel
+    with span(f"filter.{selected_filter}"):
+        filtered_data = analytics.data_preview(
+            column=None if selected_value == "Semua" else selected_filter,
+            value=None if selected_filter == "price" else selected_value,
+            descending=selected_value == "Tertinggi",
+            tail=opsi_data == "80 Data Terakhir",
+            rows=80,
+        )
 
     # Tampilkan data dengan container scrollable dan ukuran lebih besar
-    st.dataframe(filtered_data, height=600)
\ No newline at end of file
+    st.dataframe(filtered_data, height=600)
+
+# --- Panel Profiling (hanya jika DASHBOARD_PROFILE=1) ---
+if profiler.enabled:
+    with st.sidebar.expander("Profiling"):
+        scope = st.radio("Cakupan:", ("Sesi ini", "Semua sesi"), key="profile_scope")
+        profile_session = session_id if scope == "Sesi ini" else None
+        # Persentil durasi (detik) dan ukuran payload (byte) untuk halaman yang sedang dibuka
+        st.dataframe(profiler.summary(profile_session, page_name), hide_index=True)
+        memory = process_memory()
+        if memory:
+            # Tabel fakta di-memory-map: bagian "bersama" dipakai semua proses/sesi tanpa salinan
+            st.caption(f"Memori proses: RSS {memory['rss'] / 1e6:.0f} MB, privat {memory['private'] / 1e6:.0f} MB, "
+                       f"bersama {memory['shared'] / 1e6:.0f} MB")
+        pool_stats = section_pool.stats()
+        st.caption(f"Pool bagian halaman: {pool_stats['workers']} thread, {pool_stats['submitted']} tugas, "
+                   f"{pool_stats['shared']} dipakai bersama, {pool_stats['cancelled']} dibatalkan")
+        st.download_button("Unduh JSON", profiler.to_json(profile_session), file_name="profile.json")
+        st.download_button("Unduh Prometheus", profiler.to_prometheus(profile_session), file_name="profile.prom")
+        if st.button("Ekspor ke folder profiles/"):
+            st.write(", ".join(profiler.export()))
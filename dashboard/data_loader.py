@@ -0,0 +1,406 @@
+import glob
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CSV_PATH = "main_data.csv"
+SNAPSHOT_PATH = "main_data.arrow"
+
+# Tabel mentah E-Commerce Public Dataset (nama file asli Olist) di folder data/
+RAW_DIR = os.path.join("..", "data")
+RAW_TABLES = {
+    "orders": "orders_dataset.csv",
+    "order_items": "order_items_dataset.csv",
+    "order_payments": "order_payments_dataset.csv",
+    "order_reviews": "order_reviews_dataset.csv",
+    "customers": "customers_dataset.csv",
+    "geolocation": "geolocation_dataset.csv",
+    "products": "products_dataset.csv",
+    "sellers": "sellers_dataset.csv",
+    "category_translation": "product_category_name_translation.csv",
+}
+# Kode pos dibaca sebagai teks agar nol di depan tidak hilang dan join antar tabel konsisten
+ZIP_COLUMNS = ["customer_zip_code_prefix", "seller_zip_code_prefix", "geolocation_zip_code_prefix"]
+
+# Kolom teks berulang yang disimpan sebagai kategori (dictionary-encoded di Arrow)
+CATEGORY_COLUMNS = [
+    "order_status",
+    "customer_city", "customer_state",
+    "seller_city", "seller_state",
+    "geolocation_city", "geolocation_state",
+    "payment_type",
+    "product_category_name", "product_category_name_english",
+]
+
+# Kolom ID hex 32 karakter juga disimpan sebagai kategori: kode integer padat (int16/int32) plus satu
+# kamus string per nilai unik, sehingga groupby/nunique berjalan pada kode, bukan hash string.
+# Teks hex hanya dikembalikan (decode_ids) untuk baris yang benar-benar ditampilkan.
+ID_COLUMNS = ["order_id", "customer_id", "customer_unique_id", "product_id", "seller_id", "review_id"]
+
+# Kolom tanggal yang di-parse sekali saat snapshot dibuat
+DATE_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+    "shipping_limit_date",
+    "review_creation_date",
+    "review_answer_timestamp",
+]
+
+# Kolom uang tetap float64 agar total (Monetary) tidak kehilangan presisi
+MONEY_COLUMNS = ["price", "freight_value", "payment_value"]
+
+# Kunci metadata di skema Arrow untuk mendeteksi snapshot yang basi
+FINGERPRINT_KEY = b"source_fingerprint"
+# Segmen delta (ingest.py) mencatat sidik jari snapshot dasar tempat ia ditambahkan
+BASE_FINGERPRINT_KEY = b"base_fingerprint"
+SCHEMA_VERSION_KEY = b"schema_version"
+# Naikkan jika kolom turunan di enrich_data atau tata letak file berubah agar snapshot lama dibangun ulang
+SCHEMA_VERSION = "6"
+
+
+class DatasetChanged(RuntimeError):
+    # Dataset di disk tidak lagi sama dengan versi yang dimuat (proses lain menambah batch atau
+    # membangun ulang snapshot)
+    pass
+
+
+@contextmanager
+def dataset_lock(snapshot_path=SNAPSHOT_PATH):
+    # Kunci antarproses (file main_data.arrow.lock) untuk cek kesegaran + bangun ulang snapshot
+    # (load_main_data, build_snapshot) dan penambahan batch (ingest.py): tanpa kunci, reloader bisa
+    # membangun ulang snapshot dari CSV yang sudah berisi batch sebelum segmen deltanya ditulis
+    # (baris batch terbaca dua kali), dan dua proses ingest bisa memakai nomor segmen yang sama.
+    # Kunci dilepas OS jika proses mati. Direktori read-only: tidak ada yang bisa menulis, tanpa kunci.
+    try:
+        fd = os.open(f"{snapshot_path}.lock", os.O_RDWR | os.O_CREAT)
+    except OSError:
+        yield
+        return
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK menyerah setelah 10 detik; terus tunggu
+        yield
+    finally:
+        if fcntl is None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def source_fingerprint(path=CSV_PATH):
+    # Sidik jari sederhana file sumber: ukuran + waktu modifikasi (ns)
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def read_csv_typed(path=CSV_PATH):
+    # Baca CSV dengan tipe data eksplisit, bukan inferensi object untuk semua kolom teks
+    columns = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: "category" for col in CATEGORY_COLUMNS + ID_COLUMNS if col in columns}
+    dtypes.update({col: "str" for col in ZIP_COLUMNS if col in columns})
+    data = pd.read_csv(path, dtype=dtypes)
+    return enrich_data(optimize_dtypes(data))
+
+
+def optimize_dtypes(data):
+    for col in DATE_COLUMNS:
+        if col in data.columns and not pd.api.types.is_datetime64_any_dtype(data[col]):
+            data[col] = pd.to_datetime(data[col], errors="coerce")
+
+    for col in data.select_dtypes(include="integer").columns:
+        data[col] = pd.to_numeric(data[col], downcast="integer")
+    for col in data.select_dtypes(include="floating").columns:
+        if col not in MONEY_COLUMNS:
+            data[col] = pd.to_numeric(data[col], downcast="float")
+    return data
+
+
+def enrich_data(data):
+    # Kolom turunan dihitung sekali di sini, bukan di setiap rerun halaman
+    purchase = data["order_purchase_timestamp"]
+    # Waktu pengiriman aktual dan estimasi (dalam hari), Int16 nullable karena ada pesanan yang belum terkirim
+    data["delivery_time_actual"] = (data["order_delivered_customer_date"] - purchase).dt.days.astype("Int16")
+    data["delivery_time_estimated"] = (data["order_estimated_delivery_date"] - purchase).dt.days.astype("Int16")
+    # Urutkan berdasarkan waktu pembelian agar filter tanggal cukup dengan binary search (lihat time_index.py)
+    return data.sort_values("order_purchase_timestamp", kind="stable", na_position="last", ignore_index=True)
+
+
+def decode_ids(frame):
+    # Kolom ID kategori -> teks biasa, agar tabel/chart tidak membawa seluruh kamus kategori
+    columns = {col: "str" for col in ID_COLUMNS
+               if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype)}
+    return frame.astype(columns) if columns else frame
+
+
+def _write_single_batch(table, path):
+    # Satu record batch per file: setiap kolom menjadi satu buffer utuh yang bisa dipakai langsung
+    # oleh pandas (snapshot_frame). Dengan batch 64K baris bawaan feather, setiap batch membawa
+    # kamus kolom ID sendiri dan pembaca harus menyatukannya ke memori proses.
+    feather.write_feather(table, path, compression="uncompressed", chunksize=max(table.num_rows, 1))
+
+
+# Izin file baru mengikuti umask proses (mkstemp selalu membuat file 0600); dibaca sekali saat impor
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def publish_file(path, write):
+    # Tulis ke file sementara unik di folder yang sama (write(tmp_path)) lalu rename, agar pembaca
+    # tidak pernah melihat file setengah jadi dan beberapa proses (server, reloader, warm-up, sesi
+    # Streamlit) yang menulis file yang sama tidak saling menimpa file sementara
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_snapshot(data, fingerprint, snapshot_path=SNAPSHOT_PATH):
+    # Simpan sebagai Arrow IPC tanpa kompresi agar bisa di-memory-map
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_KEY] = fingerprint.encode()
+    metadata[SCHEMA_VERSION_KEY] = SCHEMA_VERSION.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    publish_file(snapshot_path, lambda tmp_path: _write_single_batch(table, tmp_path))
+    # Segmen delta milik snapshot sebelumnya tidak berlaku lagi (mungkin sudah dihapus proses lain)
+    for path in delta_paths(snapshot_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def delta_paths(snapshot_path=SNAPSHOT_PATH):
+    # Segmen delta: main_data.delta-00001.arrow, ... (urut sesuai urutan penambahan)
+    root, ext = os.path.splitext(snapshot_path)
+    return sorted(glob.glob(f"{glob.escape(root)}.delta-*{ext}"))
+
+
+def write_delta(data, fingerprint, expected, snapshot_path=SNAPSHOT_PATH):
+    # Tambahkan baris baru sebagai segmen Arrow terpisah (snapshot dasar tidak ditulis ulang).
+    # Dipanggil di dalam dataset_lock. `expected`: versi dataset tempat baris ini ditambahkan; jika
+    # segmen terakhir di disk bukan versi itu, DatasetChanged (bukan segmen di atas dataset lain).
+    # Tipe kolom disamakan dengan snapshot dasar agar semua segmen bisa digabung saat dibaca.
+    # Gagal (pa.ArrowInvalid) jika nilai baru tidak muat di tipe dasar, misalnya int8 yang meluap.
+    segments = snapshot_segments(snapshot_path)
+    current = _segment_metadata(segments[-1]).get(FINGERPRINT_KEY, b"").decode()
+    if current != expected:
+        raise DatasetChanged(f"{snapshot_path} berversi {current}, bukan {expected}")
+    with pa.memory_map(snapshot_path) as source:
+        schema = pa.ipc.open_file(source).schema
+    table = pa.Table.from_pandas(data, preserve_index=False).select(schema.names).cast(schema)
+    metadata = dict(schema.metadata or {})
+    metadata[BASE_FINGERPRINT_KEY] = metadata[FINGERPRINT_KEY]
+    metadata[FINGERPRINT_KEY] = fingerprint.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Nomor berikutnya setelah segmen yang berlaku; file lama di nomor itu (sisa snapshot
+    # sebelumnya) memang sudah tidak berlaku dan boleh ditimpa
+    root, ext = os.path.splitext(snapshot_path)
+    path = f"{root}.delta-{len(segments):05d}{ext}"
+    publish_file(path, lambda tmp_path: _write_single_batch(table, tmp_path))
+    return path
+
+
+def build_snapshot(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    # Konversi main_data.csv sekali menjadi snapshot kolumnar bertipe
+    with dataset_lock(snapshot_path):
+        fingerprint = source_fingerprint(csv_path)
+        data = read_csv_typed(csv_path)
+        write_snapshot(data, fingerprint, snapshot_path)
+    return data
+
+
+def _segment_metadata(path):
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema.metadata or {}
+
+
+def snapshot_segments(snapshot_path=SNAPSHOT_PATH):
+    # Snapshot dasar + segmen delta yang berurutan dan berasal dari snapshot dasar ini
+    segments = [snapshot_path]
+    base = _segment_metadata(snapshot_path).get(FINGERPRINT_KEY)
+    for path in delta_paths(snapshot_path):
+        if _segment_metadata(path).get(BASE_FINGERPRINT_KEY) != base:
+            break
+        segments.append(path)
+    return segments
+
+
+def snapshot_metadata(snapshot_path=SNAPSHOT_PATH):
+    # Metadata segmen terakhir: sidik jari CSV setelah penambahan terakhir
+    metadata = dict(_segment_metadata(snapshot_path))
+    last = snapshot_segments(snapshot_path)[-1]
+    if last != snapshot_path:
+        metadata[FINGERPRINT_KEY] = _segment_metadata(last)[FINGERPRINT_KEY]
+    return metadata
+
+
+def snapshot_is_fresh(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    if not os.path.exists(snapshot_path):
+        return False
+    metadata = snapshot_metadata(snapshot_path)
+    if metadata.get(SCHEMA_VERSION_KEY, b"").decode() != SCHEMA_VERSION:
+        return False
+    if not os.path.exists(csv_path):
+        # CSV tidak ada (misalnya hanya snapshot yang di-deploy): snapshot dianggap valid
+        return True
+    return metadata.get(FINGERPRINT_KEY, b"").decode() == source_fingerprint(csv_path)
+
+
+def raw_table_path(name, raw_dir=RAW_DIR):
+    return os.path.join(raw_dir, RAW_TABLES[name])
+
+
+def dataset_version(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    # Versi dataset = sidik jari CSV sumber, atau yang tercatat di snapshot jika CSV tidak ada
+    if os.path.exists(csv_path):
+        return source_fingerprint(csv_path)
+    if os.path.exists(snapshot_path):
+        return snapshot_metadata(snapshot_path).get(FINGERPRINT_KEY, b"").decode()
+    return None
+
+
+def main_data_available(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    return os.path.exists(csv_path) or os.path.exists(snapshot_path)
+
+
+def read_snapshot_table(snapshot_path=SNAPSHOT_PATH, columns=None):
+    # Memory-map file Arrow (konversi ke pandas tanpa salinan: snapshot_frame).
+    # Segmen delta digabung sebagai chunk tambahan (tanpa menyalin snapshot dasar).
+    tables = []
+    for path in snapshot_segments(snapshot_path):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        tables.append(table if columns is None else table.select(columns))
+    return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+
+def _buffer_view(array, dtype):
+    # Buffer nilai array Arrow primitif sebagai numpy read-only, tanpa salinan
+    values = np.frombuffer(array.buffers()[1], dtype=dtype, count=array.offset + len(array))
+    return values[array.offset:]
+
+
+def _nulls_hold(values, array, sentinel):
+    # Slot null harus sudah berisi penanda pandas (NaN, NaT, kode -1) agar buffer bisa dipakai langsung.
+    # Buffer yang ditulis dari pandas memang begitu; selain itu kembali ke konversi pyarrow.
+    if array.null_count == 0:
+        return True
+    nulls = array.is_null().to_numpy(zero_copy_only=False)
+    return bool(np.all(sentinel(values[nulls])))
+
+
+def _column_view(column, numpy_type):
+    # Kolom Arrow satu chunk -> array pandas di atas buffer memory-map; None jika perlu disalin
+    if column.num_chunks != 1:
+        return None  # snapshot + segmen delta: chunk harus disatukan
+    array = column.chunk(0)
+    if pa.types.is_dictionary(array.type):
+        codes = _buffer_view(array.indices, np.dtype(array.type.index_type.to_pandas_dtype()))
+        if not _nulls_hold(codes, array, lambda values: values == -1):
+            return None
+        dictionary = array.dictionary
+        if pa.types.is_large_string(dictionary.type) or pa.types.is_string(dictionary.type):
+            categories = pd.Index(pd.array(dictionary, dtype="str"))
+        else:
+            categories = pd.Index(dictionary.to_pandas())
+        # Kamus berasal dari kategori pandas (sudah unik); fastpath melewati cek keunikan yang
+        # membangun hash table seluruh kamus (puluhan MB untuk kolom ID)
+        dtype = pd.CategoricalDtype._from_fastpath(categories, array.type.ordered)
+        return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+    if pa.types.is_large_string(array.type) or pa.types.is_string(array.type):
+        return pd.array(array, dtype="str")
+    if pa.types.is_timestamp(array.type) and array.type.tz is None:
+        values = _buffer_view(array, np.dtype(f"datetime64[{array.type.unit}]"))
+        return values if _nulls_hold(values, array, np.isnat) else None
+    if pa.types.is_floating(array.type):
+        values = _buffer_view(array, np.dtype(array.type.to_pandas_dtype()))
+        return values if _nulls_hold(values, array, np.isnan) else None
+    if pa.types.is_integer(array.type):
+        values = _buffer_view(array, np.dtype(array.type.to_pandas_dtype()))
+        if numpy_type == str(values.dtype) and array.null_count == 0:
+            return values
+        if numpy_type == str(values.dtype).capitalize():
+            # Integer nullable (int16 -> Int16): nilai dipakai langsung, hanya mask yang dibuat
+            mask = array.is_null().to_numpy(zero_copy_only=False)
+            return pd.arrays.IntegerArray(values, mask)
+    return None
+
+
+def snapshot_frame(table):
+    # DataFrame yang kolomnya menunjuk langsung ke buffer tabel Arrow (memory-map), tanpa salinan
+    # seperti Table.to_pandas. Semua proses yang me-memory-map snapshot yang sama berbagi halaman
+    # page cache OS; memori privat proses hanya untuk kolom yang tetap harus dikonversi.
+    numpy_types = {col["name"]: col["numpy_type"] for col in (table.schema.pandas_metadata or {}).get("columns", [])}
+    columns = {}
+    for name in table.column_names:
+        columns[name] = _column_view(table.column(name), numpy_types.get(name))
+    converted = [name for name, values in columns.items() if values is None]
+    if converted:
+        rest = table.select(converted).to_pandas(split_blocks=True)
+        for name in converted:
+            columns[name] = rest[name]
+    # copy=False: kolom numpy tidak digabung menjadi blok 2D (yang berarti menyalin)
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH):
+    return snapshot_frame(read_snapshot_table(snapshot_path))
+
+
+def load_main_data(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    # Di dalam dataset_lock: tidak bersilangan dengan penambahan batch (ingest.py) yang sedang berjalan
+    with dataset_lock(snapshot_path):
+        if snapshot_is_fresh(csv_path, snapshot_path):
+            return read_snapshot(snapshot_path)
+
+        # Snapshot belum ada atau basi: baca CSV, lalu coba simpan snapshot untuk start berikutnya
+        fingerprint = source_fingerprint(csv_path)
+        data = read_csv_typed(csv_path)
+        try:
+            write_snapshot(data, fingerprint, snapshot_path)
+        except OSError:
+            pass  # Direktori read-only: tetap jalan dengan data dari CSV
+        return data
+
+
+if __name__ == "__main__":
+    # Langkah build: python data_loader.py [main_data.csv] [main_data.arrow]
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_PATH
+    data = build_snapshot(csv_path, snapshot_path)
+    print(f"Snapshot {snapshot_path} dibuat: {len(data)} baris, "
+          f"{data.memory_usage(deep=True).sum() / 1e6:.1f} MB di memori")
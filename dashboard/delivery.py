@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+# Statistik pengiriman yang dihitung sekali per dataset: per seller, per rute (seller_state ->
+# customer_state), dan per bulan pembelian. Satuannya pengiriman, yaitu pasangan (order_id,
+# seller_id) yang sudah diterima pelanggan; terlambat jika tanggal diterima melewati tanggal
+# order_estimated_delivery_date.
+# delivery_time_actual berupa hari bulat, sehingga sketsa kuantil cukup berupa histogram per hari:
+# dua sketsa digabung dengan menjumlahkan histogramnya dan kuantilnya tepat (bukan perkiraan
+# seperti t-digest). Histogram disimpan jarang (hanya sel yang terisi) urut (kunci, bulan, hari)
+# dengan offset per (kunci, bulan) seperti CSR di column_index.py: rentang bulan untuk satu kunci
+# adalah satu potongan array. Jumlah pengiriman, keterlambatan, dan total hari per rentang bulan
+# diambil dari prefix sum per bulan. Rentang tanggal dibulatkan ke bulan penuh.
+
+MAX_DAYS = 255  # pengiriman >= MAX_DAYS hari dihitung di bin terakhir
+DIMENSIONS = {"seller": ["seller_id"], "route": ["seller_state", "customer_state"]}
+DELIVERY_COLUMNS = ["order_id", "seller_id", "seller_state", "customer_state", "order_purchase_timestamp",
+                    "order_delivered_customer_date", "order_estimated_delivery_date", "delivery_time_actual"]
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95}
+
+
+def purchase_month(purchase):
+    # Timestamp pembelian -> awal bulan (datetime64[M]); NaT tetap NaT
+    return pd.Series(purchase).to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+
+
+def late_flags(delivered, estimated):
+    # 1 jika diterima setelah tanggal estimasi (per hari kalender), selain itu 0
+    delivered, estimated = pd.Series(delivered), pd.Series(estimated)
+    return (delivered.dt.normalize() > estimated.dt.normalize()).to_numpy(dtype="int64")
+
+
+def clip_days(days):
+    return np.asarray(days, dtype="int64").clip(0, MAX_DAYS)
+
+
+def shipments(data):
+    # Satu baris per (order_id, seller_id) yang sudah diterima: bulan pembelian, hari, terlambat
+    frame = data.loc[data["delivery_time_actual"].notna().to_numpy(), DELIVERY_COLUMNS]
+    frame = frame.drop_duplicates(["order_id", "seller_id"])
+    return pd.DataFrame({
+        "seller_id": frame["seller_id"],
+        "seller_state": frame["seller_state"],
+        "customer_state": frame["customer_state"],
+        "month": purchase_month(frame["order_purchase_timestamp"]),
+        "days": clip_days(frame["delivery_time_actual"].to_numpy(dtype="int64")),
+        "late": late_flags(frame["order_delivered_customer_date"], frame["order_estimated_delivery_date"]),
+    })
+
+
+def sketch_frames(frame):
+    # Baris pengiriman -> {dimensi: baris unik (kunci..., month, days, count, late)}
+    return {name: frame.groupby(keys + ["month", "days"], observed=True, sort=False).agg(
+                count=("late", "size"), late=("late", "sum")).reset_index()
+            for name, keys in DIMENSIONS.items()}
+
+
+def hist_quantiles(hist, quantiles=QUANTILES):
+    # Kuantil nearest-rank per baris histogram (hari terkecil dengan CDF >= q); NaN jika kosong
+    cumulative = np.cumsum(hist, axis=1)
+    total = cumulative[:, -1:]
+    result = {}
+    for name, q in quantiles.items():
+        days = (cumulative < q * total).sum(axis=1).astype("float64")
+        days[total[:, 0] == 0] = np.nan
+        result[name] = days
+    return result
+
+
+class _Sketch:
+    # Histogram jarang satu dimensi; key_columns kosong = satu kunci untuk semua pengiriman
+    def __init__(self, frame, key_columns, months):
+        if key_columns:
+            grouped = frame.groupby(key_columns, observed=True, sort=True)
+            key_code = grouped.ngroup().to_numpy()
+            self.keys = grouped.size().index.to_frame(index=False)
+        else:
+            key_code = np.zeros(len(frame), dtype="int64")
+            self.keys = pd.DataFrame(index=range(1))
+        # Label teks per kunci ("SP-RJ" untuk rute) untuk mencari posisi kunci tanpa memindai
+        labels = [self.keys[column].astype(str) for column in key_columns]
+        self.labels = pd.Index(labels[0].str.cat(labels[1:], sep="-") if labels else ["all"])
+        self.months = len(months)
+        cells = len(self.keys) * self.months
+        cell = key_code * self.months + months.get_indexer(frame["month"])
+        days = frame["days"].to_numpy(dtype="int64")
+        count = frame["count"].to_numpy(dtype="int64")
+        late = frame["late"].to_numpy(dtype="int64")
+
+        order = np.lexsort((days, cell))
+        self.days, self.count = days[order], count[order]
+        self.row_key, self.row_month = np.divmod(cell[order], self.months)
+        self.offsets = np.searchsorted(cell[order], np.arange(cells + 1))
+        self.cumulative = {}
+        for name, weights in [("count", count), ("late", late), ("days", count * days)]:
+            totals = np.bincount(cell, weights=weights, minlength=cells).reshape(len(self.keys), self.months)
+            prefix = np.zeros((len(self.keys), self.months + 1), dtype="int64")
+            np.cumsum(totals, axis=1, out=prefix[:, 1:])
+            self.cumulative[name] = prefix
+
+    def totals(self, first, last):
+        # Jumlah pengiriman, keterlambatan, dan hari per kunci untuk bulan first..last
+        return {name: prefix[:, last + 1] - prefix[:, first] for name, prefix in self.cumulative.items()}
+
+    def histogram(self, key, first, last):
+        start, end = self.offsets[key * self.months + first], self.offsets[key * self.months + last + 1]
+        return np.bincount(self.days[start:end], weights=self.count[start:end], minlength=MAX_DAYS + 1)
+
+    def histograms(self, keys, first, last):
+        # Histogram (len(keys), MAX_DAYS + 1) untuk posisi kunci `keys`
+        position = np.full(len(self.keys), -1)
+        position[keys] = np.arange(len(keys))
+        rows = position[self.row_key]
+        rows = np.flatnonzero((rows >= 0) & (self.row_month >= first) & (self.row_month <= last))
+        cells = position[self.row_key[rows]] * (MAX_DAYS + 1) + self.days[rows]
+        hist = np.bincount(cells, weights=self.count[rows], minlength=len(keys) * (MAX_DAYS + 1))
+        return hist.reshape(len(keys), MAX_DAYS + 1)
+
+    def monthly(self, key):
+        # Histogram (bulan, MAX_DAYS + 1) untuk satu kunci
+        start, end = self.offsets[key * self.months], self.offsets[(key + 1) * self.months]
+        cells = self.row_month[start:end] * (MAX_DAYS + 1) + self.days[start:end]
+        hist = np.bincount(cells, weights=self.count[start:end], minlength=self.months * (MAX_DAYS + 1))
+        return hist.reshape(self.months, MAX_DAYS + 1)
+
+
+class DeliverySketches:
+    def __init__(self, frames):
+        # frames: hasil sketch_frames (atau gabungannya); disimpan apa adanya untuk merged()/streaming.py
+        self.frames = frames
+        months = np.unique(np.concatenate([frame["month"].to_numpy(dtype="datetime64[M]") for frame in frames.values()]))
+        self.months = pd.DatetimeIndex(months.astype("datetime64[ns]"))
+        self._sketches = {name: _Sketch(frame, DIMENSIONS[name], self.months) for name, frame in frames.items()}
+        overall = frames["route"].groupby(["month", "days"], sort=False)[["count", "late"]].sum().reset_index()
+        self._sketches["all"] = _Sketch(overall, [], self.months)
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(sketch_frames(shipments(data)))
+
+    def merged(self, *others):
+        # Sketsa gabungan (misalnya dataset + batch baru dari ingest.py): histogram dijumlahkan.
+        # Beberapa sketsa sekaligus digabung dalam satu group-by, bukan satu per sketsa.
+        frames = {}
+        for name, keys in DIMENSIONS.items():
+            frame = pd.concat([self.frames[name]] + [other.frames[name] for other in others], ignore_index=True)
+            frames[name] = frame.groupby(keys + ["month", "days"], observed=True, sort=False)[
+                ["count", "late"]].sum().reset_index()
+        return DeliverySketches(frames)
+
+    def month_span(self, start_date=None, end_date=None):
+        # Posisi bulan pertama dan terakhir yang beririsan dengan rentang tanggal (bulan penuh)
+        first = 0 if start_date is None else int(self.months.searchsorted(
+            pd.Timestamp(start_date).to_period("M").to_timestamp()))
+        last = len(self.months) - 1 if end_date is None else int(self.months.searchsorted(
+            pd.Timestamp(end_date).to_period("M").to_timestamp(), side="right")) - 1
+        return first, last
+
+    def locate(self, dimension, key):
+        # Posisi kunci (nilai tunggal untuk seller, tuple (seller_state, customer_state) untuk rute)
+        label = "-".join(map(str, key)) if isinstance(key, tuple) else str(key)
+        labels = self._sketches[dimension].labels
+        position = labels.get_indexer([label])[0]
+        if position < 0:
+            raise KeyError(key)
+        return int(position)
+
+    def histogram(self, dimension, key=None, start_date=None, end_date=None):
+        # Jumlah pengiriman per hari (indeks = hari) untuk satu kunci pada rentang tanggal
+        first, last = self.month_span(start_date, end_date)
+        position = 0 if dimension == "all" else self.locate(dimension, key)
+        if first > last:
+            return np.zeros(MAX_DAYS + 1, dtype="int64")
+        return self._sketches[dimension].histogram(position, first, last).astype("int64")
+
+    def summary(self, dimension, start_date=None, end_date=None, min_count=1):
+        # Satu baris per kunci dengan minimal min_count pengiriman pada rentang tanggal
+        sketch = self._sketches[dimension]
+        first, last = self.month_span(start_date, end_date)
+        if first > last:
+            totals = {name: np.zeros(len(sketch.keys), dtype="int64") for name in sketch.cumulative}
+        else:
+            totals = sketch.totals(first, last)
+        keys = np.flatnonzero(totals["count"] >= max(min_count, 1))
+        result = sketch.keys.iloc[keys].reset_index(drop=True)
+        count = totals["count"][keys]
+        result["pengiriman"] = count
+        result["terlambat"] = totals["late"][keys]
+        result["late_rate"] = totals["late"][keys] / count
+        result["mean_days"] = totals["days"][keys] / count
+        for name, values in hist_quantiles(sketch.histograms(keys, first, last)).items():
+            result[name] = values
+        return result
+
+    def monthly(self, dimension="all", key=None):
+        # Satu baris per bulan pembelian untuk satu kunci (atau semua pengiriman)
+        sketch = self._sketches[dimension]
+        position = 0 if dimension == "all" else self.locate(dimension, key)
+        prefix = {name: np.diff(values[position]) for name, values in sketch.cumulative.items()}
+        result = pd.DataFrame({"month": self.months, "pengiriman": prefix["count"], "terlambat": prefix["late"]})
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result["late_rate"] = prefix["late"] / prefix["count"]
+            result["mean_days"] = prefix["days"] / prefix["count"]
+        for name, values in hist_quantiles(sketch.monthly(position)).items():
+            result[name] = values
+        return result
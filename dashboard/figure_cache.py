@@ -0,0 +1,105 @@
+import datetime
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Cache gambar chart (PNG) yang sudah dirender, dengan kunci
+# (chart id, versi dataset, nilai filter yang dinormalisasi).
+# Rerun yang hanya mengubah satu slider cukup merender ulang chart yang terkait.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_filters(value):
+    # Ubah nilai widget menjadi bentuk hashable dan stabil (list/tuple -> tuple, numpy -> Python)
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize_filters(val)) for key, val in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize_filters(val) for val in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_filters(val) for val in value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, chart_id, dataset_version, filters):
+        return (chart_id, dataset_version, normalize_filters(filters))
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= len(self._entries.pop(key))
+            if len(png) > self.max_bytes:
+                return
+            self._entries[key] = png
+            self.current_bytes += len(png)
+            # Buang entri yang paling lama tidak dipakai sampai kembali di bawah budget
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def serialize(self, fig):
+        # Subclass dapat menyimpan format lain (lihat map_cache.MapCache untuk HTML peta)
+        return figure_to_png(fig)
+
+    def render(self, chart_id, dataset_version, filters, build_figure):
+        # Kembalikan PNG dari cache, atau panggil build_figure() lalu simpan hasilnya
+        key = self.make_key(chart_id, dataset_version, filters)
+        png = self.get(key)
+        if png is None:
+            png = self.serialize(build_figure())
+            self.put(key, png)
+        return png
+
+    def evict_version(self, dataset_version):
+        # Hapus semua entri milik versi dataset tertentu
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == dataset_version]:
+                self.current_bytes -= len(self._entries.pop(key))
+
+    def retain_version(self, dataset_version):
+        # Dipanggil setiap rerun dengan versi aktif: saat versi berganti, buang semua entri versi lain
+        if dataset_version == self.version:
+            return
+        with self._lock:
+            for key in [key for key in self._entries if key[1] != dataset_version]:
+                self.current_bytes -= len(self._entries.pop(key))
+            self.version = dataset_version
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def figure_to_png(fig, dpi=200):
+    # Simpan figure ke PNG (setara default st.pyplot). Figure dari charts.py tidak terdaftar di
+    # pyplot, sehingga tidak perlu ditutup dan cukup dibuang setelah dirender
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
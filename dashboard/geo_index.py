@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# Indeks spasial untuk centroid kota dan kode pos (halaman Geolocation Map, analisis jarak).
+# Titik dikelompokkan ke grid lat/lng berukuran CELL_DEGREES (mirip geohash) dan diurutkan per sel
+# dengan offset seperti CSR di column_index.py: query bounding box hanya memeriksa sel yang
+# beririsan, lalu menyaring koordinat secara tepat. Query radius = bounding box + haversine.
+# Cluster per tingkat zoom dihitung sekali: titik dikelompokkan per kotak CLUSTER_PIXELS piksel
+# pada proyeksi Web Mercator (seperti Leaflet), sehingga peta hanya memuat cluster/titik di
+# viewport untuk zoom yang dipilih, bukan semua kota.
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 0.5
+TILE_SIZE = 256  # piksel per tile Web Mercator pada zoom 0
+CLUSTER_PIXELS = 60
+# Rentang slider zoom halaman Geolocation Map; mulai CLUSTER_MAX_ZOOM setiap kota digambar sendiri
+MIN_ZOOM, MAX_ZOOM = 5, 15
+CLUSTER_MAX_ZOOM = 11
+VIEWPORT = (700, 500)  # ukuran komponen peta di dashboard (piksel)
+MERCATOR_MAX_LAT = 85.05112878
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(value, dtype="float64")) for value in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def project(lat, lng):
+    # Koordinat piksel Web Mercator pada zoom 0 (0..TILE_SIZE); pada zoom z dikali 2**z
+    lat = np.clip(np.asarray(lat, dtype="float64"), -MERCATOR_MAX_LAT, MERCATOR_MAX_LAT)
+    x = (np.asarray(lng, dtype="float64") + 180) / 360 * TILE_SIZE
+    sin = np.sin(np.radians(lat))
+    y = (0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)) * TILE_SIZE
+    return x, y
+
+
+def unproject(x, y):
+    lng = np.asarray(x, dtype="float64") / TILE_SIZE * 360 - 180
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y, dtype="float64") / TILE_SIZE))))
+    return lat, lng
+
+
+def viewport_bounds(center, zoom, size=VIEWPORT, margin=0.25):
+    # (selatan, barat, utara, timur) area yang terlihat di peta `size` piksel berpusat di `center`,
+    # ditambah `margin` (bagian dari lebar/tinggi) di setiap sisi agar geseran kecil tetap berisi
+    x, y = project(center[0], center[1])
+    scale = 2.0 ** zoom
+    half_width = size[0] * (0.5 + margin) / scale
+    half_height = size[1] * (0.5 + margin) / scale
+    north, west = unproject(x - half_width, y - half_height)
+    south, east = unproject(x + half_width, y + half_height)
+    return float(south), float(max(west, -180.0)), float(north), float(min(east, 180.0))
+
+
+class GeoIndex:
+    def __init__(self, frame, weights=(), key=None, lat="geolocation_lat", lng="geolocation_lng",
+                 zooms=range(MIN_ZOOM, CLUSTER_MAX_ZOOM)):
+        # frame: satu baris per titik (kota atau kode pos); posisi hasil query = posisi baris frame.
+        # weights: kolom yang dijumlahkan per cluster; key: kolom unik untuk locate().
+        self.frame = frame
+        self.lat = frame[lat].to_numpy(dtype="float64")
+        self.lng = frame[lng].to_numpy(dtype="float64")
+        self.weights = list(weights)
+        self._valid = np.flatnonzero(~np.isnan(self.lat) & ~np.isnan(self.lng))
+
+        # Grid: sel = baris lintang * jumlah kolom + kolom bujur, posisi titik urut per sel
+        self._columns = int(360 / CELL_DEGREES) + 1
+        cells = self._cell(self.lat[self._valid], self.lng[self._valid])
+        order = np.argsort(cells, kind="stable")
+        self._cells = cells[order]
+        self._order = self._valid[order]
+
+        self._x, self._y = project(self.lat, self.lng)
+        self._lookup = None if key is None else pd.Index(frame[key])
+        self._clusters = {zoom: self._cluster(self._valid, zoom) for zoom in zooms}
+
+    def _cell(self, lat, lng):
+        rows = np.floor((np.clip(lat, -90, 90) + 90) / CELL_DEGREES).astype("int64")
+        columns = np.floor((np.clip(lng, -180, 180) + 180) / CELL_DEGREES).astype("int64")
+        return rows * self._columns + columns
+
+    def bbox(self, south, west, north, east):
+        # Posisi titik (urut naik) di dalam kotak; hanya sel grid yang beririsan yang diperiksa
+        first = self._cell(np.array([south]), np.array([west]))[0]
+        last = self._cell(np.array([north]), np.array([east]))[0]
+        rows = np.arange(first // self._columns, last // self._columns + 1)
+        starts = np.searchsorted(self._cells, rows * self._columns + first % self._columns, side="left")
+        ends = np.searchsorted(self._cells, rows * self._columns + last % self._columns, side="right")
+        candidates = np.concatenate([self._order[start:end] for start, end in zip(starts, ends)] or [[]])
+        candidates = candidates.astype("int64")
+        lat, lng = self.lat[candidates], self.lng[candidates]
+        inside = (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        return np.sort(candidates[inside])
+
+    def radius(self, lat, lng, km):
+        # (posisi, jarak km) titik dalam radius km dari (lat, lng), urut dari yang terdekat
+        angle = km / EARTH_RADIUS_KM
+        dlat = np.degrees(angle)
+        # Setengah lebar bujur lingkaran: asin(sin(r) / cos(lat)), bukan dlat / cos(lat) yang terlalu
+        # sempit di lintang yang jauh dari pusat. Lingkaran yang mencapai kutub atau melewati
+        # antimeridian memakai seluruh rentang bujur.
+        west, east = -180.0, 180.0
+        if angle < np.pi / 2 and np.sin(angle) < np.cos(np.radians(lat)):
+            dlng = np.degrees(np.arcsin(np.sin(angle) / np.cos(np.radians(lat))))
+            if lng - dlng >= -180 and lng + dlng <= 180:
+                west, east = lng - dlng, lng + dlng
+        candidates = self.bbox(lat - dlat, west, lat + dlat, east)
+        distance = haversine_km(lat, lng, self.lat[candidates], self.lng[candidates])
+        keep = distance <= km
+        order = np.argsort(distance[keep], kind="stable")
+        return candidates[keep][order], distance[keep][order]
+
+    def locate(self, keys):
+        # Koordinat (lat, lng) untuk setiap nilai kunci; NaN jika kunci tidak ada di indeks
+        positions = self._lookup.get_indexer(keys)
+        found = positions >= 0
+        lat = np.full(len(positions), np.nan)
+        lng = np.full(len(positions), np.nan)
+        lat[found] = self.lat[positions[found]]
+        lng[found] = self.lng[positions[found]]
+        return lat, lng
+
+    def _cluster(self, positions, zoom):
+        # Satu baris per kotak CLUSTER_PIXELS piksel pada zoom: jumlah titik, rata-rata koordinat,
+        # jumlah kolom weights, dan posisi salah satu anggota (titik itu sendiri jika sendirian)
+        scale = 2.0 ** zoom / CLUSTER_PIXELS
+        width = int(np.ceil(TILE_SIZE * scale)) + 1
+        cells = np.floor(self._y[positions] * scale).astype("int64") * width + np.floor(self._x[positions] * scale).astype("int64")
+        _, first, inverse, counts = np.unique(cells, return_index=True, return_inverse=True, return_counts=True)
+        clusters = {
+            "geolocation_lat": np.bincount(inverse, weights=self.lat[positions]) / counts,
+            "geolocation_lng": np.bincount(inverse, weights=self.lng[positions]) / counts,
+            "points": counts,
+        }
+        for column in self.weights:
+            values = self.frame[column].to_numpy(dtype="float64")[positions]
+            clusters[column] = np.bincount(inverse, weights=values).astype("int64")
+        clusters["position"] = positions[first]
+        return pd.DataFrame(clusters)
+
+    def _points(self, positions):
+        # Setiap titik sebagai cluster beranggota satu (kolom sama dengan _cluster)
+        points = {
+            "geolocation_lat": self.lat[positions],
+            "geolocation_lng": self.lng[positions],
+            "points": np.ones(len(positions), dtype="int64"),
+        }
+        for column in self.weights:
+            points[column] = self.frame[column].to_numpy(dtype="float64")[positions].astype("int64")
+        points["position"] = positions
+        return pd.DataFrame(points)
+
+    def viewport(self, bounds, zoom, positions=None):
+        # Cluster (zoom < CLUSTER_MAX_ZOOM) atau titik tunggal di dalam bounds (viewport_bounds).
+        # positions: subset titik (misalnya hasil filter); None = semua titik, memakai cluster pra-hitung.
+        south, west, north, east = bounds
+        if zoom >= CLUSTER_MAX_ZOOM:
+            inside = self.bbox(south, west, north, east)
+            if positions is not None:
+                inside = np.intersect1d(inside, positions, assume_unique=True)
+            return self._points(inside)
+        clusters = self._clusters.get(zoom) if positions is None else None
+        if clusters is None:
+            subset = self._valid if positions is None else np.intersect1d(positions, self._valid)
+            clusters = self._cluster(subset, zoom)
+        lat, lng = clusters["geolocation_lat"].to_numpy(), clusters["geolocation_lng"].to_numpy()
+        inside = (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        return clusters[inside].reset_index(drop=True)
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Array yang bisa diperpanjang di akhir dengan biaya O(baris baru) (ingest.py): kapasitas buffer
+# dilipatgandakan saat penuh, sehingga penyalinan ulang seluruh isi hanya terjadi O(log n) kali.
+# Pemakai memegang tampilan buffer[:size]; elemen baru ditulis setelah `size`, jadi tampilan
+# lama (misalnya milik TimeIndex/RFMEngine versi sebelumnya yang masih melayani) tidak berubah.
+# Jika tampilan yang sama diperpanjang dua kali (append gagal lalu diulang, atau dua cabang dari
+# versi yang sama), perpanjangan kedua menyalin ke buffer baru agar tidak menimpa yang pertama.
+
+MIN_CAPACITY = 1024
+
+
+class GrowableArray:
+    def __init__(self, values):
+        # Kapasitas awal = panjang values, jadi values sendiri tidak pernah ditulis: buffer baru
+        # dialokasikan pada perpanjangan pertama
+        self._buffer = np.asarray(values)
+        self.size = len(self._buffer)
+
+    def view(self, size=None):
+        return self._buffer[:self.size if size is None else size]
+
+    def extended(self, size, values):
+        # GrowableArray berisi view(size) + values: buffer ini sendiri jika `size` adalah ujungnya,
+        # selain itu salinan baru
+        values = np.asarray(values, dtype=self._buffer.dtype)
+        if size != self.size:
+            return GrowableArray(np.concatenate([self._buffer[:size], values]))
+        end = size + len(values)
+        if end > len(self._buffer):
+            buffer = np.empty(max(end, 2 * len(self._buffer), MIN_CAPACITY), dtype=self._buffer.dtype)
+            buffer[:size] = self._buffer[:size]
+            self._buffer = buffer
+        self._buffer[size:end] = values
+        self.size = end
+        return self
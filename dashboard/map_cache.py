@@ -0,0 +1,19 @@
+from figure_cache import FigureCache
+
+# HTML peta yang sudah diserialisasi di-cache per (halaman/peta, versi dataset, batas filter).
+# Pada peta area, zoom dan pusat peta ikut batas filter karena isi peta (cluster/titik di viewport,
+# lihat geo_index.py) bergantung padanya. Modul ini tidak mengimpor folium; peta baru dibangun
+# (dan folium dimuat) saat terjadi cache miss.
+
+DEFAULT_MAP_CACHE_BYTES = 32 * 1024 * 1024
+MAP_CACHE_ENV = "DASHBOARD_MAP_CACHE_MB"
+
+
+class MapCache(FigureCache):
+    # LRU berbatas byte seperti FigureCache, tetapi menyimpan HTML peta sebagai bytes UTF-8, agar
+    # budget dihitung dalam byte (nama kota seperti "São Paulo" lebih dari satu byte per karakter)
+    def __init__(self, max_bytes=DEFAULT_MAP_CACHE_BYTES):
+        super().__init__(max_bytes=max_bytes)
+
+    def serialize(self, m):
+        return m._repr_html_().encode("utf-8")
@@ -0,0 +1,116 @@
+import re
+
+import folium
+import numpy as np
+from folium.map import Layer
+from jinja2 import Template
+
+# Peta dibangun dari satu layer vektor: koordinat dan properti dikirim sebagai array kolom
+# (bukan satu objek folium per kota), lalu marker dan popup dibuat di browser dengan
+# renderer canvas. Ukuran HTML dan waktu render tidak lagi naik dua objek per kota.
+
+POPUP_FIELD = re.compile(r"\{(\w+)\}")
+DEFAULT_ZOOM = 10
+
+
+class VectorPointLayer(Layer):
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            var data = {{ this.data|tojson }};
+            var style = {{ this.style|tojson }};
+            var renderer = L.canvas({padding: 0.5});
+            var group = L.featureGroup();
+            function popupFor(i) {
+                return function() {
+                    // Popup berupa teks biasa (textContent), nilai kolom tidak dibaca sebagai HTML
+                    var node = document.createElement("div");
+                    node.textContent = {{ this.popup|tojson }}.replace(/\\{(\\w+)\\}/g, function(_, key) {
+                        return data.fields[key][i];
+                    });
+                    return node;
+                };
+            }
+            for (var i = 0; i < data.lat.length; i++) {
+                var opts = Object.assign({renderer: renderer}, style);
+                var shape;
+                if ({{ this.kind|tojson }} === "circle") {
+                    shape = L.circle([data.lat[i], data.lng[i]], opts);
+                } else {
+                    opts.radius = data.radius[i];
+                    shape = L.circleMarker([data.lat[i], data.lng[i]], opts);
+                }
+                // Teks popup baru disusun di browser saat popup dibuka
+                shape.bindPopup(popupFor(i));
+                group.addLayer(shape);
+            }
+            return group;
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, frame, popup, radius=None, radius_scale=1.0, kind="circle_marker",
+                 lat="geolocation_lat", lng="geolocation_lng", name=None, **style):
+        super().__init__(name=name, overlay=True, control=True, show=True)
+        self._name = "VectorPointLayer"
+        self.kind = kind
+        self.popup = popup
+        self.style = style
+        # Koordinat dibulatkan 5 desimal (~1 m) agar payload JSON ringkas
+        self.data = {
+            "lat": np.round(frame[lat].to_numpy(dtype="float64"), 5).tolist(),
+            "lng": np.round(frame[lng].to_numpy(dtype="float64"), 5).tolist(),
+            "fields": {field: frame[field].tolist() for field in set(POPUP_FIELD.findall(popup))},
+        }
+        if kind == "circle_marker":
+            # Radius dalam piksel, proporsional terhadap kolom `radius`
+            self.data["radius"] = np.round(frame[radius].to_numpy(dtype="float64") * radius_scale, 2).tolist()
+        else:
+            # Radius tetap dalam meter untuk semua kota
+            self.style["radius"] = radius
+
+
+def render_count_map(frame, count_col, center, color, layer_name, popup, top_popup, top_color):
+    # Peta jumlah per kota: circle marker proporsional + marker bintang untuk kota teratas
+    m = folium.Map(location=center, zoom_start=5)
+    VectorPointLayer(
+        frame, popup=popup, radius=count_col, radius_scale=0.01,  # radius = jumlah / 100
+        color=color, fill=True, fillColor=color, fillOpacity=0.6, name=layer_name,
+    ).add_to(m)
+    folium.LayerControl().add_to(m)
+
+    top = frame.loc[frame[count_col].idxmax()]
+    folium.Marker(
+        location=[top["geolocation_lat"], top["geolocation_lng"]],
+        icon=folium.Icon(color=top_color, icon="star"),
+        popup=top_popup.format(**top),
+    ).add_to(m)
+    return m
+
+
+def render_area_map(frame, zoom, popup, center=None, cluster_popup=None, radius=5000):
+    # Peta area kota: satu circle (meter) per kota dengan info penjual/pembeli di popup.
+    # Jika frame berasal dari Analytics.city_map, baris dengan points > 1 adalah cluster beberapa
+    # kota dan digambar sebagai circle marker (piksel) yang membesar sesuai jumlah kotanya.
+    if center is None:
+        center = [frame["geolocation_lat"].mean(), frame["geolocation_lng"].mean()]
+    m = folium.Map(location=center, zoom_start=DEFAULT_ZOOM if zoom is None else zoom)
+    clustered = frame["points"] > 1 if "points" in frame else np.zeros(len(frame), dtype=bool)
+    if (~clustered).any():
+        VectorPointLayer(
+            frame[~clustered], popup=popup, kind="circle", radius=radius,
+            color="blue", fill=True, fillOpacity=0.1, name="Kota",
+        ).add_to(m)
+    if clustered.any():
+        clusters = frame[clustered].assign(marker_radius=lambda f: 6 + 3 * np.sqrt(f["points"]))
+        VectorPointLayer(
+            clusters, popup=cluster_popup or popup, radius="marker_radius",
+            color="blue", fill=True, fillOpacity=0.3, name="Kelompok kota",
+        ).add_to(m)
+    return m
+
+
+def map_html(m):
+    return m._repr_html_()
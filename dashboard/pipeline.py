@@ -0,0 +1,133 @@
+import argparse
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+
+from data_loader import (
+    CATEGORY_COLUMNS,
+    CSV_PATH,
+    ID_COLUMNS,
+    RAW_DIR,
+    SNAPSHOT_PATH,
+    ZIP_COLUMNS,
+    dataset_lock,
+    enrich_data,
+    optimize_dtypes,
+    publish_file,
+    raw_table_path,
+    source_fingerprint,
+    write_snapshot,
+)
+
+# Pipeline penggabungan tabel mentah di data/ menjadi main_data.csv (dan snapshot main_data.arrow).
+# Urutan join mengikuti relasi kunci di img/relasi_data.png:
+#   orders -customer_id-> customers -order_id-> order_items / order_payments / order_reviews
+#   -product_id-> products -> terjemahan kategori, -seller_id-> sellers,
+#   -customer_zip_code_prefix-> geolocation (sudah dideduplikasi: satu koordinat per kode pos).
+# Tanpa deduplikasi, setiap baris pesanan dikalikan dengan jumlah titik geolocation pada kode
+# pos pelanggan, sehingga tabel fakta membengkak berkali-kali lipat.
+
+
+def read_raw_table(name, raw_dir=RAW_DIR):
+    path = raw_table_path(name, raw_dir)
+    columns = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    dtypes = {col: "category" for col in CATEGORY_COLUMNS if col in columns}
+    dtypes.update({col: "str" for col in ZIP_COLUMNS if col in columns})
+    return pd.read_csv(path, dtype=dtypes, encoding="utf-8-sig")
+
+
+def dedupe_geolocation(geolocation):
+    # Satu baris per kode pos: rata-rata koordinat, kota/provinsi yang pertama muncul
+    return geolocation.groupby("geolocation_zip_code_prefix", as_index=False).agg(
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+        geolocation_city=("geolocation_city", "first"),
+        geolocation_state=("geolocation_state", "first"),
+    )
+
+
+# Tabel dimensi (dibaca utuh) dan tabel fakta pesanan (bisa berupa batch baru, lihat ingest.py)
+DIMENSION_TABLES = ["customers", "products", "category_translation", "sellers", "geolocation"]
+ORDER_TABLES = ["orders", "order_items", "order_payments", "order_reviews"]
+
+
+def join_tables(tables, geolocation, report):
+    # tables: nama tabel mentah -> DataFrame; geolocation sudah dideduplikasi per kode pos
+    joins = [
+        ("customers", tables["customers"], "customer_id", None, "inner"),
+        ("order_items", tables["order_items"], "order_id", None, "inner"),
+        ("order_payments", tables["order_payments"], "order_id", None, "left"),
+        ("order_reviews", tables["order_reviews"], "order_id", None, "left"),
+        ("products", tables["products"], "product_id", None, "left"),
+        ("category_translation", tables["category_translation"], "product_category_name", None, "left"),
+        ("sellers", tables["sellers"], "seller_id", None, "left"),
+        ("geolocation", geolocation, "customer_zip_code_prefix", "geolocation_zip_code_prefix", "left"),
+    ]
+    data = tables["orders"]
+    for name, right, left_on, right_on, how in joins:
+        start = time.perf_counter()
+        left_rows = len(data)
+        data = data.merge(right, how=how, left_on=left_on, right_on=right_on or left_on)
+        report.append({"step": f"join {name} on {left_on} ({how})", "left_rows": left_rows,
+                       "right_rows": len(right), "rows": len(data),
+                       "seconds": round(time.perf_counter() - start, 3)})
+
+    # Kolom kategori dari tabel berbeda bisa kembali menjadi object setelah merge; kolom ID
+    # sengaja baru dikodekan di sini karena join memakai nilai hex-nya
+    for col in CATEGORY_COLUMNS + ID_COLUMNS:
+        if col in data.columns and data[col].dtype != "category":
+            data[col] = data[col].astype("category")
+    return data
+
+
+def build_main_data(raw_dir=RAW_DIR, report=None):
+    # Kembalikan tabel fakta hasil join; `report` (list) diisi kardinalitas dan durasi setiap langkah
+    report = [] if report is None else report
+    tables = {}
+
+    def timed_read(name):
+        start = time.perf_counter()
+        tables[name] = read_raw_table(name, raw_dir)
+        report.append({"step": f"read {name}", "rows": len(tables[name]),
+                       "seconds": round(time.perf_counter() - start, 3)})
+        return tables[name]
+
+    for name in ORDER_TABLES + DIMENSION_TABLES:
+        timed_read(name)
+
+    start = time.perf_counter()
+    geolocation = dedupe_geolocation(tables["geolocation"])
+    report.append({"step": "dedupe geolocation", "rows": len(geolocation),
+                   "seconds": round(time.perf_counter() - start, 3)})
+    return join_tables(tables, geolocation, report)
+
+
+def write_main_data(data, csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    # Tulis CSV secara atomik (file sementara unik + rename), lalu snapshot Arrow dengan sidik jari CSV baru.
+    # Di dalam dataset_lock agar tidak bersilangan dengan penambahan batch (ingest.py) ke CSV yang sama
+    with dataset_lock(snapshot_path) if snapshot_path else nullcontext():
+        publish_file(csv_path, lambda tmp_path: data.to_csv(tmp_path, index=False))
+        if snapshot_path:
+            write_snapshot(enrich_data(optimize_dtypes(data)), source_fingerprint(csv_path), snapshot_path)
+
+
+def print_report(report):
+    for entry in report:
+        sizes = f"{entry['left_rows']:>9} x {entry['right_rows']:>9} -> " if "left_rows" in entry else " " * 26
+        print(f"{entry['step']:62s} {sizes}{entry['rows']:>9} baris  {entry['seconds']:7.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--raw-dir", default=RAW_DIR, help="folder tabel mentah (default: ../data)")
+    parser.add_argument("--out", default=CSV_PATH, help="path main_data.csv")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="path snapshot Arrow ('' untuk melewati)")
+    args = parser.parse_args()
+
+    report = []
+    data = build_main_data(args.raw_dir, report)
+    start = time.perf_counter()
+    write_main_data(data, args.out, args.snapshot)
+    report.append({"step": f"write {args.out}", "rows": len(data), "seconds": round(time.perf_counter() - start, 3)})
+    print_report(report)
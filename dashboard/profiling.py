@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+
+from data_loader import publish_file
+
+# Instrumentasi ringan untuk dashboard.py: span waktu per tahap (load, groupby, filter, figure, map)
+# dan ukuran payload (PNG/HTML) yang dikirim ke browser, dikumpulkan per sesi dan per halaman.
+# Profiling aktif jika environment variable DASHBOARD_PROFILE=1. Saat nonaktif, span() hanya
+# mengembalikan satu nullcontext bersama dan size() langsung kembali (tanpa alokasi/penguncian).
+# Ekspor: JSON dan format teks Prometheus (summary dengan quantile), ditambah memori proses.
+
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_DIR = os.environ.get("DASHBOARD_PROFILE_DIR", "profiles")
+MAX_SAMPLES = 1000  # sampel terakhir per (sesi, halaman, span)
+QUANTILES = [0.5, 0.9, 0.99]
+
+_NULL_SPAN = nullcontext()
+# Baris /proc/self/smaps_rollup (kB) -> nama di laporan memori
+SMAPS_FIELDS = {"Rss": "rss", "Pss": "pss", "Anonymous": "private"}
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+def process_memory(pid="self"):
+    # Memori proses dalam byte (Linux): rss total, pss (halaman bersama dibagi rata antar proses),
+    # private (anonim, milik proses ini saja), shared (halaman file, misalnya snapshot Arrow yang
+    # di-memory-map, yang bisa dipakai bersama proses lain). Dict kosong jika /proc tidak tersedia.
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+    memory = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in SMAPS_FIELDS:
+            memory[SMAPS_FIELDS[key]] = int(value.split()[0]) * 1024
+    if "rss" in memory and "private" in memory:
+        memory["shared"] = memory["rss"] - memory["private"]
+    return memory
+
+
+class Profiler:
+    def __init__(self, enabled=None, max_samples=MAX_SAMPLES):
+        self.enabled = profiling_enabled() if enabled is None else enabled
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._spans = {}  # (sesi, halaman, nama) -> deque durasi (detik)
+        self._sizes = {}  # (sesi, halaman, nama) -> deque ukuran payload (byte)
+
+    def span(self, session, page, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._timed(session, page, name)
+
+    @contextmanager
+    def _timed(self, session, page, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._append(self._spans, (session, page, name), time.perf_counter() - start)
+
+    def size(self, session, page, name, payload):
+        # Catat ukuran payload lalu kembalikan payload apa adanya (bisa dipakai inline)
+        if self.enabled:
+            self._append(self._sizes, (session, page, name), len(payload))
+        return payload
+
+    def _append(self, store, key, value):
+        with self._lock:
+            samples = store.get(key)
+            if samples is None:
+                samples = store[key] = deque(maxlen=self.max_samples)
+            samples.append(value)
+
+    def _grouped(self, store, session):
+        # Gabungkan sampel antar sesi (session=None) atau ambil milik satu sesi saja
+        with self._lock:
+            items = [(key, list(samples)) for key, samples in store.items()]
+        grouped = {}
+        for (sess, page, name), samples in items:
+            if session is None or sess == session:
+                grouped.setdefault((page, name), []).extend(samples)
+        return grouped
+
+    def summary(self, session=None, page=None):
+        rows = []
+        for kind, store in [("seconds", self._spans), ("bytes", self._sizes)]:
+            for (span_page, name), samples in sorted(self._grouped(store, session).items()):
+                if page is not None and span_page != page:
+                    continue
+                values = np.asarray(samples, dtype="float64")
+                row = {"page": span_page, "span": name, "unit": kind, "count": len(values),
+                       "sum": float(values.sum())}
+                for q, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                    row[f"p{round(q * 100)}"] = float(value)
+                rows.append(row)
+        return pd.DataFrame(rows, columns=["page", "span", "unit", "count", "sum"]
+                            + [f"p{round(q * 100)}" for q in QUANTILES])
+
+    def to_json(self, session=None):
+        return json.dumps({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "pid": os.getpid(),
+                           "memory": process_memory(),
+                           "spans": self.summary(session).to_dict(orient="records")}, indent=1)
+
+    def to_prometheus(self, session=None):
+        metrics = {"seconds": "dashboard_span_seconds", "bytes": "dashboard_payload_bytes"}
+        lines = []
+        summary = self.summary(session)
+        for unit, metric in metrics.items():
+            rows = summary[summary["unit"] == unit]
+            lines.append(f"# TYPE {metric} summary")
+            for row in rows.to_dict(orient="records"):
+                labels = f'page="{_escape(row["page"])}",span="{_escape(row["span"])}"'
+                for q in QUANTILES:
+                    lines.append(f'{metric}{{{labels},quantile="{q}"}} {row[f"p{round(q * 100)}"]}')
+                lines.append(f'{metric}_sum{{{labels}}} {row["sum"]}')
+                lines.append(f'{metric}_count{{{labels}}} {row["count"]}')
+        lines.append("# TYPE dashboard_process_memory_bytes gauge")
+        for kind, value in process_memory().items():
+            lines.append(f'dashboard_process_memory_bytes{{pid="{os.getpid()}",kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory=PROFILE_DIR):
+        # Tulis profile.json dan profile.prom (semua sesi) secara atomik
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, content in [("profile.json", self.to_json()), ("profile.prom", self.to_prometheus())]:
+            path = os.path.join(directory, name)
+            publish_file(path, lambda tmp_path: _write_text(tmp_path, content))
+            paths.append(path)
+        return paths
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._sizes.clear()
+
+
+def _write_text(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,101 @@
+import threading
+import time
+import traceback
+
+from analytics import Analytics
+from data_loader import dataset_version, load_main_data, main_data_available
+from streaming import load_summaries, summaries_version
+from warmup import warm_analytics
+
+# Hot reload dataset tanpa restart aplikasi.
+# Versi dataset = sidik jari main_data.csv (ukuran + mtime, lihat data_loader.dataset_version) atau
+# versi di manifest ringkasan streaming.py. Versi dicek paling sering sekali per CHECK_INTERVAL detik;
+# jika berubah, snapshot Arrow dan Analytics baru (agregat + indeks, lewat warmup.py) dibangun di
+# thread latar belakang sementara versi lama tetap melayani semua sesi. Setelah selesai, referensi
+# ditukar secara atomik. Cache lain (figure, peta, respons API) memakai versi sebagai bagian kunci,
+# jadi entri versi lama cukup dibuang lewat evict_version / retain_version.
+
+CHECK_INTERVAL = 30
+
+
+def current_version():
+    if main_data_available():
+        return dataset_version()
+    return summaries_version()
+
+
+def load_analytics():
+    # Muat data seperti dashboard.py: main_data (snapshot Arrow) atau ringkasan streaming.py
+    if main_data_available():
+        # Versi dibaca sebelum data dimuat: jika file berubah di tengah pemuatan, data diberi versi
+        # lama sehingga pengecekan berikutnya memuat ulang (bukan data lama dengan versi baru)
+        version = dataset_version()
+        data = load_main_data()
+        analytics, _ = warm_analytics(data, version)
+        return analytics
+    summaries = load_summaries()
+    return Analytics(None, summaries, summaries["version"])
+
+
+class DatasetReloader:
+    def __init__(self, load=load_analytics, check_version=current_version, interval=CHECK_INTERVAL):
+        self._load = load
+        self._check_version = check_version
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._rebuild = None
+        self._checked_at = time.monotonic()
+        self.last_error = None
+        self.swaps = 0
+        self._analytics = load()  # muatan pertama sinkron
+
+    @property
+    def version(self):
+        return self._analytics.version
+
+    @property
+    def rebuilding(self):
+        return self._rebuild is not None and self._rebuild.is_alive()
+
+    def on_swap(self, listener):
+        # listener(versi_lama, versi_baru) dipanggil setelah penukaran (misalnya untuk evict cache)
+        self._listeners.append(listener)
+
+    def current(self):
+        # Analytics yang aktif; sekalian cek versi file jika interval sudah lewat
+        now = time.monotonic()
+        if now - self._checked_at >= self.interval:
+            self._checked_at = now
+            self.check()
+        return self._analytics
+
+    def check(self):
+        # Mulai rebuild di latar belakang jika versi di disk berbeda dari versi yang aktif
+        version = self._check_version()
+        with self._lock:
+            if version is None or version == self._analytics.version or self.rebuilding:
+                return False
+            self._rebuild = threading.Thread(target=self._run_rebuild, name="dataset-rebuild", daemon=True)
+            self._rebuild.start()
+            return True
+
+    def _run_rebuild(self):
+        try:
+            analytics = self._load()
+        except Exception:
+            # Versi lama tetap dipakai; dicoba lagi pada pengecekan berikutnya
+            self.last_error = traceback.format_exc()
+            return
+        with self._lock:
+            old_version = self._analytics.version
+            self._analytics = analytics
+            self.swaps += 1
+            self.last_error = None
+        for listener in self._listeners:
+            listener(old_version, analytics.version)
+
+    def wait(self, timeout=None):
+        # Tunggu rebuild yang sedang berjalan (untuk skrip/pengujian)
+        if self._rebuild is not None:
+            self._rebuild.join(timeout)
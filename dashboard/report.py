@@ -0,0 +1,516 @@
+import argparse
+import datetime
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data_loader import decode_ids
+from figure_cache import figure_to_png, normalize_filters
+from reloader import load_analytics
+
+# Mode laporan: merender semua bagian halaman dashboard untuk daftar preset filter langsung ke file
+# statis, tanpa membuka aplikasi. Chart matplotlib/seaborn -> PNG, peta Folium dan chart Plotly
+# (RFM) -> HTML, tabel hasil filter -> Parquet, ditambah satu halaman HTML per preset dan index.
+# Dataset dimuat dan di-warm-up sekali (reloader.load_analytics, sama seperti dashboard.py), lalu
+# indeks yang dibangun saat dibutuhkan (indeks waktu, kode pos, geospasial, RFM) disiapkan sebelum
+# worker dibuat. Worker adalah proses fork yang mewarisi Analytics tersebut: agregat dibagi
+# copy-on-write dan tabel fakta tetap memory-map, jadi tidak ada yang dimuat ulang atau di-pickle
+# per preset. Bagian dengan nilai filter yang sama di beberapa preset dirender sekali (kunci seperti
+# FigureCache: id bagian + nilai filter yang dinormalisasi). Tanpa fork (Windows) bagian dirender
+# berurutan di proses ini.
+#
+# File preset: list JSON berisi {"name": ..., "pages": [...] (opsional, default semua halaman),
+# "filters": {...} (opsional)}. Filter yang tidak diisi memakai nilai awal widget dashboard
+# (lihat default_filters). Jalankan dari folder dashboard/:
+#   python report.py report_presets.json --out reports [--workers 4]
+
+REPORT_DIR = "reports"
+SECTIONS_DIR = "sections"
+PLOTLY_JS = "plotly.min.js"
+PAGES = ["Customer Behaviour", "Seller Peformances", "Geolocation Map", "RFM Analysis", "Data"]
+ALL_SHIPMENTS = "Semua pengiriman"
+TABLE_ROWS = 20  # baris tabel yang ditampilkan di halaman preset; isi lengkap ada di file Parquet
+REQUIREMENTS = {
+    "raw": "Bagian ini membutuhkan main_data.csv (laporan dibuat dari ringkasan streaming.py).",
+    "delivery": "Statistik keterlambatan pengiriman belum tersedia. Jalankan ulang streaming.py.",
+}
+
+_analytics = None  # Analytics yang dirender; diwarisi proses worker lewat fork
+
+
+def _int_range(values):
+    return [int(value) for value in values]
+
+
+def default_filters(info):
+    # Nilai awal widget di dashboard.py untuk setiap filter preset
+    ranges = info["ranges"]
+    months = info.get("delivery_months") or [None]
+    filters = {
+        "customer_count": _int_range(ranges["customer_count"]),
+        "purchase_frequency": _int_range(ranges["purchase_frequency"]),
+        "review_scores": info["review_scores"],
+        "payment_types": info["payment_types"],
+        "penjualan": _int_range(ranges["penjualan"]),
+        "delivery_time_actual": _int_range(ranges["delivery_time_actual"]),
+        "seller_count": _int_range(ranges["seller_count"]),
+        "delivery_dimension": "seller",
+        "delivery_months": [months[0], months[-1]],
+        "delivery_min_count": 5,
+        "delivery_trend": ALL_SHIPMENTS,
+        "heatmap_metric": "late_rate",
+        "heatmap_months": [months[0], months[-1]],
+        "heatmap_min_count": 10,
+        "purchase_date": ranges.get("purchase_date"),
+        "price": ranges.get("price"),
+        "min_sellers": 0,
+        "min_customers": 0,
+        "map_zoom": 10,
+        "center_city": None,
+        "rfm_dates": ranges.get("purchase_date"),
+        "rfm_group": "All",
+        "rfm_monetary_bin": "All",
+        "data_column": "payment_type",
+        "data_value": "Semua",
+        "data_tail": False,
+    }
+    return filters
+
+
+def _dates(values):
+    return [datetime.date.fromisoformat(value) for value in values]
+
+
+# --- Bagian halaman: fungsi build(analytics, info, filter) -> {nama artefak: hasil atau None} ---
+# Sama dengan bagian bernomor di dashboard.py; None berarti tidak ada data untuk filter tersebut.
+
+def _customer_map(analytics, info, f):
+    from map_render import render_count_map
+
+    cities = analytics.city_distribution(kind="customer", min_count=f["customer_count"][0], max_count=f["customer_count"][1])
+    if cities.empty:
+        return {"customer_count": None}
+    return {"customer_count": render_count_map(
+        cities, "customer_count", info["map_center"], color="blue", layer_name="Pelanggan",
+        popup="{customer_city}: {customer_count} pelanggan",
+        top_popup="Top Pelanggan: {customer_city} ({customer_count})", top_color="red")}
+
+
+def _purchase_frequency(analytics, info, f):
+    import charts
+
+    low, high = f["purchase_frequency"]
+    return {"purchase_frequency_hist": charts.purchase_frequency_hist(
+        analytics.purchase_frequency(min_purchases=low, max_purchases=high))}
+
+
+def _review_score(analytics, info, f):
+    import charts
+
+    counts = analytics.review_mix(scores=f["review_scores"])
+    return {"review_score_pie": None if counts.empty else charts.review_score_pie(counts)}
+
+
+def _payment_type(analytics, info, f):
+    import charts
+
+    counts = analytics.payment_mix(payment_types=f["payment_types"])
+    return {"payment_type_pie": None if counts.empty else charts.payment_type_pie(counts)}
+
+
+def _top_sellers(analytics, info, f):
+    import charts
+
+    low, high = f["penjualan"]
+    return {"top_sellers_bar": charts.top_sellers_bar(analytics.seller_ranking(min_sales=low, max_sales=high, top=10))}
+
+
+def _delivery_time(analytics, info, f):
+    import charts
+
+    low, high = f["delivery_time_actual"]
+    return {"delivery_time_boxplot": charts.delivery_time_boxplot(analytics.seller_delivery(min_days=low, max_days=high))}
+
+
+def _seller_map(analytics, info, f):
+    from map_render import render_count_map
+
+    cities = analytics.city_distribution(kind="seller", min_count=f["seller_count"][0], max_count=f["seller_count"][1])
+    if cities.empty:
+        return {"seller_count": None}
+    return {"seller_count": render_count_map(
+        cities, "seller_count", info["map_center"], color="red", layer_name="Penjual",
+        popup="{seller_city}: {seller_count} penjual",
+        top_popup="Top Penjual: {seller_city} ({seller_count})", top_color="blue")}
+
+
+def _delivery_sla(analytics, info, f):
+    import charts
+
+    start_date, end_date = _dates(f["delivery_months"])
+    dimension = f["delivery_dimension"]
+    sla = analytics.delivery_sla(dimension=dimension, start_date=start_date, end_date=end_date,
+                                 min_count=f["delivery_min_count"])
+    if f["delivery_trend"] == ALL_SHIPMENTS:
+        monthly = analytics.delivery_monthly()
+    else:
+        monthly = analytics.delivery_monthly(dimension=dimension, key=f["delivery_trend"])
+    return {"delivery_sla": None if sla.empty else sla,
+            "late_rate_line": charts.late_rate_line(monthly, f"Keterlambatan Bulanan: {f['delivery_trend']}")}
+
+
+def _route_heatmap(analytics, info, f):
+    import charts
+
+    metrics = {"late_rate": "Tingkat Keterlambatan", "p50": "Median Waktu Pengiriman (hari)",
+               "p90": "p90 Waktu Pengiriman (hari)"}
+    if f["heatmap_metric"] not in metrics:
+        raise ValueError(f"heatmap_metric harus salah satu dari {list(metrics)}, bukan {f['heatmap_metric']!r}")
+    start_date, end_date = _dates(f["heatmap_months"])
+    routes = analytics.route_heatmap(start_date=start_date, end_date=end_date, min_count=f["heatmap_min_count"])
+    if routes.empty:
+        return {"route_heatmap": None}
+    return {"route_heatmap": charts.route_heatmap(routes, f["heatmap_metric"], metrics[f["heatmap_metric"]])}
+
+
+def _delivery_comparison(analytics, info, f):
+    import charts
+
+    start_date, end_date = _dates(f["purchase_date"])
+    stats = analytics.delivery_stats(start_date=start_date, end_date=end_date)
+    if not stats["rows"]:
+        return {"delivery_comparison_bar": None}
+    return {"delivery_comparison_bar": charts.delivery_comparison_bar(stats["avg_actual"], stats["avg_estimated"])}
+
+
+def _price(analytics, info, f):
+    import charts
+
+    low, high = f["price"]
+    return {"price_hist": charts.price_hist(analytics.prices(min_price=low, max_price=high))}
+
+
+def _delivery_distance(analytics, info, f):
+    import charts
+
+    distance = analytics.delivery_distance()
+    return {"delivery_distance": distance, "delivery_distance_bar": charts.delivery_distance_bar(distance)}
+
+
+def _geolocation(analytics, info, f):
+    from map_render import render_area_map
+
+    cities = analytics.geolocation_cities(min_sellers=f["min_sellers"], min_customers=f["min_customers"])
+    if cities.empty:
+        return {"geolocation_cities": None, "city_area": None}
+    center_rows = cities if f["center_city"] is None else cities[cities["geolocation_city"] == f["center_city"]]
+    if center_rows.empty:
+        raise ValueError(f"center_city tidak memenuhi kriteria: {f['center_city']!r}")
+    center = [float(center_rows["geolocation_lat"].mean()), float(center_rows["geolocation_lng"].mean())]
+    points = analytics.city_map(min_sellers=f["min_sellers"], min_customers=f["min_customers"],
+                                zoom=f["map_zoom"], lat=center[0], lng=center[1])
+    return {"geolocation_cities": cities, "city_area": render_area_map(
+        points, f["map_zoom"], center=center,
+        popup="Area {geolocation_city}: {seller_count} penjual, {customer_count} pembeli",
+        cluster_popup="{geolocation_city}: {seller_count} penjual, {customer_count} pembeli")}
+
+
+def _rfm(analytics, info, f):
+    import rfm_charts
+
+    start_date, end_date = _dates(f["rfm_dates"])
+    rfm = analytics.rfm(start_date=start_date, end_date=end_date, group=f["rfm_group"], monetary_bin=f["rfm_monetary_bin"])
+    if rfm.empty:
+        return {"rfm": None}
+    data = rfm_charts.rfm_chart_data(rfm)
+    histograms = data["histograms"]
+    return {
+        "rfm": rfm,
+        "recency_hist": rfm_charts.histogram_figure(histograms["Recency"], "Recency", "Distribusi Recency", "skyblue"),
+        "frequency_hist": rfm_charts.histogram_figure(histograms["Frequency"], "Frequency", "Distribusi Frequency", "salmon"),
+        "monetary_hist": rfm_charts.histogram_figure(histograms["Monetary"], "Monetary", "Distribusi Monetary", "lightgreen"),
+        "frequency_monetary_scatter": rfm_charts.scatter_figure(data["scatter"], "Hubungan antara Frequency dan Monetary"),
+        "group_monetary_box": rfm_charts.box_figure(
+            data["box"], "Perbandingan Total Pengeluaran berdasarkan Kelompok Transaksi"),
+        "monetary_bin_bar": rfm_charts.monetary_bin_figure(
+            data["monetary_bins"], title="Distribusi Pelanggan Berdasarkan Total Pengeluaran (Binning)",
+            labels={"index": "Kategori Total Pengeluaran", "value": "Jumlah Pelanggan"}),
+    }
+
+
+def _data_preview(analytics, info, f):
+    column, value = f["data_column"], f["data_value"]
+    if column == "price" and value not in ("Tertinggi", "Terendah"):
+        raise ValueError(f"data_value untuk price harus 'Tertinggi' atau 'Terendah', bukan {value!r}")
+    preview = analytics.data_preview(
+        column=None if value == "Semua" else column,
+        value=None if column == "price" else value,
+        descending=value == "Tertinggi",
+        tail=f["data_tail"],
+        rows=80,
+    )
+    return {"data_preview": preview}
+
+
+# Id bagian -> (halaman, judul, filter yang dipakai, kebutuhan data, build)
+SECTIONS = {
+    "customer_distribution": ("Customer Behaviour", "Distribusi Customer", ["customer_count"], None, _customer_map),
+    "purchase_frequency": ("Customer Behaviour", "Frekuensi Pembelian per Customer", ["purchase_frequency"], None,
+                           _purchase_frequency),
+    "review_score": ("Customer Behaviour", "Distribusi Skor Review", ["review_scores"], None, _review_score),
+    "payment_type": ("Customer Behaviour", "Metode Pembayaran Terpopuler", ["payment_types"], None, _payment_type),
+    "top_sellers": ("Seller Peformances", "Top 10 Seller dengan Penjualan Tertinggi", ["penjualan"], None, _top_sellers),
+    "delivery_time": ("Seller Peformances", "Distribusi Rata-rata Waktu Pengiriman per Seller", ["delivery_time_actual"],
+                      None, _delivery_time),
+    "seller_distribution": ("Seller Peformances", "Distribusi Seller per Provinsi", ["seller_count"], None, _seller_map),
+    "delivery_sla": ("Seller Peformances", "Keterlambatan Pengiriman per Seller dan Rute",
+                     ["delivery_dimension", "delivery_months", "delivery_min_count", "delivery_trend"], "delivery",
+                     _delivery_sla),
+    "route_heatmap": ("Seller Peformances", "Heatmap Rute Pengiriman",
+                      ["heatmap_metric", "heatmap_months", "heatmap_min_count"], "delivery", _route_heatmap),
+    "delivery_comparison": ("Seller Peformances", "Rata-rata Waktu Pengiriman (Actual vs Estimated)", ["purchase_date"],
+                            "raw", _delivery_comparison),
+    "price": ("Seller Peformances", "Distribusi Harga Produk", ["price"], "raw", _price),
+    "delivery_distance": ("Seller Peformances", "Waktu Pengiriman per Jarak Seller - Pelanggan", [], "raw",
+                          _delivery_distance),
+    "geolocation": ("Geolocation Map", "Map Filter By Geolocation City",
+                    ["min_sellers", "min_customers", "map_zoom", "center_city"], None, _geolocation),
+    "rfm": ("RFM Analysis", "Understanding Customer Loyalty", ["rfm_dates", "rfm_group", "rfm_monetary_bin"], "raw", _rfm),
+    "data_preview": ("Data", "Preview Data", ["data_column", "data_value", "data_tail"], "raw", _data_preview),
+}
+
+
+def _available(requires, info):
+    if requires == "raw":
+        return info["has_raw_data"]
+    if requires == "delivery":
+        return bool(info.get("delivery_months"))
+    return True
+
+
+def write_artifact(result, base):
+    # Simpan satu hasil build; ekstensi mengikuti jenisnya. Kembalikan path file.
+    if isinstance(result, pd.DataFrame):
+        path = f"{base}.parquet"
+        decode_ids(result).to_parquet(path, index=False)
+    elif hasattr(result, "savefig"):  # figure matplotlib/seaborn (charts.py)
+        path = f"{base}.png"
+        with open(path, "wb") as f:
+            f.write(figure_to_png(result))
+    elif hasattr(result, "get_root"):  # peta Folium (map_render.py)
+        path = f"{base}.html"
+        result.save(path)
+    else:  # figure Plotly (rfm_charts.py); plotly.js ditulis sekali di folder yang sama
+        path = f"{base}.html"
+        result.write_html(path, include_plotlyjs=PLOTLY_JS)
+    return path
+
+
+def render_job(job):
+    # Dijalankan di worker: (kunci tugas, nilai filter, path dasar) -> (kunci, {artefak: path}, detik)
+    key, values, base = job
+    start = time.perf_counter()
+    _, _, names, _, build = SECTIONS[key[0]]
+    results = build(_analytics, _analytics.info(), dict(zip(names, values)))
+    files = {name: None if result is None else write_artifact(result, f"{base}-{name}")
+             for name, result in results.items()}
+    return key, files, time.perf_counter() - start
+
+
+def prepare(analytics, sections):
+    # Impor modul berat dan bangun indeks yang dibutuhkan bagian-bagian ini sekali di proses utama,
+    # sebelum fork, sehingga tidak diulang di setiap worker
+    import charts  # noqa: F401
+
+    if sections & {"customer_distribution", "seller_distribution", "geolocation"}:
+        import map_render  # noqa: F401
+    if "geolocation" in sections:
+        analytics.geo_index
+    if "delivery_comparison" in sections:
+        analytics.time_index
+    if "delivery_distance" in sections:
+        analytics.seller_distance()
+    if "rfm" in sections:
+        import plotly.graph_objects  # noqa: F401
+
+        analytics.rfm_engine
+    if "data_preview" in sections:
+        analytics.column_index
+
+
+def render_parallel(jobs, workers):
+    # Hasil render_job untuk setiap tugas, sesuai urutan selesai
+    if workers > 1 and len(jobs) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        # fork: worker mewarisi _analytics tanpa pickle; proses CLI ini belum memiliki thread lain
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for future in as_completed([pool.submit(render_job, job) for job in jobs]):
+                yield future.result()
+    else:
+        for job in jobs:
+            yield render_job(job)
+
+
+def read_presets(path):
+    with open(path) as f:
+        presets = json.load(f)
+    if not isinstance(presets, list):
+        raise ValueError("file preset harus berisi list JSON")
+    return presets
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9_]+", "-", name).strip("-").lower() or "preset"
+
+
+def plan_report(presets, info):
+    # Preset -> (rencana per preset, tugas unik). Rencana: [(halaman, id bagian, kunci tugas atau
+    # alasan dilewati)]; kunci tugas = (id bagian, nilai filter yang dinormalisasi)
+    defaults = default_filters(info)
+    plans, jobs, slugs = [], {}, set()
+    for preset in presets:
+        name = preset.get("name")
+        if not name:
+            raise ValueError("setiap preset membutuhkan 'name'")
+        slug = _slug(name)
+        if slug in slugs:
+            raise ValueError(f"nama preset ganda: {name!r}")
+        slugs.add(slug)
+        unknown = set(preset.get("filters", {})) - set(defaults)
+        if unknown:
+            raise ValueError(f"filter tidak dikenal di preset {name!r}: {sorted(unknown)}")
+        pages = preset.get("pages", PAGES)
+        unknown = set(pages) - set(PAGES)
+        if unknown:
+            raise ValueError(f"halaman tidak dikenal di preset {name!r}: {sorted(unknown)}")
+        filters = {**defaults, **preset.get("filters", {})}
+
+        sections = []
+        for section, (page, _, keys, requires, _) in SECTIONS.items():
+            if page not in pages:
+                continue
+            if not _available(requires, info):
+                sections.append((page, section, REQUIREMENTS[requires]))
+                continue
+            values = [filters[key] for key in keys]
+            key = (section, normalize_filters(values))
+            jobs.setdefault(key, values)
+            sections.append((page, section, key))
+        plans.append({"name": name, "slug": slug, "filters": filters, "sections": sections})
+    return plans, jobs
+
+
+def _artifact_html(out_dir, name, path):
+    src = html.escape(path)
+    if path.endswith(".png"):
+        return f'<img src="{src}" alt="{html.escape(name)}" style="max-width:100%">'
+    if path.endswith(".html"):
+        return f'<iframe src="{src}" width="100%" height="520" style="border:0"></iframe>'
+    table = pd.read_parquet(os.path.join(out_dir, path))
+    return (table.head(TABLE_ROWS).to_html(index=False, float_format="{:.2f}".format, border=0)
+            + f'<p><a href="{src}">{html.escape(name)}.parquet</a> ({len(table)} baris)</p>')
+
+
+def write_preset_page(out_dir, plan, files):
+    parts = [f"<h1>{html.escape(plan['name'])}</h1>", '<p><a href="index.html">Semua preset</a></p>']
+    current_page = None
+    for page, section, key in plan["sections"]:
+        if page != current_page:
+            parts.append(f"<h2>{html.escape(page)}</h2>")
+            current_page = page
+        parts.append(f"<h3>{html.escape(SECTIONS[section][1])}</h3>")
+        if isinstance(key, str):
+            parts.append(f"<p>{html.escape(key)}</p>")
+            continue
+        for name, path in files[key].items():
+            parts.append(_artifact_html(out_dir, name, path) if path else "<p>Tidak ada data yang sesuai dengan filter.</p>")
+    parts.append(f"<details><summary>Filter</summary><pre>{html.escape(json.dumps(plan['filters'], indent=2, default=str))}</pre></details>")
+    _write_html(os.path.join(out_dir, f"{plan['slug']}.html"), plan["name"], parts)
+
+
+def _write_html(path, title, parts):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+                f'<body style="font-family:sans-serif;max-width:1100px;margin:auto">\n' + "\n".join(parts) + "\n</body></html>\n")
+
+
+def run_report(analytics, presets, out_dir=REPORT_DIR, workers=None):
+    # Render semua preset ke out_dir (file per bagian di sections/, satu HTML per preset, index.html,
+    # manifest.json); kembalikan manifest beserta statistik durasi
+    global _analytics
+    start = time.perf_counter()
+    info = analytics.info()
+    plans, jobs = plan_report(presets, info)
+    sections_dir = os.path.join(out_dir, SECTIONS_DIR)
+    os.makedirs(sections_dir, exist_ok=True)
+
+    needed = {section for section, _ in jobs}
+    prepare(analytics, needed)
+    if "rfm" in needed:
+        from plotly.offline import get_plotlyjs
+
+        with open(os.path.join(sections_dir, PLOTLY_JS), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    _analytics = analytics
+    prepare_seconds = time.perf_counter() - start
+
+    # Nama file = id bagian + hash nilai filter, sehingga stabil antar laporan
+    tasks = [(key, values, os.path.join(sections_dir, f"{key[0]}-{hashlib.sha1(repr(key[1]).encode()).hexdigest()[:10]}"))
+             for key, values in jobs.items()]
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    files, seconds = {}, {}
+    for key, artifacts, task_seconds in render_parallel(tasks, workers):
+        files[key] = {name: None if path is None else os.path.relpath(path, out_dir) for name, path in artifacts.items()}
+        seconds[key[0]] = seconds.get(key[0], 0.0) + task_seconds
+    render_seconds = time.perf_counter() - start - prepare_seconds
+
+    for plan in plans:
+        write_preset_page(out_dir, plan, files)
+    links = [f'<li><a href="{plan["slug"]}.html">{html.escape(plan["name"])}</a></li>' for plan in plans]
+    _write_html(os.path.join(out_dir, "index.html"), "Laporan Dashboard",
+                [f"<h1>Laporan Dashboard</h1><p>Versi dataset {html.escape(str(info['version']))}</p>",
+                 "<ul>", *links, "</ul>"])
+
+    manifest = {
+        "version": info["version"],
+        "presets": {plan["name"]: {
+            "page": f"{plan['slug']}.html",
+            "sections": {section: key if isinstance(key, str) else files[key] for _, section, key in plan["sections"]},
+        } for plan in plans},
+        "stats": {
+            "presets": len(plans),
+            "sections": sum(len(plan["sections"]) for plan in plans),
+            "rendered": len(tasks),
+            "workers": workers,
+            "prepare_seconds": round(prepare_seconds, 3),
+            "render_seconds": round(render_seconds, 3),
+            "total_seconds": round(time.perf_counter() - start, 3),
+            "section_seconds": {section: round(value, 3) for section, value in sorted(seconds.items())},
+        },
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("presets", help="file JSON: list preset {name, pages, filters}")
+    parser.add_argument("--out", default=REPORT_DIR, help="folder output laporan (default: reports)")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses render (default: jumlah CPU)")
+    args = parser.parse_args()
+
+    presets = read_presets(args.presets)
+    start = time.perf_counter()
+    analytics = load_analytics()
+    print(f"Dataset versi {analytics.version} dimuat dalam {time.perf_counter() - start:.2f}s")
+    stats = run_report(analytics, presets, args.out, args.workers)["stats"]
+    print(f"{stats['presets']} preset, {stats['sections']} bagian, {stats['rendered']} dirender "
+          f"({stats['workers']} worker) dalam {stats['total_seconds']:.2f}s -> {os.path.join(args.out, 'index.html')}")
@@ -0,0 +1,201 @@
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+from growable import GrowableArray
+from time_index import TimeIndex
+
+# Mesin RFM (Recency, Frequency, Monetary) untuk halaman "RFM Analysis".
+# Data transaksi (sudah terurut berdasarkan waktu pembelian, lihat time_index.py) disimpan sekali
+# sebagai array numpy (kode customer int32, timestamp int64 ns, payment_value float64). Rentang
+# tanggal menjadi dua binary search, dan agregasi per customer memakai np.bincount /
+# np.maximum.at tanpa lambda Python.
+# Jika rentang tanggal hanya bergeser, hanya potongan yang masuk/keluar jendela yang dihitung ulang.
+# Batch baru (ingest.py) ditambahkan lewat appended() dengan biaya sebanding jumlah baris batch:
+# array disimpan di GrowableArray, dan kode customer dicari di beberapa lapisan pd.Index yang
+# masing-masing mencakup rentang kode berurutan. Lapisan baru digabung dengan lapisan sebelumnya
+# jika ukurannya sudah menyamai (seperti penjumlahan biner), sehingga jumlah lapisan O(log n) dan
+# setiap customer ikut di-hash ulang O(log n) kali. Lapisan tidak pernah diubah setelah dibuat.
+
+NS_PER_DAY = 86_400 * 10**9
+
+# Kelompok transaksi: Frequency <= 2 -> Low, <= 5 -> Medium, selebihnya High
+GROUP_EDGES = np.array([2, 5])
+GROUP_LABELS = ["Low", "Medium", "High"]
+
+# Binning total pengeluaran (Monetary)
+MONETARY_BINS = [0, 100, 500, 1000, 5000, np.inf]
+MONETARY_LABELS = ['<100', '100-500', '500-1000', '1000-5000', '>5000']
+
+
+def transaction_group(frequency):
+    codes = np.searchsorted(GROUP_EDGES, frequency, side="left")
+    return pd.Categorical.from_codes(codes, categories=GROUP_LABELS)
+
+
+def monetary_bin(monetary):
+    return pd.cut(monetary, bins=MONETARY_BINS, labels=MONETARY_LABELS, include_lowest=True)
+
+
+class RFMEngine:
+    def __init__(self, data, time_index=None):
+        if time_index is None:
+            # Data belum terurut (misalnya data sintetis di benchmark): urutkan dulu berdasarkan waktu
+            data = data.sort_values("order_purchase_timestamp", kind="stable", na_position="last", ignore_index=True)
+            time_index = TimeIndex(data)
+        n_valid = time_index.n_valid  # baris dengan timestamp NaT ada di akhir dan tidak ikut dihitung
+
+        self.time_index = time_index
+        # customer_unique_id bertipe kategori (data_loader.ID_COLUMNS): factorize memakai kode kategorinya
+        codes, self.customers = pd.factorize(data["customer_unique_id"].iloc[:n_valid], sort=True)
+        self.codes = codes.astype("int32")
+        self.ts = time_index.epoch
+        self.values = np.nan_to_num(data["payment_value"].to_numpy(dtype="float64")[:n_valid])
+        self.n_customers = len(self.customers)
+
+        self._lock = threading.Lock()
+        self._bounds = None
+        self._count = None
+        self._sum = None
+        self._last = None
+        self._result = None  # frame terakhir; dipakai ulang jika jendela tidak berubah
+        self._buffers = None  # GrowableArray codes/values/customers untuk appended()
+        self._layers = None  # [(kode awal, pd.Index customer)] untuk appended()
+
+    def __getstate__(self):
+        # Untuk dikirim dari proses worker (warmup.py): tanpa lock dan tanpa state jendela inkremental
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state.update(_bounds=None, _count=None, _sum=None, _last=None, _result=None, _buffers=None, _layers=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def appended(self, data, time_index):
+        # Mesin baru untuk data lama + baris `data` di akhir (ingest.py); time_index sudah mencakup
+        # baris baru (TimeIndex.appended). Hanya baris baru yang dikodekan; mesin lama tidak diubah
+        # (buffer dan lapisan yang dibuat di sini hanya disimpan di mesin baru).
+        buffers = self._buffers
+        if buffers is None:
+            buffers = {"codes": GrowableArray(self.codes), "values": GrowableArray(self.values),
+                       "customers": GrowableArray(np.asarray(self.customers, dtype=object))}
+        layers = self._layers
+        if layers is None:
+            layers = [(0, pd.Index(buffers["customers"].view(self.n_customers), dtype=object))]
+
+        customers = data["customer_unique_id"].to_numpy(dtype=object)
+        codes = np.full(len(customers), -1, dtype="int64")
+        for first, index in layers:
+            found = index.get_indexer(customers)
+            hit = (codes < 0) & (found >= 0)
+            codes[hit] = first + found[hit]
+        new = codes < 0
+        new_codes, new_customers = pd.factorize(customers[new], sort=False)
+        codes[new] = self.n_customers + new_codes
+        n_customers = self.n_customers + len(new_customers)
+
+        engine = copy.copy(self)  # lewat __getstate__: tanpa state jendela, dengan lock baru
+        n_rows = len(self.codes)
+        engine._buffers = {
+            "codes": buffers["codes"].extended(n_rows, codes),
+            "values": buffers["values"].extended(n_rows, np.nan_to_num(data["payment_value"].to_numpy(dtype="float64"))),
+            "customers": buffers["customers"].extended(self.n_customers, np.asarray(new_customers, dtype=object)),
+        }
+        engine.codes = engine._buffers["codes"].view(n_rows + len(data))
+        engine.values = engine._buffers["values"].view(n_rows + len(data))
+        engine.customers = engine._buffers["customers"].view(n_customers)
+        engine.n_customers = n_customers
+        engine.time_index = time_index
+        engine.ts = time_index.epoch
+
+        layers = list(layers)
+        if len(new_customers):
+            layers.append((self.n_customers, pd.Index(engine.customers[self.n_customers:], dtype=object)))
+        while len(layers) > 1 and len(layers[-1][1]) >= len(layers[-2][1]):
+            first = layers[-2][0]
+            layers[-2:] = [(first, pd.Index(engine.customers[first:], dtype=object))]
+        engine._layers = layers
+        return engine
+
+    @property
+    def min_timestamp(self):
+        return self.time_index.min_timestamp
+
+    @property
+    def max_timestamp(self):
+        return self.time_index.max_timestamp
+
+    def compute(self, start, end):
+        # Rentang tanggal penuh seperti filter tanggal halaman lain (TimeIndex.date_bounds): pesanan
+        # pada tanggal `end` ikut dihitung. Logika lama halaman ini berhenti di tengah malam awal
+        # tanggal akhir, sehingga pesanan pada tanggal akhir yang dipilih tidak ikut.
+        with self._lock:
+            lo, hi = self.time_index.date_bounds(start, end)
+            if self._bounds == (lo, hi) and self._result is not None:
+                return self._result
+            if self._bounds is None or hi <= self._bounds[0] or lo >= self._bounds[1] or lo >= hi:
+                self._full(lo, hi)
+            else:
+                self._shift(lo, hi)
+            self._bounds = (lo, hi)
+            self._result = self._frame(lo, hi)
+            return self._result
+
+    def _bincount(self, lo, hi, weights=None):
+        w = None if weights is None else weights[lo:hi]
+        return np.bincount(self.codes[lo:hi], weights=w, minlength=self.n_customers)
+
+    def _full(self, lo, hi):
+        self._count = self._bincount(lo, hi)
+        self._sum = self._bincount(lo, hi, self.values)
+        self._last = np.full(self.n_customers, np.iinfo("int64").min)
+        np.maximum.at(self._last, self.codes[lo:hi], self.ts[lo:hi])
+
+    def _shift(self, lo, hi):
+        old_lo, old_hi = self._bounds
+        # Potongan yang masuk jendela
+        for a, b in [(lo, min(old_lo, hi)), (max(old_hi, lo), hi)]:
+            if a < b:
+                self._count += self._bincount(a, b)
+                self._sum += self._bincount(a, b, self.values)
+                np.maximum.at(self._last, self.codes[a:b], self.ts[a:b])
+        # Potongan yang keluar jendela
+        for a, b in [(old_lo, min(lo, old_hi)), (max(hi, old_lo), old_hi)]:
+            if a < b:
+                self._count -= self._bincount(a, b)
+                self._sum -= self._bincount(a, b, self.values)
+        # Ujung akhir mundur: pembelian terakhir customer yang terdampak dihitung ulang dari jendela baru
+        if hi < old_hi:
+            affected = np.unique(self.codes[hi:old_hi])
+            self._last[affected] = np.iinfo("int64").min
+            mask = np.isin(self.codes[lo:hi], affected)
+            np.maximum.at(self._last, self.codes[lo:hi][mask], self.ts[lo:hi][mask])
+
+    def _frame(self, lo, hi):
+        present = np.flatnonzero(self._count > 0)
+        if lo >= hi:
+            return pd.DataFrame({
+                "customer_unique_id": pd.Series(dtype=object),
+                "Recency": pd.Series(dtype="int64"),
+                "Frequency": pd.Series(dtype="int64"),
+                "Monetary": pd.Series(dtype="float64"),
+                "Transaction_Group": pd.Categorical([], categories=GROUP_LABELS),
+                "Monetary_bin": pd.Categorical([], categories=MONETARY_LABELS),
+            })
+        # Tanggal snapshot = pembelian terakhir dalam jendela + 1 hari
+        snapshot = self.ts[hi - 1] + NS_PER_DAY
+        frequency = self._count[present].astype("int64")
+        monetary = np.round(self._sum[present], 2)
+        rfm = pd.DataFrame({
+            "customer_unique_id": self.customers[present],
+            "Recency": (snapshot - self._last[present]) // NS_PER_DAY,
+            "Frequency": frequency,
+            "Monetary": monetary,
+        })
+        rfm["Transaction_Group"] = transaction_group(frequency)
+        rfm["Monetary_bin"] = monetary_bin(rfm["Monetary"])
+        return rfm
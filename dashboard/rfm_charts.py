@@ -0,0 +1,135 @@
+import numpy as np
+
+from rfm import GROUP_LABELS, MONETARY_LABELS
+
+# Data grafik halaman "RFM Analysis" yang diringkas di server: histogram sudah di-bin, boxplot
+# berupa statistik kuartil, dan scatter Frequency vs Monetary disampel jika titiknya banyak.
+# Yang dikirim ke browser hanya beberapa ratus angka per grafik, bukan satu titik per customer.
+# rfm_chart_data menghasilkan dict JSON (dipakai juga lewat api.py); fungsi *_figure membuat
+# figure plotly dari dict tersebut; plotly baru diimpor saat figure pertama dibuat.
+
+HIST_BINS = 30
+MAX_SCATTER_POINTS = 5000
+# Warna default plotly untuk trace berurutan (sama dengan warna px.box per kelompok)
+GROUP_COLORS = ["#636efa", "#EF553B", "#00cc96"]
+
+
+def _nice_width(span, bins, integer):
+    # Lebar bin "bulat" (1, 2, 2.5, 5 x 10^k) seperti pemilihan nbins di plotly
+    raw = span / bins if span > 0 else 1.0
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for step in [1, 2, 2.5, 5, 10]:
+        width = step * magnitude
+        if width >= raw:
+            break
+    return max(width, 1.0) if integer else width
+
+
+def histogram_bins(values, bins=HIST_BINS):
+    # Jumlah per bin dengan lebar seragam; tepi bin selaras dengan kelipatan lebar bin
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"start": 0.0, "width": 1.0, "counts": []}
+    integer = bool(np.all(values == np.round(values)))
+    low, high = values.min(), values.max()
+    width = _nice_width(high - low, bins, integer)
+    start = np.floor(low / width) * width
+    if integer:
+        start -= 0.5  # bin berpusat di bilangan bulat
+    codes = np.floor((values - start) / width).astype("int64")
+    return {"start": float(start), "width": float(width), "counts": np.bincount(codes).tolist()}
+
+
+def box_stats(values):
+    # Kuartil dan whisker (1,5 x IQR, dipotong ke data terdekat) seperti boxplot plotly
+    values = np.sort(np.asarray(values, dtype="float64"))
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "q1": float(q1), "median": float(median), "q3": float(q3),
+        "lowerfence": float(inside.min()), "upperfence": float(inside.max()),
+        "mean": float(values.mean()), "count": int(len(values)),
+    }
+
+
+def sample_points(x, y, max_points=MAX_SCATTER_POINTS, seed=0):
+    # Sampel acak (seed tetap agar stabil antar rerun) plus titik Monetary tertinggi per Frequency,
+    # sehingga nilai ekstrem tetap terlihat
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    if len(x) <= max_points:
+        return {"x": x.tolist(), "y": y.tolist(), "total": int(len(x)), "sampled": False}
+    order = np.lexsort((-y, x))
+    first_of_x = order[np.concatenate([[True], x[order][1:] != x[order][:-1]])]
+    rng = np.random.default_rng(seed)
+    picked = np.union1d(rng.choice(len(x), size=max(max_points - len(first_of_x), 0), replace=False), first_of_x)
+    return {"x": x[picked].tolist(), "y": y[picked].tolist(), "total": int(len(x)), "sampled": True}
+
+
+def rfm_chart_data(rfm, bins=HIST_BINS, max_points=MAX_SCATTER_POINTS):
+    # rfm: hasil RFMEngine.compute (sudah difilter kelompok/bin pengeluaran)
+    groups = rfm["Transaction_Group"].to_numpy()
+    monetary = rfm["Monetary"].to_numpy(dtype="float64")
+    box = {}
+    for label in GROUP_LABELS:
+        stats = box_stats(monetary[groups == label])
+        if stats is not None:
+            box[label] = stats
+    monetary_bins = rfm["Monetary_bin"].value_counts().reindex(MONETARY_LABELS, fill_value=0)
+    return {
+        "customers": int(len(rfm)),
+        "histograms": {col: histogram_bins(rfm[col].to_numpy(), bins) for col in ["Recency", "Frequency", "Monetary"]},
+        "scatter": sample_points(rfm["Frequency"].to_numpy(), monetary, max_points),
+        "box": box,
+        "monetary_bins": {label: int(count) for label, count in monetary_bins.items()},
+    }
+
+
+def histogram_figure(hist, column, title, color):
+    import plotly.graph_objects as go
+
+    counts = hist["counts"]
+    centers = hist["start"] + hist["width"] * (np.arange(len(counts)) + 0.5)
+    fig = go.Figure(go.Bar(x=centers, y=counts, width=hist["width"], marker_color=color, name=column))
+    fig.update_layout(title=title, bargap=0, xaxis_title=column, yaxis_title="count")
+    return fig
+
+
+def scatter_figure(scatter, title):
+    import plotly.graph_objects as go
+
+    if scatter["sampled"]:
+        title = f"{title} (sampel {len(scatter['x'])} dari {scatter['total']} customer)"
+    fig = go.Figure(go.Scatter(x=scatter["x"], y=scatter["y"], mode="markers", opacity=0.5))
+    fig.update_layout(title=title, xaxis_title="Frequency", yaxis_title="Monetary")
+    return fig
+
+
+def box_figure(box, title):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for label, color in zip(GROUP_LABELS, GROUP_COLORS):
+        stats = box.get(label)
+        if stats is None:
+            continue
+        fig.add_trace(go.Box(
+            x=[label], name=label, marker_color=color,
+            q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]], mean=[stats["mean"]],
+            lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+        ))
+    fig.update_layout(title=title, xaxis_title="Transaction_Group", yaxis_title="Monetary",
+                      legend_title_text="Transaction_Group")
+    return fig
+
+
+def monetary_bin_figure(monetary_bins, title, labels):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(x=list(monetary_bins), y=list(monetary_bins.values()), name="count"))
+    fig.update_layout(title=title, xaxis_title=labels["index"], yaxis_title=labels["value"])
+    return fig
@@ -0,0 +1,133 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# Thread pool bersama untuk bagian halaman (query analitik + render chart/peta).
+# Setiap bagian menempati slot per sesi, misalnya ("Seller Peformances", "price_hist"). Tugas
+# dengan kunci yang sama (chart, versi dataset, nilai filter) dipakai bersama selama masih
+# dihitung, juga antar sesi. Saat slider digeser, nilai baru menggantikan nilai lama di slot yang
+# sama: tugas lama yang tidak ditunggu slot lain dibatalkan jika belum mulai, atau berhenti di
+# checkpoint() berikutnya jika sudah berjalan. Halaman menunggu hasil dengan wait(), yang tetap
+# memberi kesempatan Streamlit menghentikan skrip saat ada rerun baru.
+
+SECTION_WORKERS_ENV = "DASHBOARD_SECTION_WORKERS"
+POLL_SECONDS = 0.05
+
+_current = threading.local()
+
+
+class SectionCancelled(Exception):
+    pass
+
+
+def checkpoint():
+    # Dipanggil di antara tahap tugas (setelah query, sebelum plotting/serialisasi)
+    token = getattr(_current, "token", None)
+    if token is not None and token.is_set():
+        raise SectionCancelled()
+
+
+def default_workers():
+    workers = os.environ.get(SECTION_WORKERS_ENV)
+    if workers is not None:
+        return int(workers)
+    return min(8, os.cpu_count() or 1)
+
+
+class _Task:
+    def __init__(self, key):
+        self.key = key
+        self.cancelled = threading.Event()
+        self.waiters = set()
+        self.future = None
+
+
+class SectionPool:
+    def __init__(self, workers=None):
+        self.workers = workers or default_workers()
+        self.submitted = 0
+        self.shared = 0
+        self.cancelled = 0
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="section")
+        self._lock = threading.Lock()
+        self._tasks = {}  # kunci -> _Task yang belum selesai
+        self._slots = {}  # (sesi, slot) -> kunci yang terakhir diminta
+
+    def submit(self, session, slot, key, compute):
+        # Future hasil compute() untuk kunci ini; nilai lama di slot yang sama dilepas
+        with self._lock:
+            self._release(session, slot, keep=key)
+            task = self._tasks.get(key)
+            if task is None or task.cancelled.is_set():
+                task = _Task(key)
+                self._tasks[key] = task
+                task.future = self._pool.submit(self._run, task, compute)
+                self.submitted += 1
+            elif (session, slot) not in task.waiters:
+                self.shared += 1
+            task.waiters.add((session, slot))
+            self._slots[(session, slot)] = key
+            return task.future
+
+    def release(self, session, slot):
+        # Slot tidak lagi menunggu apa pun (misalnya hasil nilai baru sudah ada di cache)
+        with self._lock:
+            self._release(session, slot)
+
+    def release_session(self, session, keep=lambda slot: False):
+        # Lepaskan semua slot sesi kecuali yang lolos keep(slot), misalnya saat pindah halaman
+        with self._lock:
+            for owner, slot in [item for item in self._slots if item[0] == session]:
+                if not keep(slot):
+                    self._release(owner, slot)
+
+    def _release(self, session, slot, keep=None):
+        key = self._slots.get((session, slot))
+        if key is None or key == keep:
+            return
+        del self._slots[(session, slot)]
+        task = self._tasks.get(key)
+        if task is None:
+            return
+        task.waiters.discard((session, slot))
+        if not task.waiters:
+            task.cancelled.set()
+            self.cancelled += 1
+            if task.future.cancel():
+                del self._tasks[key]
+
+    def _run(self, task, compute):
+        _current.token = task.cancelled
+        try:
+            checkpoint()
+            return compute()
+        finally:
+            _current.token = None
+            with self._lock:
+                if self._tasks.get(task.key) is task:
+                    del self._tasks[task.key]
+                # Slot yang masih menunjuk tugas ini tidak perlu dilepas lagi (sesi bisa sudah berakhir)
+                for waiter in task.waiters:
+                    if self._slots.get(waiter) == task.key:
+                        del self._slots[waiter]
+
+    def stats(self):
+        with self._lock:
+            running = len(self._tasks)
+        return {"workers": self.workers, "submitted": self.submitted, "shared": self.shared,
+                "cancelled": self.cancelled, "running": running}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def wait(future, yield_check=None):
+    # Tunggu hasil; yield_check (dari ScriptRunContext) dipanggil berkala dan melempar exception
+    # Streamlit jika skrip harus berhenti atau rerun, sehingga rerun baru tidak tertahan
+    if yield_check is None:
+        return future.result()
+    while True:
+        try:
+            return future.result(timeout=POLL_SECONDS)
+        except TimeoutError:
+            yield_check()
@@ -0,0 +1,341 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+from data_loader import RAW_DIR, RAW_TABLES, ZIP_COLUMNS, publish_file, raw_table_path, source_fingerprint
+from delivery import DeliverySketches, clip_days, late_flags, purchase_month, sketch_frames
+
+# Ingest bertahap (chunk) dari tabel mentah di data/ untuk dataset yang lebih besar dari memori.
+# Tabel fakta (orders, order_items, order_payments, order_reviews) dibaca per chunk dan langsung
+# dilipat ke agregat yang dibutuhkan halaman dashboard; yang disimpan di memori hanya state per
+# kunci (per kota/seller/customer/order), tidak pernah seluruh tabel hasil merge.
+#
+# Perbedaan dengan agregat dari main_data.csv (aggregates.build_aggregates):
+# - jumlah pembelian per customer dihitung per item pesanan (bukan per baris hasil merge
+#   item x pembayaran x review);
+# - koordinat kota memakai rata-rata koordinat kode pos (geolocation dideduplikasi per kode pos),
+#   dan kota seller memakai kode pos seller itu sendiri.
+# Sketsa pengiriman (delivery.py) dibangun dari pasangan unik (order_id, seller_id) di order_items
+# dan state per order (bulan pembelian, hari, terlambat), sehingga sama dengan versi main_data.
+
+SUMMARY_DIR = "summaries"
+MANIFEST_FILE = "manifest.json"
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def read_chunks(name, raw_dir, chunksize, usecols, stats):
+    # Baca satu tabel mentah per chunk sambil mencatat jumlah baris dan durasi
+    dtypes = {col: "str" for col in usecols if col in ZIP_COLUMNS}
+    start = time.perf_counter()
+    rows = 0
+    for chunk in pd.read_csv(raw_table_path(name, raw_dir), usecols=usecols, dtype=dtypes,
+                             chunksize=chunksize, encoding="utf-8-sig"):
+        rows += len(chunk)
+        yield chunk
+    seconds = time.perf_counter() - start
+    stats[name] = {"rows": rows, "seconds": round(seconds, 3),
+                   "rows_per_sec": round(rows / seconds) if seconds else None}
+
+
+class _Fold:
+    # Agregat berjalan dari parsial per chunk (per index, atau pasangan unik jika how=None).
+    # Parsial ditampung di list dan baru digabung (concat + group-by / deduplikasi) setelah
+    # jumlah barisnya menyamai total yang sudah digabung, sehingga setiap baris parsial hanya ikut
+    # digabung O(1) kali (amortisasi), bukan sekali per chunk berikutnya seperti concat ke total
+    # setiap chunk (kuadratik terhadap jumlah chunk).
+    def __init__(self, how="sum"):
+        self.how = how
+        self._total = None
+        self._parts = []
+        self._pending = 0
+
+    def add(self, part):
+        self._parts.append(part)
+        self._pending += len(part)
+        if self._pending >= (0 if self._total is None else len(self._total)):
+            self._reduce()
+
+    def _reduce(self):
+        frames = ([] if self._total is None else [self._total]) + self._parts
+        combined = pd.concat(frames) if len(frames) > 1 else frames[0]
+        if self.how is None:
+            self._total = combined.drop_duplicates()
+        elif len(frames) > 1:
+            self._total = combined.groupby(level=0).agg(self.how)
+        else:
+            self._total = combined
+        self._parts, self._pending = [], 0
+
+    def result(self):
+        if self._parts:
+            self._reduce()
+        return self._total
+
+
+def _zip_geolocation(raw_dir, chunksize, stats):
+    # Satu koordinat (rata-rata) dan satu nama kota per kode pos
+    total = _Fold({"lat_sum": "sum", "lng_sum": "sum", "n": "sum", "geolocation_city": "first"})
+    for chunk in read_chunks("geolocation", raw_dir, chunksize,
+                             ["geolocation_zip_code_prefix", "geolocation_lat", "geolocation_lng", "geolocation_city"],
+                             stats):
+        part = chunk.groupby("geolocation_zip_code_prefix").agg(
+            lat_sum=("geolocation_lat", "sum"),
+            lng_sum=("geolocation_lng", "sum"),
+            n=("geolocation_lat", "size"),
+            geolocation_city=("geolocation_city", "first"),
+        )
+        total.add(part)
+    total = total.result()
+    return pd.DataFrame({
+        "geolocation_lat": total["lat_sum"] / total["n"],
+        "geolocation_lng": total["lng_sum"] / total["n"],
+        "geolocation_city": total["geolocation_city"],
+    })
+
+
+def _city_summary(frame, city_col, count_col):
+    # frame: satu baris per entitas unik (customer/seller) dengan kota dan koordinat kode posnya
+    return frame.groupby(city_col, observed=True).agg(
+        **{count_col: (city_col, "size")},
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+    ).reset_index()
+
+
+def build_summaries(raw_dir=RAW_DIR, chunksize=DEFAULT_CHUNKSIZE):
+    stats = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    zip_geo = _zip_geolocation(raw_dir, chunksize, stats)
+
+    # --- Dimensi: seller, produk, customer ---
+    sellers = pd.concat(read_chunks("sellers", raw_dir, chunksize,
+                                    ["seller_id", "seller_zip_code_prefix", "seller_city", "seller_state"], stats))
+    sellers = sellers.join(zip_geo[["geolocation_lat", "geolocation_lng"]], on="seller_zip_code_prefix")
+
+    translation = pd.concat(read_chunks("category_translation", raw_dir, chunksize,
+                                        ["product_category_name", "product_category_name_english"], stats))
+    products = pd.concat(read_chunks("products", raw_dir, chunksize,
+                                     ["product_id", "product_category_name"], stats))
+    product_category = products.set_index("product_id")["product_category_name"].astype("category")
+
+    customer_parts = []
+    for chunk in read_chunks("customers", raw_dir, chunksize,
+                             ["customer_id", "customer_unique_id", "customer_zip_code_prefix", "customer_city",
+                              "customer_state"], stats):
+        chunk = chunk.join(zip_geo, on="customer_zip_code_prefix")
+        chunk["customer_city"] = chunk["customer_city"].astype("category")
+        chunk["geolocation_city"] = chunk["geolocation_city"].astype("category")
+        chunk["customer_state"] = chunk["customer_state"].astype("category")
+        customer_parts.append(chunk.drop(columns="customer_zip_code_prefix"))
+    customers = pd.concat(customer_parts, ignore_index=True)
+    del customer_parts
+
+    # --- Orders: state per order (customer, waktu pengiriman, keterlambatan) dan state RFM per customer ---
+    customers_by_id = customers.set_index("customer_id")
+    order_parts = []
+    last_purchase = _Fold("max")
+    order_count = _Fold()
+    for chunk in read_chunks("orders", raw_dir, chunksize,
+                             ["order_id", "customer_id", "order_purchase_timestamp", "order_delivered_customer_date",
+                              "order_estimated_delivery_date"], stats):
+        purchase = pd.to_datetime(chunk["order_purchase_timestamp"], errors="coerce")
+        delivered = pd.to_datetime(chunk["order_delivered_customer_date"], errors="coerce")
+        estimated = pd.to_datetime(chunk["order_estimated_delivery_date"], errors="coerce")
+        customer = customers_by_id.reindex(chunk["customer_id"])
+        part = pd.DataFrame({
+            "customer_unique_id": customer["customer_unique_id"].to_numpy(),
+            "geolocation_city": customer["geolocation_city"].to_numpy(),
+            "customer_state": customer["customer_state"].to_numpy(),
+            "delivery_time_actual": (delivered - purchase).dt.days.astype("float32").to_numpy(),
+            "month": purchase_month(purchase),
+            "late": late_flags(delivered, estimated).astype("int8"),
+        }, index=chunk["order_id"].to_numpy())
+        order_parts.append(part)
+        by_customer = pd.Series(purchase.to_numpy(), index=part["customer_unique_id"]).groupby(level=0)
+        last_purchase.add(by_customer.max())
+        order_count.add(by_customer.size())
+    last_purchase, order_count = last_purchase.result(), order_count.result()
+    orders = pd.concat(order_parts)
+    del order_parts
+
+    # --- Order items: penjualan & waktu pengiriman per seller, frekuensi pembelian, kategori ---
+    seller_sales = _Fold()
+    seller_delivery = _Fold()
+    purchase_frequency = _Fold()
+    category_counts = _Fold()
+    city_sellers = _Fold(how=None)
+    shipment_pairs = _Fold(how=None)
+    for chunk in read_chunks("order_items", raw_dir, chunksize, ["order_id", "product_id", "seller_id"], stats):
+        order = orders.reindex(chunk["order_id"])
+        chunk = chunk.assign(
+            customer_unique_id=order["customer_unique_id"].to_numpy(),
+            geolocation_city=order["geolocation_city"].to_numpy(),
+            delivery_time_actual=order["delivery_time_actual"].to_numpy(),
+        )
+        seller_sales.add(chunk["seller_id"].value_counts())
+        seller_delivery.add(chunk.groupby("seller_id")["delivery_time_actual"].agg(["sum", "count"]))
+        purchase_frequency.add(chunk["customer_unique_id"].value_counts())
+        category_counts.add(chunk["product_id"].map(product_category).value_counts())
+        city_sellers.add(chunk[["geolocation_city", "seller_id"]].dropna())
+        shipment_pairs.add(chunk.loc[chunk["delivery_time_actual"].notna(), ["order_id", "seller_id"]])
+    seller_sales, seller_delivery, purchase_frequency = seller_sales.result(), seller_delivery.result(), purchase_frequency.result()
+    category_counts, city_sellers, shipment_pairs = category_counts.result(), city_sellers.result(), shipment_pairs.result()
+
+    # --- Pembayaran dan review ---
+    payment_counts = _Fold()
+    monetary = _Fold()
+    for chunk in read_chunks("order_payments", raw_dir, chunksize, ["order_id", "payment_type", "payment_value"], stats):
+        customer = orders["customer_unique_id"].reindex(chunk["order_id"]).to_numpy()
+        payment_counts.add(chunk["payment_type"].value_counts())
+        monetary.add(pd.Series(chunk["payment_value"].to_numpy(), index=customer).groupby(level=0).sum())
+    payment_counts, monetary = payment_counts.result(), monetary.result()
+
+    review_counts = _Fold()
+    for chunk in read_chunks("order_reviews", raw_dir, chunksize, ["order_id", "review_score"], stats):
+        review_counts.add(chunk["review_score"].value_counts())
+    review_counts = review_counts.result()
+
+    # --- Susun agregat dengan bentuk yang sama seperti aggregates.build_aggregates ---
+    customer_city = _city_summary(customers, "customer_city", "customer_count")
+    seller_city = _city_summary(sellers, "seller_city", "seller_count")
+
+    city_customers = customers[["geolocation_city", "customer_unique_id"]].drop_duplicates()
+    geolocation_city = customers.groupby("geolocation_city", observed=True).agg(
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+    )
+    geolocation_city.insert(0, "customer_count", city_customers.groupby("geolocation_city", observed=True).size())
+    geolocation_city.insert(0, "seller_count", city_sellers.groupby("geolocation_city", observed=True).size())
+    geolocation_city = geolocation_city.fillna({"seller_count": 0}).astype({"seller_count": "int64"}).reset_index()
+
+    seller = pd.DataFrame({
+        "penjualan": seller_sales.astype("int64"),
+        "delivery_time_actual": (seller_delivery["sum"] / seller_delivery["count"].where(seller_delivery["count"] > 0)).astype("float64"),
+    }).rename_axis("seller_id").reset_index()
+
+    rfm = pd.DataFrame({
+        "last_purchase": last_purchase,
+        "Frequency": order_count.astype("int64"),
+        "Monetary": monetary.reindex(last_purchase.index).fillna(0.0),
+    }).rename_axis("customer_unique_id").reset_index()
+
+    # Pengiriman = pasangan (order_id, seller_id) yang sudah diterima
+    order = orders.reindex(shipment_pairs["order_id"])
+    seller_state = sellers.drop_duplicates("seller_id").set_index("seller_id")["seller_state"]
+    delivery = DeliverySketches(sketch_frames(pd.DataFrame({
+        "seller_id": shipment_pairs["seller_id"].to_numpy(),
+        "seller_state": seller_state.reindex(shipment_pairs["seller_id"]).to_numpy(),
+        "customer_state": order["customer_state"].to_numpy(),
+        "month": order["month"].to_numpy(),
+        "days": clip_days(order["delivery_time_actual"].to_numpy()),
+        "late": order["late"].to_numpy(dtype="int64"),
+    })))
+
+    english = translation.set_index("product_category_name")["product_category_name_english"]
+    category = category_counts.astype("int64").rename_axis("product_category_name").reset_index(name="penjualan")
+    category["product_category_name_english"] = category["product_category_name"].map(english)
+
+    stats["total_seconds"] = round(time.perf_counter() - start, 3)
+    stats["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+    tracemalloc.stop()
+
+    return {
+        "version": raw_version(raw_dir),
+        "map_center": [float(customers["geolocation_lat"].mean()), float(customers["geolocation_lng"].mean())],
+        "customer_city": customer_city,
+        "seller_city": seller_city,
+        "geolocation_city": geolocation_city,
+        "seller": seller,
+        "purchase_frequency": purchase_frequency.astype("int64").rename_axis("customer_unique_id"),
+        "review_counts": review_counts.astype("int64").sort_index(),
+        "payment_counts": payment_counts.astype("int64").sort_values(ascending=False),
+        "category_counts": category,
+        "rfm": rfm,
+        "delivery": delivery,
+        "stats": stats,
+    }
+
+
+def raw_version(raw_dir=RAW_DIR):
+    # Versi ringkasan = hash dari sidik jari semua tabel mentah
+    fingerprints = [source_fingerprint(raw_table_path(name, raw_dir)) for name in sorted(RAW_TABLES)]
+    return hashlib.sha1("|".join(fingerprints).encode()).hexdigest()[:16]
+
+
+def save_summaries(summary, directory=SUMMARY_DIR):
+    # Simpan setiap agregat sebagai Parquet; manifest ditulis terakhir sebagai penanda lengkap.
+    # Setiap file ditulis lewat file sementara unik + rename (publish_file): pembaca yang masih
+    # memakai manifest lama tidak pernah membaca Parquet setengah jadi
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": summary["version"], "map_center": summary["map_center"],
+                "stats": summary["stats"], "frames": {}, "series": {}, "sketches": {}}
+
+    def write_parquet(frame, filename):
+        publish_file(os.path.join(directory, filename), lambda tmp_path: frame.to_parquet(tmp_path, index=False))
+        return filename
+
+    for key, value in summary.items():
+        if isinstance(value, pd.DataFrame):
+            manifest["frames"][key] = write_parquet(value, f"{key}.parquet")
+        elif isinstance(value, pd.Series):
+            manifest["series"][key] = write_parquet(value.rename("count").reset_index(), f"{key}.parquet")
+        elif isinstance(value, DeliverySketches):
+            # Histogram jarang per dimensi (sketch_frames); indeks dibangun ulang saat dimuat
+            manifest["sketches"][key] = {}
+            for name, frame in value.frames.items():
+                manifest["sketches"][key][name] = write_parquet(frame, f"{key}_{name}.parquet")
+
+    publish_file(os.path.join(directory, MANIFEST_FILE), lambda tmp_path: _write_json(tmp_path, manifest))
+
+
+def _write_json(path, value):
+    with open(path, "w") as f:
+        json.dump(value, f, indent=2)
+
+
+def summaries_available(directory=SUMMARY_DIR):
+    return os.path.exists(os.path.join(directory, MANIFEST_FILE))
+
+
+def summaries_version(directory=SUMMARY_DIR):
+    # Versi ringkasan yang tercatat di manifest (None jika belum ada)
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            return json.load(f)["version"]
+    except FileNotFoundError:
+        return None
+
+
+def load_summaries(directory=SUMMARY_DIR):
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    summary = {"version": manifest["version"], "map_center": manifest["map_center"], "stats": manifest["stats"]}
+    for key, filename in manifest["frames"].items():
+        summary[key] = pd.read_parquet(os.path.join(directory, filename))
+    for key, filename in manifest["series"].items():
+        frame = pd.read_parquet(os.path.join(directory, filename))
+        summary[key] = frame.set_index(frame.columns[0])["count"].rename(None)
+    for key, files in manifest.get("sketches", {}).items():
+        summary[key] = DeliverySketches({name: pd.read_parquet(os.path.join(directory, filename))
+                                         for name, filename in files.items()})
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--raw-dir", default=RAW_DIR, help="folder tabel mentah (default: ../data)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="jumlah baris per chunk")
+    parser.add_argument("--out", default=SUMMARY_DIR, help="folder output ringkasan")
+    args = parser.parse_args()
+
+    summary = build_summaries(args.raw_dir, args.chunksize)
+    save_summaries(summary, args.out)
+    for name, table_stats in summary["stats"].items():
+        print(f"{name:22s} {table_stats}")
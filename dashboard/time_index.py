@@ -0,0 +1,61 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from growable import GrowableArray
+
+# Indeks waktu untuk filter rentang tanggal. Dataset sudah diurutkan berdasarkan
+# order_purchase_timestamp saat load (data_loader.enrich_data), jadi rentang tanggal cukup
+# dicari dengan dua binary search pada array epoch int64, lalu diambil sebagai potongan
+# baris (iloc slice) tanpa membangun mask boolean atau objek `date` untuk setiap baris.
+
+NAT = np.iinfo("int64").min
+
+
+class TimeIndex:
+    def __init__(self, data, column="order_purchase_timestamp"):
+        epoch = data[column].to_numpy(dtype="datetime64[ns]").view("int64")
+        # NaT berada di akhir; binary search hanya dilakukan pada bagian yang valid
+        self.n_valid = int(np.count_nonzero(epoch != NAT))
+        self.epoch = epoch[:self.n_valid]
+        if self.n_valid > 1 and np.any(self.epoch[1:] < self.epoch[:-1]):
+            raise ValueError(f"Data belum terurut berdasarkan {column}")
+        self._buffer = None  # GrowableArray untuk appended(), dibuat saat append pertama
+
+    def appended(self, data, column="order_purchase_timestamp"):
+        # Indeks baru untuk data lama + baris `data` di akhir (ingest.py). Baris baru harus terurut,
+        # tanpa NaT, dan tidak lebih awal dari pembelian terakhir; indeks lama tidak diubah.
+        # Epoch disimpan di GrowableArray: biayanya sebanding dengan jumlah baris baru.
+        epoch = data[column].to_numpy(dtype="datetime64[ns]").view("int64")
+        if np.any(epoch == NAT) or np.any(epoch[1:] < epoch[:-1]) or (
+                len(epoch) and self.n_valid and epoch[0] < self.epoch[-1]):
+            raise ValueError(f"Baris baru tidak bisa ditambahkan di akhir urutan {column}")
+        buffer = GrowableArray(self.epoch) if self._buffer is None else self._buffer
+        index = copy.copy(self)
+        index._buffer = buffer.extended(self.n_valid, epoch)
+        index.n_valid = self.n_valid + len(epoch)
+        index.epoch = index._buffer.view(index.n_valid)
+        return index
+
+    @property
+    def min_timestamp(self):
+        return pd.Timestamp(self.epoch[0])
+
+    @property
+    def max_timestamp(self):
+        return pd.Timestamp(self.epoch[-1])
+
+    def date_bounds(self, start_date, end_date):
+        # Posisi baris [lo, hi) untuk rentang tanggal penuh: dari awal start_date sampai akhir end_date.
+        # Dipakai semua filter tanggal (slice_dates, RFMEngine.compute)
+        start = pd.Timestamp(start_date).normalize().as_unit("ns").value
+        end = (pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)).as_unit("ns").value
+        lo = int(np.searchsorted(self.epoch, start, "left"))
+        hi = int(np.searchsorted(self.epoch, end, "left"))
+        return lo, max(lo, hi)
+
+    def slice_dates(self, data, start_date, end_date):
+        # Baris dengan tanggal pembelian di antara start_date dan end_date (inklusif)
+        lo, hi = self.date_bounds(start_date, end_date)
+        return data.iloc[lo:hi]
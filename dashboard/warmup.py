@@ -0,0 +1,147 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aggregates import AGGREGATES
+from analytics import Analytics
+from column_index import INDEXED_COLUMNS, ColumnIndex
+from data_loader import (
+    CSV_PATH,
+    SNAPSHOT_PATH,
+    dataset_version,
+    load_main_data,
+    read_snapshot_table,
+    snapshot_frame,
+    snapshot_is_fresh,
+)
+from rfm import RFMEngine
+from time_index import TimeIndex
+
+# Warm-up: hitung semua agregat halaman (kota, seller, frekuensi pembelian, review/pembayaran),
+# mesin RFM, dan indeks kolom halaman Data sekaligus, sebelum permintaan pertama.
+# Setiap tugas berjalan di proses worker terpisah. Tabel fakta tidak di-pickle ke worker: worker
+# me-memory-map snapshot Arrow (main_data.arrow) dan hanya membaca kolom yang dibutuhkan tugasnya,
+# sehingga halaman file dibagikan lewat page cache OS. Yang dikirim balik hanya hasilnya.
+# Dengan dataset kecil, biaya start proses lebih besar dari agregasinya; di bawah
+# PARALLEL_MIN_ROWS warm-up berjalan serial di proses sendiri, kecuali DASHBOARD_WARMUP_WORKERS
+# diisi (> 1 = selalu paralel dengan jumlah worker itu, 1 = selalu serial).
+
+PARALLEL_MIN_ROWS = 1_000_000
+WARMUP_WORKERS_ENV = "DASHBOARD_WARMUP_WORKERS"
+
+
+def _build_rfm_engine(data):
+    return RFMEngine(data, TimeIndex(data))
+
+
+# Nama tugas -> (fungsi, kolom yang dibutuhkan)
+TASKS = dict(AGGREGATES)
+TASKS["rfm_engine"] = (_build_rfm_engine, ["order_purchase_timestamp", "customer_unique_id", "payment_value"])
+TASKS["column_index"] = (ColumnIndex, INDEXED_COLUMNS + ["price"])
+
+
+def read_columns(snapshot_path, columns):
+    # Memory-map snapshot (beserta segmen delta); kolom yang tidak dipilih tidak pernah disentuh
+    return snapshot_frame(read_snapshot_table(snapshot_path, columns))
+
+
+def _run_task(snapshot_path, name):
+    # Dijalankan di proses worker
+    start = time.perf_counter()
+    build, columns = TASKS[name]
+    result = build(read_columns(snapshot_path, columns))
+    return name, result, time.perf_counter() - start
+
+
+def default_workers():
+    workers = os.environ.get(WARMUP_WORKERS_ENV)
+    if workers is not None:
+        return int(workers)
+    return min(len(TASKS), os.cpu_count() or 1)
+
+
+def precompute_serial(data):
+    # Jalur serial: semua tugas berurutan pada DataFrame yang sudah dimuat
+    results, seconds = {}, {}
+    for name, (build, _) in TASKS.items():
+        start = time.perf_counter()
+        results[name] = build(data)
+        seconds[name] = time.perf_counter() - start
+    return results, seconds
+
+
+def precompute_parallel(snapshot_path, workers):
+    results, seconds = {}, {}
+    # spawn: aman dipanggil dari proses Streamlit/uvicorn yang sudah memiliki banyak thread
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_run_task, snapshot_path, name) for name in TASKS]
+        for future in as_completed(futures):
+            name, result, task_seconds = future.result()
+            results[name] = result
+            seconds[name] = task_seconds
+    return results, seconds
+
+
+def split_results(results):
+    # Hasil tugas -> (dict agregat seperti build_aggregates, rfm_engine, column_index)
+    aggregates = {name: results[name] for name in AGGREGATES}
+    return aggregates, results["rfm_engine"], results["column_index"]
+
+
+def warm_up(data, csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH, workers=None, compare=False):
+    # Kembalikan (hasil per tugas, laporan). Jalur paralel dipakai jika snapshot segar tersedia,
+    # workers > 1, dan datanya cukup besar atau jumlah worker diatur lewat DASHBOARD_WARMUP_WORKERS;
+    # compare=True juga mengukur jalur serial.
+    forced = workers is None and os.environ.get(WARMUP_WORKERS_ENV) is not None
+    workers = default_workers() if workers is None else workers
+    parallel = (workers > 1 and snapshot_is_fresh(csv_path, snapshot_path)
+                and (compare or forced or len(data) >= PARALLEL_MIN_ROWS))
+    report = {"rows": len(data), "workers": workers if parallel else 1, "mode": "parallel" if parallel else "serial"}
+
+    start = time.perf_counter()
+    if parallel:
+        results, seconds = precompute_parallel(snapshot_path, workers)
+    else:
+        results, seconds = precompute_serial(data)
+    report[f"{report['mode']}_seconds"] = round(time.perf_counter() - start, 3)
+    report["tasks"] = {name: round(value, 3) for name, value in seconds.items()}
+
+    if compare and parallel:
+        start = time.perf_counter()
+        precompute_serial(data)
+        report["serial_seconds"] = round(time.perf_counter() - start, 3)
+        report["speedup"] = round(report["serial_seconds"] / report["parallel_seconds"], 2)
+    return results, report
+
+
+def warm_analytics(data, version, **kwargs):
+    # Analytics dengan agregat, mesin RFM, dan indeks kolom yang sudah dihitung
+    results, report = warm_up(data, **kwargs)
+    aggregates, rfm_engine, column_index = split_results(results)
+    analytics = Analytics(data, aggregates, version, rfm_engine=rfm_engine, column_index=column_index)
+    analytics.info()  # batas widget (termasuk rentang tanggal) ikut dihitung sekarang
+    return analytics, report
+
+
+def print_report(report):
+    print(f"{report['rows']} baris, mode {report['mode']} ({report['workers']} worker)")
+    for name, seconds in sorted(report["tasks"].items(), key=lambda item: -item[1]):
+        print(f"  {name:20s} {seconds:8.3f}s")
+    for key in ["parallel_seconds", "serial_seconds", "speedup"]:
+        if key in report:
+            print(f"{key:22s} {report[key]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default: jumlah CPU)")
+    parser.add_argument("--no-compare", action="store_true", help="lewati pengukuran jalur serial")
+    args = parser.parse_args()
+
+    data = load_main_data()
+    print(f"Versi dataset {dataset_version()}")
+    _, report = warm_up(data, workers=args.workers or max(2, default_workers()), compare=not args.no_compare)
+    print_report(report)